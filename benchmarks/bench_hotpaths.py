@@ -0,0 +1,378 @@
+"""Latency benchmarks for the prediction, calendar and serialization hot paths.
+
+Run from the repository root (no network, no running Home Assistant). The
+``ws_*`` cases run the real WebSocket handlers, schema validation and
+instrumentation included, against a recording connection that serializes each
+message the way Home Assistant does; the calendar cases go through
+``FertilityTrackerCalendar.async_get_events``.
+
+    python -m benchmarks.bench_hotpaths                  # run and print
+    python -m benchmarks.bench_hotpaths --update         # rewrite the baselines
+    python -m benchmarks.bench_hotpaths --check          # exit 1 on a regression
+
+Histories are synthetic and seeded, so runs are reproducible. Latencies are
+the thread's CPU time: the cases never block, and wall time would also count
+whatever else the machine is running.
+
+Before each case a fixed pure-Python calibration loop is timed and every
+result is also stored relative to it. ``--check`` scales each baseline by how
+fast that loop runs now and fails when a case's median is more than
+``--threshold`` (default 0.5, i.e. 50%) and at least ``--min-delta-us``
+(default 25) slower than the scaled baseline. Scaling absorbs a uniformly
+faster or slower machine, not a different CPU, Python or Home Assistant
+build, which shift cases unevenly. So the committed ``baselines.json`` is a
+reference only: run ``--update`` locally on the commit you compare against
+before ``--check`` on your change means anything.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Coroutine, Dict
+
+from homeassistant.components.websocket_api import messages
+
+from custom_components.fertility_tracker import (
+    EntryRuntime,
+    ws_distribution,
+    ws_forecast,
+    ws_list_cycles,
+    ws_risk_timeline,
+    ws_subscribe,
+)
+from custom_components.fertility_tracker.calendar import FertilityTrackerCalendar
+from custom_components.fertility_tracker.const import DOMAIN
+from custom_components.fertility_tracker.helpers import (
+    FertilityData,
+    calculate_metrics_for_date,
+)
+
+BASELINES = Path(__file__).with_name("baselines.json")
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+TZ = dt.timezone(dt.timedelta(hours=1))
+TZ_NAME = "Etc/GMT-1"  # the same +01:00, as hass.config.time_zone names it
+ENTRY_ID = "bench"
+
+# Per case and round: sample until this much time is spent, within these counts
+_ROUNDS = 3
+_TARGET_SECONDS = 0.2
+_MIN_SAMPLES = 5
+_MAX_SAMPLES = 2000
+_CALIBRATION_SECONDS = 0.05
+
+# The cases are CPU-bound: count this thread's CPU time, so time spent
+# preempted by other processes on a shared machine is not charged to them
+_clock = time.thread_time_ns
+
+
+def synthetic_history(cycles: int, seed: int = 1) -> Dict[str, Any]:
+    """An export-format history with ``cycles`` periods and ~2 sex events each."""
+    rng = random.Random(seed)
+    day = dt.date(2000, 1, 1)
+    rows: Dict[str, Any] = {"name": f"bench-{cycles}", "cycles": [], "sex_events": [], "pregnancy_tests": []}
+    for i in range(cycles):
+        rows["cycles"].append(
+            {
+                "id": f"c{i:06d}",
+                "start": day.isoformat(),
+                "end": (day + dt.timedelta(days=rng.randint(3, 6))).isoformat(),
+                "notes": "Started today" if i % 7 == 0 else None,
+            }
+        )
+        for _ in range(2):
+            ts = dt.datetime.combine(day, dt.time(21, 30), TZ) + dt.timedelta(days=rng.randint(8, 20))
+            rows["sex_events"].append({"ts": ts.isoformat(), "protected": rng.random() < 0.5, "notes": None})
+        if i % 12 == 0:
+            ts = dt.datetime.combine(day, dt.time(7, 0), TZ) + dt.timedelta(days=26)
+            rows["pregnancy_tests"].append({"ts": ts.isoformat(), "result": "negative"})
+        day += dt.timedelta(days=rng.randint(24, 34))
+    rows["sex_events"].sort(key=lambda r: r["ts"])
+    return rows
+
+
+def _sample(fn: Callable[[], Any], target: float = _TARGET_SECONDS) -> list[int]:
+    samples: list[int] = []
+    spent = 0
+    gc.disable()  # as timeit does; collections add noise unrelated to the code
+    try:
+        while len(samples) < _MAX_SAMPLES and (
+            len(samples) < _MIN_SAMPLES or spent < target * 1e9
+        ):
+            t0 = _clock()
+            fn()
+            took = _clock() - t0
+            samples.append(took)
+            spent += took
+    finally:
+        gc.enable()
+    samples.sort()
+    return samples
+
+
+def _measure(fn: Callable[[], Any]) -> Dict[str, float]:
+    """Time ``fn`` over a few rounds and report the quietest round."""
+    samples = min((_sample(fn) for _ in range(_ROUNDS)), key=statistics.median)
+    total = sum(samples)
+
+    def pct(p: float) -> float:
+        return samples[min(len(samples) - 1, int(p * len(samples)))] / 1000
+
+    return {
+        "ops_per_sec": round(len(samples) / (total / 1e9), 1),
+        "p50_us": round(statistics.median(samples) / 1000, 2),
+        "p95_us": round(pct(0.95), 2),
+        "p99_us": round(pct(0.99), 2),
+        "samples": len(samples),
+    }
+
+
+def _calibration_loop() -> int:
+    # Dicts, short strings and a keyed sort: the same kind of work as the cases
+    rows = [{"key": f"{i * 7919 % 2003:05d}", "n": i} for i in range(2000)]
+    rows.sort(key=lambda r: r["key"])
+    return sum(r["n"] for r in rows[::7])
+
+
+def _calibrate() -> float:
+    """Median microseconds of the calibration loop, quietest of a few rounds."""
+    return min(
+        statistics.median(_sample(_calibration_loop, _CALIBRATION_SECONDS))
+        for _ in range(_ROUNDS)
+    ) / 1000
+
+
+def _drive(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine that never suspends, without an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("benchmarked coroutine suspended")
+
+
+class _Runtime:
+    """What the handlers and the calendar read from an EntryRuntime.
+
+    A real one needs a running Home Assistant; the subscribe path still runs
+    EntryRuntime's own methods.
+    """
+
+    async_subscribe = EntryRuntime.async_subscribe
+    async_add_subscriber = EntryRuntime.async_add_subscriber
+    snapshot_event = EntryRuntime.snapshot_event
+
+    def __init__(self, hass: Any, data: FertilityData, today: dt.datetime) -> None:
+        self.hass = hass
+        self.data = data
+        self.instruments = None
+        self.coordinator = SimpleNamespace(
+            data=calculate_metrics_for_date(data, today),
+            async_add_listener=lambda _update: lambda: None,
+        )
+        self._subscribers: set = set()
+
+
+class _Connection:
+    """Stands in for ActiveConnection: serializes every message it is given."""
+
+    def __init__(self) -> None:
+        self.subscriptions: Dict[int, Callable[[], None]] = {}
+        self.bytes_sent = 0
+
+    def send_message(self, message: Dict[str, Any]) -> None:
+        self.bytes_sent += len(messages.message_to_json_bytes(message))
+
+    def send_result(self, msg_id: int, result: Any = None) -> None:
+        self.send_message(messages.result_message(msg_id, result))
+
+    def send_error(self, msg_id: int, code: str, message: str) -> None:
+        raise RuntimeError(f"{code}: {message}")
+
+
+def _cases(size: int) -> Dict[str, Callable[[], Any]]:
+    raw = synthetic_history(size)
+    data = FertilityData.from_dict(raw)
+    # A running entry has parsed its events (sensors, calendar, triggers):
+    # serialize those, not the raw rows the lazy sections would hand back
+    len(data.sex_events), len(data.pregnancy_tests)
+    last = data.cycles[-1].start
+    today = dt.datetime.combine(last + dt.timedelta(days=10), dt.time(12), TZ)
+    hass = SimpleNamespace(data={}, config=SimpleNamespace(time_zone=TZ_NAME))
+    runtime = _Runtime(hass, data, today)
+    hass.data[DOMAIN] = {ENTRY_ID: runtime}
+    connection = _Connection()
+    entity = FertilityTrackerCalendar(hass, ENTRY_ID, runtime)
+
+    def ws(handler: Callable[..., Any], **fields: Any) -> Callable[[], None]:
+        msg = {"id": 1, "type": handler._ws_command, "entry_id": ENTRY_ID, **fields}
+        # async_response would schedule the coroutine; run it inline instead
+        target = getattr(handler, "__wrapped__", handler)
+
+        def run() -> None:
+            pending = target(hass, connection, handler._ws_schema(msg))
+            if pending is not None:
+                _drive(pending)
+            if 1 in connection.subscriptions:
+                connection.subscriptions.pop(1)()
+
+        return run
+
+    # The card's window: a year back through three months ahead
+    window = {
+        "start": (last - dt.timedelta(days=365)).isoformat(),
+        "end": (last + dt.timedelta(days=90)).isoformat(),
+    }
+
+    def metrics_cold() -> None:
+        data.bump_revision()
+        calculate_metrics_for_date(data, today)
+
+    def risk_cold() -> None:
+        data.bump_revision()  # rebuilds the projection and timeline, as after an edit
+        data.risk_timeline().at(today.date())
+
+    def calendar(days: int) -> Callable[[], None]:
+        start = dt.datetime.combine(last - dt.timedelta(days=days - 30), dt.time.min, TZ)
+        end = start + dt.timedelta(days=days)
+
+        def run() -> None:
+            data.bump_revision()  # a fresh revision, as after any edit
+            _drive(entity.async_get_events(hass, start, end))
+
+        return run
+
+    def from_dict_full() -> None:
+        loaded = FertilityData.from_dict(raw)
+        len(loaded.sex_events), len(loaded.pregnancy_tests)  # force the lazy sections too
+
+    return {
+        "metrics_cached": lambda: calculate_metrics_for_date(data, today),
+        "risk_at": lambda: data.risk_timeline().at(today.date()),
+        "risk_cold": risk_cold,
+        "metrics_cold": metrics_cold,
+        "calendar_30d": calendar(30),
+        "calendar_365d": calendar(365),
+        "calendar_1825d": calendar(1825),
+        "from_dict": lambda: FertilityData.from_dict(raw),
+        "from_dict_full": from_dict_full,
+        "as_dict": data.as_dict,
+        "ws_list_cycles": ws(ws_list_cycles),
+        "ws_list_window": ws(ws_list_cycles, **window, limit=100),
+        "ws_subscribe": ws(ws_subscribe, **window),
+        "ws_forecast": ws(ws_forecast, **window),
+        "ws_distribution": ws(ws_distribution),
+        "ws_risk_timeline": ws(ws_risk_timeline),
+    }
+
+
+def run(sizes: tuple[int, ...], only: str | None = None) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    calibration = _calibrate()
+    for size in sizes:
+        for name, fn in _cases(size).items():
+            if only and only not in name:
+                continue
+            key = f"{name}[n={size}]"
+            r = results[key] = _measure(fn)
+            # Bracket the case: a load spike on either side counts against the machine
+            before, calibration = calibration, _calibrate()
+            r["calibration_us"] = round(max(before, calibration), 2)
+            r["relative"] = round(r["p50_us"] / r["calibration_us"], 4)
+            print(
+                f"{key:<28}{r['ops_per_sec']:>12.1f} ops/s"
+                f"{r['p50_us']:>12.1f}{r['p95_us']:>12.1f}{r['p99_us']:>12.1f} us (p50/p95/p99)"
+            )
+    return results
+
+
+def check(
+    results: Dict[str, Dict[str, float]],
+    baselines: Dict[str, Any],
+    threshold: float,
+    min_delta_us: float = 0.0,
+) -> list[str]:
+    """Return a line per case whose median is more than ``threshold`` slower.
+
+    Baselines are scaled by the calibration loop timed next to each case, so
+    a machine that is uniformly slower (or busier) right now does not fail.
+    Slowdowns smaller than ``min_delta_us`` are ignored: microsecond-scale
+    cases are dominated by scheduler noise.
+    """
+    failures = []
+    for key, result in results.items():
+        base = baselines.get("results", {}).get(key)
+        if base is None:
+            continue
+        if "relative" in base and "calibration_us" in result:
+            expected = base["relative"] * result["calibration_us"]
+        else:  # recorded before calibration existed
+            expected = base["p50_us"]
+        limit = max(expected * (1 + threshold), expected + min_delta_us)
+        if result["p50_us"] > limit:
+            failures.append(
+                f"{key}: p50 {result['p50_us']:.1f}us > {limit:.1f}us "
+                f"(baseline {expected:.1f}us on this machine +{threshold:.0%})"
+            )
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--only", help="run cases whose name contains this")
+    parser.add_argument("--update", action="store_true", help="write results as baselines")
+    parser.add_argument("--check", action="store_true", help="fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--min-delta-us", type=float, default=25.0)
+    parser.add_argument("--baselines", type=Path, default=BASELINES)
+    args = parser.parse_args(argv)
+
+    sizes = tuple(int(s) for s in args.sizes.split(","))
+    results = run(sizes, args.only)
+
+    if args.update:
+        previous = json.loads(args.baselines.read_text()) if args.baselines.exists() else {}
+        merged = {**previous.get("results", {}), **results}
+        args.baselines.write_text(
+            json.dumps(
+                {
+                    "meta": {
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "recorded": dt.date.today().isoformat(),
+                    },
+                    "results": dict(sorted(merged.items())),
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Baselines written to {args.baselines}")
+
+    if args.check:
+        if not args.baselines.exists():
+            print(f"No baselines at {args.baselines}; run with --update first")
+            return 1
+        failures = check(
+            results, json.loads(args.baselines.read_text()), args.threshold, args.min_delta_us
+        )
+        for line in failures:
+            print(f"REGRESSION {line}")
+        if failures:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
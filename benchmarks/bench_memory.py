@@ -0,0 +1,129 @@
+"""Bytes per stored event, plain dataclasses vs the slotted models.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_memory [count]
+
+Events are built from export-style dicts (what a load from storage does), with
+a few repeated notes and timestamps carrying a UTC offset, as HA writes them.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import gc
+import json
+import sys
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from custom_components.fertility_tracker.helpers import (
+    CycleEvent,
+    PregnancyTestEvent,
+    SexEvent,
+)
+
+
+# The models as they were before slots/interning, for comparison
+@dataclass
+class PlainCycleEvent:
+    id: str
+    start: dt.date
+    end: dt.date | None = None
+    notes: str | None = None
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "PlainCycleEvent":
+        return PlainCycleEvent(
+            id=d["id"],
+            start=dt.date.fromisoformat(d["start"]),
+            end=dt.date.fromisoformat(d["end"]) if d.get("end") else None,
+            notes=d.get("notes"),
+        )
+
+
+@dataclass
+class PlainSexEvent:
+    ts: dt.datetime
+    protected: bool
+    notes: str | None = None
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "PlainSexEvent":
+        return PlainSexEvent(
+            ts=dt.datetime.fromisoformat(d["ts"]),
+            protected=bool(d["protected"]),
+            notes=d.get("notes"),
+        )
+
+
+@dataclass
+class PlainPregnancyTestEvent:
+    ts: dt.datetime
+    result: str
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "PlainPregnancyTestEvent":
+        return PlainPregnancyTestEvent(
+            ts=dt.datetime.fromisoformat(d["ts"]), result=d["result"]
+        )
+
+
+_NOTES = [None, None, None, "Started today", "Preset 5d"]
+_BASE = dt.datetime(2000, 1, 1, 21, 30, tzinfo=dt.timezone(dt.timedelta(hours=2)))
+
+
+def _rows(kind: str, count: int) -> list[Dict[str, Any]]:
+    rows = []
+    for i in range(count):
+        ts = _BASE + dt.timedelta(hours=7 * i)
+        if kind == "cycles":
+            day = ts.date()
+            rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "start": day.isoformat(),
+                    "end": (day + dt.timedelta(days=5)).isoformat(),
+                    "notes": _NOTES[i % 5],
+                }
+            )
+        elif kind == "sex_events":
+            rows.append(
+                {"ts": ts.isoformat(), "protected": bool(i % 2), "notes": _NOTES[i % 5]}
+            )
+        else:
+            rows.append({"ts": ts.isoformat(), "result": "negative"})
+    # Round-trip so strings are distinct objects, as after loading from storage
+    return json.loads(json.dumps(rows))
+
+
+def _bytes_per_event(factory: Callable[[Dict[str, Any]], Any], rows: list) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    events = [factory(r) for r in rows]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del events
+    return used / len(rows)
+
+
+def main(count: int = 100_000) -> None:
+    cases = [
+        ("cycles", PlainCycleEvent.from_dict, CycleEvent.from_dict),
+        ("sex_events", PlainSexEvent.from_dict, SexEvent.from_dict),
+        ("pregnancy_tests", PlainPregnancyTestEvent.from_dict, PregnancyTestEvent.from_dict),
+    ]
+    print(f"{count} events per section, bytes/event (includes the list slot)")
+    print(f"{'section':<16}{'before':>10}{'after':>10}{'saved':>8}")
+    for name, before, after in cases:
+        rows = _rows(name, count)
+        old = _bytes_per_event(before, rows)
+        new = _bytes_per_event(after, rows)
+        print(f"{name:<16}{old:>10.1f}{new:>10.1f}{1 - new / old:>8.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
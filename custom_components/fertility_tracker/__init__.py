@@ -1,26 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
 import logging
-from typing import Optional, Callable
+from typing import Any, Callable, Dict, Optional
 
 import voluptuous as vol
 
-from homeassistant.core import HomeAssistant, callback, ServiceCall
+from homeassistant.core import HomeAssistant, callback, ServiceCall, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.helpers.storage import Store
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE, EVENT_HOMEASSISTANT_STOP
 from homeassistant.helpers import event as hass_event
-from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.components import websocket_api
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util import dt as dt_util  # use HA's timezone helpers
 
 from .const import (
     DOMAIN,
+    DATA_REMINDERS,
+    DATA_SUBSCRIBERS,
+    DATA_TRIGGERS,
     PLATFORMS,
-    STORAGE_VERSION,
-    STORAGE_KEY_PREFIX,
+    STORAGE_ENGINE_JOURNAL,
     CONF_NAME,
     CONF_LUTEAL_DAYS,
     CONF_RECENT_WEIGHT,
@@ -31,6 +33,11 @@ from .const import (
     CONF_DAILY_REMINDER_TIME,
     CONF_QUIET_HOURS_START,
     CONF_QUIET_HOURS_END,
+    CONF_SAVE_DELAY,
+    CONF_SAVE_MAX_DELAY,
+    CONF_STORAGE_ENGINE,
+    CONF_INSTRUMENTATION,
+    CONF_TRIGGER_COOLDOWN,
     DEFAULT_LUTEAL_DAYS,
     DEFAULT_RECENT_WEIGHT,
     DEFAULT_LONG_WEIGHT,
@@ -38,14 +45,36 @@ from .const import (
     DEFAULT_DAILY_REMINDER_TIME,
     DEFAULT_QUIET_HOURS_START,
     DEFAULT_QUIET_HOURS_END,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_SAVE_MAX_DELAY,
+    DEFAULT_STORAGE_ENGINE,
+    DEFAULT_INSTRUMENTATION,
+    DEFAULT_TRIGGER_COOLDOWN,
+    DISTRIBUTION_COVERAGE,
+    EXPORT_CHUNK_BYTES,
+    FORECAST_MAX_DAYS,
+    LIST_DEFAULT_LIMIT,
+    LIST_MAX_LIMIT,
 )
+from .coordinator import FertilityCoordinator
+from .notifier import Notifier
+from .outbox import Outbox
+from .scheduler import async_get_scheduler
+from .triggers import async_get_dispatcher
+from .instrumentation import Instruments, instrumented_ws, timed
+from .storage import EntryStorage
 from .helpers import (
     FertilityData,
     calculate_metrics_for_date,
     today_local,
     parse_time,
     coerce_date,
-    SexEvent,
+    export_header,
+    forecast_range,
+    iter_export_chunks,
+    list_window,
+    parse_history,
+    risk_strip,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -53,6 +82,66 @@ _LOGGER = logging.getLogger(__name__)
 # Hassfest wants a CONFIG_SCHEMA when async_setup exists
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+# Mutation record op -> delta type sent to fertility_tracker/subscribe clients
+_DELTA_TYPES = {
+    "add_period": "cycle_added",
+    "edit_cycle": "cycle_updated",
+    "delete_cycle": "cycle_deleted",
+    "log_sex": "sex_logged",
+    "log_test": "test_logged",
+    "import": "history_imported",
+    "set_options": "options_changed",
+}
+
+
+def _iso(value: dt.datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+# Options read once when the runtime is built; changing one reloads the entry
+_RELOAD_OPTIONS = {
+    CONF_SAVE_DELAY: DEFAULT_SAVE_DELAY,
+    CONF_SAVE_MAX_DELAY: DEFAULT_SAVE_MAX_DELAY,
+    CONF_STORAGE_ENGINE: DEFAULT_STORAGE_ENGINE,
+    CONF_INSTRUMENTATION: DEFAULT_INSTRUMENTATION,
+    CONF_TRIGGER_COOLDOWN: DEFAULT_TRIGGER_COOLDOWN,
+}
+
+
+def _reload_options(options: Dict[str, Any]) -> tuple:
+    return tuple(options.get(key, default) for key, default in _RELOAD_OPTIONS.items())
+
+
+class _Subscriber:
+    """One fertility_tracker/subscribe client.
+
+    Its listeners sit on a runtime's data and coordinator, which a reload
+    replaces: the old runtime detaches it on unload and the new one attaches
+    it again with a fresh snapshot, so open cards keep streaming.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Dict[str, Any]], None],
+        first: dt.date | None,
+        last: dt.date | None,
+    ) -> None:
+        self._send = send
+        self._window = (first, last)
+        self._detach: Callable[[], None] | None = None
+
+    @callback
+    def attach(self, runtime: EntryRuntime) -> None:
+        self._detach = runtime.async_subscribe(self._send)
+        with timed(runtime.instruments, "ws:subscribe"):
+            self._send(runtime.snapshot_event(*self._window))
+
+    @callback
+    def detach(self) -> None:
+        if self._detach is not None:
+            self._detach()
+            self._detach = None
+
 
 class EntryRuntime:
     """Runtime state per config entry."""
@@ -60,7 +149,14 @@ class EntryRuntime:
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         self.hass = hass
         self.entry = entry
-        self.store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_PREFIX}{entry.entry_id}")
+        self._built_with = _reload_options(entry.options)
+        self.storage = EntryStorage(
+            hass,
+            entry.entry_id,
+            journal=entry.options.get(CONF_STORAGE_ENGINE, DEFAULT_STORAGE_ENGINE)
+            == STORAGE_ENGINE_JOURNAL,
+        )
+        self.store = self.storage.store
         self.data: FertilityData = FertilityData(
             name=entry.data.get(CONF_NAME, entry.title or "Fertility"),
             luteal_days=entry.options.get(CONF_LUTEAL_DAYS, DEFAULT_LUTEAL_DAYS),
@@ -83,107 +179,344 @@ class EntryRuntime:
             pregnancy_tests=[],
             last_notified_date=None,
         )
-        self._listeners: list[Callable[[], None]] = []
-        self._timer_unsub: Optional[Callable[[], None]] = None
+        self.instruments: Instruments | None = (
+            Instruments()
+            if entry.options.get(CONF_INSTRUMENTATION, DEFAULT_INSTRUMENTATION)
+            else None
+        )
+        self._triggers = async_get_dispatcher(hass)
+        self._trigger_cooldown = float(
+            entry.options.get(CONF_TRIGGER_COOLDOWN, DEFAULT_TRIGGER_COOLDOWN)
+        )
+        self._trigger_quiet_until = 0.0
+        self.trigger_counts = {"received": 0, "debounced": 0, "already_notified": 0}
+        self._reminders = async_get_scheduler(hass)
+        self.notifier = Notifier(hass)
+        self.outbox = Outbox(hass, self)
+        self._config_unsub: Optional[Callable[[], None]] = None
+        self.coordinator = FertilityCoordinator(hass, self)
+        self._subscribers: set[_Subscriber] = hass.data.setdefault(
+            DATA_SUBSCRIBERS, {}
+        ).setdefault(entry.entry_id, set())
+
+        # Write-behind persistence: dirty marks within the delay share one write
+        self._save_delay = float(entry.options.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY))
+        self._save_max_delay = float(
+            entry.options.get(CONF_SAVE_MAX_DELAY, DEFAULT_SAVE_MAX_DELAY)
+        )
+        self._save_unsub: Optional[Callable[[], None]] = None
+        self._dirty_since: float | None = None
+        self.saves_written = 0
+        self.saves_coalesced = 0
+
+    @callback
+    def async_subscribe(self, send: Callable[[Dict[str, Any]], None]) -> Callable[[], None]:
+        """Stream typed deltas to ``send`` until the returned callback is called.
+
+        Data deltas carry the revision they produced, one per revision, so a
+        client that sees a jump knows it missed something and resubscribes.
+        ``metrics_changed`` carries the current revision and is only sent when
+        today's metrics actually differ from the last ones sent; likewise
+        ``risk_changed`` carries the whole risk strip when it differs.
+        """
+        sent = {"metrics": self.coordinator.data, "risk": risk_strip(self.data)}
+
+        def _on_mutation(op: str, payload: Dict[str, Any]) -> None:
+            kind = _DELTA_TYPES.get(op)
+            if kind is not None:
+                send({"type": kind, "revision": self.data.revision, "data": payload})
+
+        @callback
+        def _on_metrics() -> None:
+            strip = risk_strip(self.data)
+            if strip != sent["risk"]:
+                sent["risk"] = strip
+                send({"type": "risk_changed", "revision": self.data.revision, "data": strip})
+            metrics = self.coordinator.data
+            if metrics is None or metrics == sent["metrics"]:
+                return
+            sent["metrics"] = metrics
+            send(
+                {
+                    "type": "metrics_changed",
+                    "revision": self.data.revision,
+                    "data": metrics.as_dict(),
+                }
+            )
+
+        remove_mutation = self.data.add_mutation_listener(_on_mutation)
+        remove_metrics = self.coordinator.async_add_listener(_on_metrics)
+
+        @callback
+        def _unsubscribe() -> None:
+            remove_mutation()
+            remove_metrics()
+
+        return _unsubscribe
+
+    @callback
+    def async_add_subscriber(self, subscriber: _Subscriber) -> Callable[[], None]:
+        """Attach a subscribe client; it stays registered across entry reloads."""
+        self._subscribers.add(subscriber)
+        subscriber.attach(self)
+
+        @callback
+        def _remove() -> None:
+            subscriber.detach()
+            self._subscribers.discard(subscriber)
+
+        return _remove
+
+    @callback
+    def async_attach_subscribers(self) -> None:
+        """Re-attach clients left by the runtime this one replaced."""
+        for subscriber in self._subscribers:
+            subscriber.attach(self)
+
+    def snapshot_event(self, first: dt.date | None, last: dt.date | None) -> Dict[str, Any]:
+        """Initial subscription message: the (optionally windowed) data, metrics and risk strip."""
+        if first is None and last is None:
+            data = self.data.as_dict()
+        else:
+            data = list_window(
+                self.data,
+                first or dt.date.min,
+                last or dt.date.max - dt.timedelta(days=1),
+                dt_util.get_time_zone(self.hass.config.time_zone),
+                max(len(self.data.cycles), len(self.data.sex_events), len(self.data.pregnancy_tests), 1),
+            )
+            data.pop("next_cursor")
+        metrics = self.coordinator.data
+        return {
+            "type": "snapshot",
+            "revision": self.data.revision,
+            "data": data,
+            "metrics": metrics.as_dict() if metrics else None,
+            "risk": risk_strip(self.data),
+        }
 
     async def async_load(self) -> None:
-        saved = await self.store.async_load()
-        if saved:
-            self.data = FertilityData.from_dict(saved)
-            _LOGGER.debug("Loaded fertility data for %s", self.entry.entry_id)
+        self.data = await self.storage.async_load(self.data)
+        # The entry's options are the source of truth; stored copies may be stale
+        self.apply_options(self.entry.options)
+        self.data.add_mutation_listener(self.storage.record)
+        _LOGGER.debug("Loaded fertility data for %s", self.entry.entry_id)
 
     async def async_save(self) -> None:
-        await self.store.async_save(self.data.as_dict())
+        """Write the data now, absorbing any pending delayed save."""
+        self._cancel_pending_save()
+        with timed(self.instruments, "store_write"):
+            await self.storage.async_write(self.data)
+        self.saves_written += 1
         _LOGGER.debug("Saved fertility data for %s", self.entry.entry_id)
 
-    async def async_setup_timers_and_triggers(self) -> None:
-        # Daily reminder timer
-        if self._timer_unsub:
-            self._timer_unsub()
-            self._timer_unsub = None
+    async def async_request_save(self) -> None:
+        """Mark the data dirty; write it after the save delay or max latency."""
+        if self._save_delay <= 0:
+            await self.async_save()
+            return
+
+        now = self.hass.loop.time()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        else:
+            self.saves_coalesced += 1
+        if self._save_unsub:
+            self._save_unsub()
 
+        deadline = min(now + self._save_delay, self._dirty_since + self._save_max_delay)
+        self._save_unsub = hass_event.async_call_later(
+            self.hass, max(0.0, deadline - now), self._async_delayed_save
+        )
+
+    async def _async_delayed_save(self, _now: dt.datetime) -> None:
+        self._save_unsub = None
+        await self.async_save()
+
+    def _cancel_pending_save(self) -> None:
+        if self._save_unsub:
+            self._save_unsub()
+            self._save_unsub = None
+        self._dirty_since = None
+
+    def save_stats(self) -> dict:
+        return {
+            "written": self.saves_written,
+            "coalesced": self.saves_coalesced,
+            "pending": self._dirty_since is not None,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and timings for diagnostics and fertility_tracker/stats."""
+        return {
+            "revision": self.data.revision,
+            "cycles": len(self.data.cycles),
+            "metrics_cache": self.data.cache_stats(),
+            "saves": self.save_stats(),
+            "storage": self.storage.stats(),
+            "wakeups": {
+                "count": self.coordinator.wakeups,
+                "next": _iso(self.coordinator.next_wakeup),
+            },
+            "reminder_next": _iso(self._reminders.next_fire(self.entry.entry_id)),
+            "triggers": {
+                "entities": len(self._triggers.entities_for(self.entry.entry_id)),
+                **self.trigger_counts,
+            },
+            "notify": self.notifier.stats(),
+            "outbox": self.outbox.stats(),
+            "instrumentation": self.instruments is not None,
+            "timings": self.instruments.as_dict() if self.instruments else {},
+        }
+
+    async def async_import(self, payload: str | dict, fmt: str) -> dict:
+        """Validate and merge a history import; raises ValueError on bad input."""
+        tz = dt_util.get_time_zone(self.hass.config.time_zone)
+        batch = parse_history(payload, fmt, tz)
+        counts = self.data.import_history(batch)
+        if any(counts["inserted"].values()):
+            await self.async_data_changed()
+        return counts
+
+    async def async_data_changed(self) -> None:
+        """Push fresh metrics to the entities after a mutation, then persist."""
+        self.coordinator.async_recompute()
+        self._reminders.async_reschedule(self.entry.entry_id)
+        await self.async_request_save()
+
+    def apply_options(self, options: Dict[str, Any]) -> bool:
+        """Copy changed option values onto the live data; True if any changed."""
+        values = {
+            "luteal_days": options.get(CONF_LUTEAL_DAYS, DEFAULT_LUTEAL_DAYS),
+            "recent_weight": options.get(CONF_RECENT_WEIGHT, DEFAULT_RECENT_WEIGHT),
+            "long_weight": options.get(CONF_LONG_WEIGHT, DEFAULT_LONG_WEIGHT),
+            "recent_window": options.get(CONF_RECENT_WINDOW, DEFAULT_RECENT_WINDOW),
+            "notify_services": list(options.get(CONF_NOTIFY_SERVICES, [])),
+            "trigger_entities": list(options.get(CONF_TRIGGER_ENTITIES, [])),
+            "quiet_hours_start": options.get(CONF_QUIET_HOURS_START, DEFAULT_QUIET_HOURS_START),
+            "quiet_hours_end": options.get(CONF_QUIET_HOURS_END, DEFAULT_QUIET_HOURS_END),
+            "daily_reminder_time": options.get(CONF_DAILY_REMINDER_TIME, DEFAULT_DAILY_REMINDER_TIME),
+        }
+        return self.data.set_options(values)
+
+    async def async_options_updated(self) -> None:
+        """Apply edited options, reloading only for settings read at build time."""
+        if _reload_options(self.entry.options) != self._built_with:
+            await self.hass.config_entries.async_reload(self.entry.entry_id)
+            return
+        if self.apply_options(self.entry.options):
+            self.coordinator.async_recompute()
+            await self.async_setup_timers_and_triggers()
+            await self.async_request_save()
+
+    async def async_setup_timers_and_triggers(self) -> None:
+        # Daily reminder: one domain-wide timer, only on days a prompt is possible
         target_time = parse_time(self.data.daily_reminder_time)
         if target_time is None:
             target_time = parse_time(DEFAULT_DAILY_REMINDER_TIME)
+        self._reminders.async_schedule(
+            self.entry.entry_id, target_time, self.prompt_days, self._async_daily_reminder
+        )
+
+        # Day rollovers are wakeups armed by the coordinator; a time zone change
+        # moves "today" and local midnight, so recompute and re-arm.
+        if self._config_unsub:
+            self._config_unsub()
 
         @callback
-        def _daily_reminder(now: dt.datetime) -> None:
-            self.hass.async_create_task(self._maybe_send_expected_period_prompt())
-
-        self._timer_unsub = hass_event.async_track_time_change(
-            self.hass,
-            _daily_reminder,
-            hour=target_time.hour,
-            minute=target_time.minute,
-            second=target_time.second,
+        def _core_config_updated(event) -> None:
+            self.coordinator.async_recompute()
+
+        self._config_unsub = self.hass.bus.async_listen(
+            EVENT_CORE_CONFIG_UPDATE, _core_config_updated
         )
 
-        # Trigger entities (arrival / on) for risk notification
-        if self._listeners:
-            for unsub in self._listeners:
-                try:
-                    unsub()
-                except Exception:
-                    pass
-            self._listeners.clear()
-
-        for ent_id in self.data.trigger_entities:
-            unsub = async_track_state_change_event(
-                self.hass, ent_id, self._trigger_entity_changed
-            )
-            self._listeners.append(unsub)
+        # Trigger entities (arrival / on) for risk notification, shared domain-wide
+        self._triggers.async_set_entities(
+            self.entry.entry_id, self.data.trigger_entities, self._trigger_fired
+        )
+
+        # Deliver whatever was left queued (e.g. across a restart or quiet hours change)
+        if self.data.outbox:
+            self.outbox.async_kick()
 
     async def async_unload(self) -> None:
-        if self._timer_unsub:
-            self._timer_unsub()
-            self._timer_unsub = None
-        for unsub in self._listeners:
-            try:
-                unsub()
-            except Exception:
-                pass
-        self._listeners.clear()
+        for subscriber in self._subscribers:
+            subscriber.detach()
+        self._reminders.async_remove(self.entry.entry_id)
+        if self._config_unsub:
+            self._config_unsub()
+            self._config_unsub = None
+        self.coordinator.async_cancel_wakeup()
+        self._triggers.async_remove(self.entry.entry_id)
+        await self.outbox.async_shutdown()
         await self.async_save()
 
-    async def _trigger_entity_changed(self, event) -> None:
-        """On arrival (home) or binary_sensor turns on, notify today's risk."""
-        new_state = event.data.get("new_state")
-        if not new_state:
+    @callback
+    def _trigger_fired(self, reason: str) -> None:
+        """A trigger entity arrived home or turned on: notify today's risk.
+
+        Runs in the event loop for every transition, so storms are cut short
+        here before a task is created: events once today's notification has
+        gone out are dropped, as are events inside the cooldown. Only a
+        created task starts a cooldown.
+        """
+        counts = self.trigger_counts
+        counts["received"] += 1
+        if self.data.last_notified_date == dt_util.now().date().isoformat():
+            counts["already_notified"] += 1
+            return
+        now = self.hass.loop.time()
+        if now < self._trigger_quiet_until:
+            counts["debounced"] += 1
             return
-        state = new_state.state
-        domain = new_state.domain
-        if domain == "device_tracker" and state == "home":
-            await self._notify_today_risk(reason=f"{new_state.entity_id} is home")
-        elif domain == "binary_sensor" and state == "on":
-            await self._notify_today_risk(reason=f"{new_state.entity_id} turned on")
+        self._trigger_quiet_until = now + self._trigger_cooldown
+        self.hass.async_create_task(self._notify_today_risk(reason=reason))
+
+    def prompt_days(self) -> tuple[dt.date, dt.date] | None:
+        """Days the expected-period prompt can fire on, or None if it cannot.
+
+        The DISTRIBUTION_COVERAGE interval of the next start after the last
+        logged one; it widens with irregular cycles.
+        """
+        dist = self.data.distribution()
+        return dist.period.interval(DISTRIBUTION_COVERAGE) if dist is not None else None
+
+    async def _async_daily_reminder(self, day: dt.date) -> None:
+        await self._maybe_send_expected_period_prompt()
 
     async def _maybe_send_expected_period_prompt(self) -> None:
-        """If expected period date is today±1 and not logged, ask via notify.*"""
-        metrics = calculate_metrics_for_date(self.data, today_local(self.hass))
-        if metrics.next_period_date is None:
+        """If today is in the likely next-period range and none is logged, ask via notify.*"""
+        days = self.prompt_days()
+        if days is None:
             return
 
+        first, last = days
         today = today_local(self.hass).date()
-        if abs((metrics.next_period_date - today).days) <= 1:
+        if first <= today <= last:
             already = any(
                 c.start <= today <= (c.end or c.start) for c in self.data.cycles
             )
             if not already:
-                await self._send_notifications(
+                expected = self.data.distribution().period.most_likely()
+                await self.outbox.async_put(
+                    "period_check",
+                    today,
                     title=f"{self.data.name}: Period check",
                     message=(
-                        f"Is your period starting around {metrics.next_period_date.isoformat()}? "
+                        f"Is your period starting around {expected.isoformat()} "
+                        f"(likely between {first.isoformat()} and {last.isoformat()})? "
                         "You can correct or confirm in: Settings → Devices & Services → Fertility Tracker panel."
                     ),
                 )
 
-    def _quiet_hours(self, now: dt.datetime) -> bool:
-        """Check if now is within quiet hours range (may span midnight)."""
+    def quiet_until(self, now: dt.datetime) -> dt.datetime | None:
+        """When the quiet hours ``now`` falls in end (may span midnight), or None."""
         try:
             start = parse_time(self.data.quiet_hours_start)
             end = parse_time(self.data.quiet_hours_end)
             if start is None or end is None:
-                return False
+                return None
             start_dt = now.replace(
                 hour=start.hour, minute=start.minute, second=start.second, microsecond=0
             )
@@ -191,45 +524,44 @@ class EntryRuntime:
                 hour=end.hour, minute=end.minute, second=end.second, microsecond=0
             )
             if start_dt <= end_dt:
-                return start_dt <= now <= end_dt
-            return now >= start_dt or now <= end_dt  # spans midnight
+                quiet = start_dt <= now <= end_dt
+            else:
+                quiet = now >= start_dt or now <= end_dt  # spans midnight
         except Exception:
-            return False
+            return None
+        if not quiet:
+            return None
+        if end_dt < now:
+            end_dt += dt.timedelta(days=1)
+        # The end itself is still quiet
+        return end_dt + dt.timedelta(seconds=1)
 
     async def _notify_today_risk(self, reason: str) -> None:
-        """Notify today's risk using a real tzinfo (fixes freezegun/HA tests)."""
+        """Queue today's risk notification; quiet hours only delay it (see Outbox)."""
         tz = dt_util.get_time_zone(self.hass.config.time_zone)
         now = dt_util.now(tz)
 
-        if self._quiet_hours(now):
-            return
         if self.data.last_notified_date == now.date().isoformat():
             return
 
-        metrics = calculate_metrics_for_date(self.data, now)
-        if metrics.risk_label:
-            await self._send_notifications(
+        run = self.data.risk_timeline().at(now.date())
+        if run is not None:
+            metrics = calculate_metrics_for_date(self.data, now)
+            self.data.mark_notified(now.date().isoformat())
+            # The outbox writes the store, covering the notified date as well
+            await self.outbox.async_put(
+                "risk",
+                now.date(),
                 title=f"{self.data.name}: Today's fertility risk",
                 message=(
-                    f"{metrics.risk_label} (triggered by {reason}). "
+                    f"{run.label} (triggered by {reason}). "
                     f"Cycle day {metrics.cycle_day}. Ovulation ~ {metrics.predicted_ovulation_date}."
                 ),
             )
-            self.data.last_notified_date = now.date().isoformat()
-            await self.async_save()
 
-    async def _send_notifications(self, title: str, message: str) -> None:
-        for svc in self.data.notify_services:
-            try:
-                domain, service = svc.split(".")
-            except ValueError:
-                domain, service = "notify", svc
-            await self.hass.services.async_call(
-                domain,
-                service,
-                {"title": title, "message": message},
-                blocking=True,  # more deterministic in tests
-            )
+    async def _send_notifications(self, title: str, message: str) -> Dict[str, str]:
+        with timed(self.instruments, "notify_fanout"):
+            return await self.notifier.async_send(self.data.notify_services, title, message)
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
@@ -254,13 +586,26 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     else:
         _LOGGER.debug("HTTP not loaded or register_static_path unavailable; skipping")
 
+    if http is not None:
+        from .views import FertilityExportView
+
+        http.register_view(FertilityExportView())
+
     # WebSocket API registrations
     websocket_api.async_register_command(hass, ws_list_entries)  # NEW
     websocket_api.async_register_command(hass, ws_list_cycles)
     websocket_api.async_register_command(hass, ws_add_period)
     websocket_api.async_register_command(hass, ws_edit_cycle)
     websocket_api.async_register_command(hass, ws_delete_cycle)
+    websocket_api.async_register_command(hass, ws_subscribe)
     websocket_api.async_register_command(hass, ws_export_data)
+    websocket_api.async_register_command(hass, ws_export_stream)
+    websocket_api.async_register_command(hass, ws_import)
+    websocket_api.async_register_command(hass, ws_forecast)
+    websocket_api.async_register_command(hass, ws_projection)
+    websocket_api.async_register_command(hass, ws_distribution)
+    websocket_api.async_register_command(hass, ws_risk_timeline)
+    websocket_api.async_register_command(hass, ws_stats)
 
     # ---------- Domain services ----------
     async def _get_runtime_for_service(call: ServiceCall) -> EntryRuntime | None:
@@ -286,7 +631,7 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         date = coerce_date(call.data["date"])
         notes = call.data.get("notes")
         runtime.data.add_period(start=date, end=None, notes=notes)
-        await runtime.async_save()
+        await runtime.async_data_changed()
 
     async def _svc_log_period_end(call: ServiceCall) -> None:
         runtime = await _get_runtime_for_service(call)
@@ -300,8 +645,10 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
                 _LOGGER.warning("cycle_id %s not found for period_end", cycle_id)
         else:
             if runtime.data.cycles:
-                runtime.data.cycles[-1].end = date
-        await runtime.async_save()
+                runtime.data.edit_cycle(
+                    cycle_id=runtime.data.cycles[-1].id, start=None, end=date, notes=None
+                )
+        await runtime.async_data_changed()
 
     async def _svc_log_sex(call: ServiceCall) -> None:
         runtime = await _get_runtime_for_service(call)
@@ -309,14 +656,27 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
             return
         protected = bool(call.data["protected"])
         notes = call.data.get("notes")
-        runtime.data.sex_events.append(
-            SexEvent(ts=today_local(hass), protected=protected, notes=notes)
-        )
-        await runtime.async_save()
+        runtime.data.add_sex_event(ts=today_local(hass), protected=protected, notes=notes)
+        await runtime.async_data_changed()
+
+    async def _svc_import_history(call: ServiceCall) -> dict | None:
+        runtime = await _get_runtime_for_service(call)
+        if not runtime:
+            return None
+        try:
+            return await runtime.async_import(call.data["data"], call.data.get("format", "json"))
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
 
     hass.services.async_register(DOMAIN, "log_period_start", _svc_log_period_start)
     hass.services.async_register(DOMAIN, "log_period_end", _svc_log_period_end)
     hass.services.async_register(DOMAIN, "log_sex", _svc_log_sex)
+    hass.services.async_register(
+        DOMAIN,
+        "import_history",
+        _svc_import_history,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
     # ------------------------------------
 
     return True
@@ -325,22 +685,32 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     runtime = EntryRuntime(hass, entry)
     await runtime.async_load()
+    await runtime.coordinator.async_refresh()
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = runtime
+    runtime.async_attach_subscribers()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     await runtime.async_setup_timers_and_triggers()
 
-    @callback
-    def _on_stop(event):
-        hass.async_create_task(runtime.async_unload())
+    async def _options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        await runtime.async_options_updated()
+
+    entry.async_on_unload(entry.add_update_listener(_options_updated))
+
+    async def _on_stop(event):
+        await runtime.async_unload()
 
-    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _on_stop)
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _on_stop))
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     runtime: EntryRuntime = hass.data[DOMAIN].pop(entry.entry_id)
     await runtime.async_unload()
+    if not hass.data[DOMAIN]:
+        for key in (DATA_REMINDERS, DATA_TRIGGERS):
+            if key in hass.data:
+                hass.data.pop(key).async_shutdown()
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     return unload_ok
 
@@ -371,12 +741,36 @@ async def ws_list_entries(hass, connection, msg):
     {
         vol.Required("type"): "fertility_tracker/list_cycles",
         vol.Required("entry_id"): str,
+        vol.Optional("start"): str,
+        vol.Optional("end"): str,
+        vol.Optional("limit"): vol.All(int, vol.Range(min=1, max=LIST_MAX_LIMIT)),
+        vol.Optional("cursor"): str,
     }
 )
 @websocket_api.async_response
+@instrumented_ws
 async def ws_list_cycles(hass, connection, msg):
+    """Full dump by default; a date-windowed, cursor-paged slice when asked."""
     runtime = _get_runtime(hass, msg["entry_id"])
-    connection.send_result(msg["id"], runtime.data.as_dict())
+    if not any(k in msg for k in ("start", "end", "limit", "cursor")):
+        connection.send_result(msg["id"], runtime.data.as_dict())
+        return
+
+    try:
+        first = coerce_date(msg["start"]) if msg.get("start") else dt.date.min
+        last = coerce_date(msg["end"]) if msg.get("end") else dt.date.max - dt.timedelta(days=1)
+        result = list_window(
+            runtime.data,
+            first,
+            last,
+            dt_util.get_time_zone(hass.config.time_zone),
+            msg.get("limit", LIST_DEFAULT_LIMIT),
+            msg.get("cursor"),
+        )
+    except ValueError as err:
+        connection.send_error(msg["id"], "invalid_format", str(err))
+        return
+    connection.send_result(msg["id"], result)
 
 
 @websocket_api.websocket_command(
@@ -389,13 +783,14 @@ async def ws_list_cycles(hass, connection, msg):
     }
 )
 @websocket_api.async_response
+@instrumented_ws
 async def ws_add_period(hass, connection, msg):
     runtime = _get_runtime(hass, msg["entry_id"])
     start = coerce_date(msg.get("start"))
     end = coerce_date(msg.get("end")) if msg.get("end") else None
     notes = msg.get("notes")
     runtime.data.add_period(start=start, end=end, notes=notes)
-    await runtime.async_save()
+    await runtime.async_data_changed()
     connection.send_result(msg["id"], {"ok": True})
 
 
@@ -410,6 +805,7 @@ async def ws_add_period(hass, connection, msg):
     }
 )
 @websocket_api.async_response
+@instrumented_ws
 async def ws_edit_cycle(hass, connection, msg):
     runtime = _get_runtime(hass, msg["entry_id"])
     ok = runtime.data.edit_cycle(
@@ -419,7 +815,7 @@ async def ws_edit_cycle(hass, connection, msg):
         notes=msg.get("notes"),
     )
     if ok:
-        await runtime.async_save()
+        await runtime.async_data_changed()
     connection.send_result(msg["id"], {"ok": ok})
 
 
@@ -431,14 +827,47 @@ async def ws_edit_cycle(hass, connection, msg):
     }
 )
 @websocket_api.async_response
+@instrumented_ws
 async def ws_delete_cycle(hass, connection, msg):
     runtime = _get_runtime(hass, msg["entry_id"])
     ok = runtime.data.delete_cycle(msg["cycle_id"])
     if ok:
-        await runtime.async_save()
+        await runtime.async_data_changed()
     connection.send_result(msg["id"], {"ok": ok})
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "fertility_tracker/subscribe",
+        vol.Required("entry_id"): str,
+        vol.Optional("start"): str,
+        vol.Optional("end"): str,
+    }
+)
+@callback
+def ws_subscribe(hass, connection, msg):
+    """Send a snapshot, then live deltas until the client unsubscribes.
+
+    An entry reload starts the stream over with a fresh snapshot.
+    """
+    runtime = _get_runtime(hass, msg["entry_id"])
+    try:
+        first = coerce_date(msg["start"]) if msg.get("start") else None
+        last = coerce_date(msg["end"]) if msg.get("end") else None
+    except ValueError as err:
+        connection.send_error(msg["id"], "invalid_format", str(err))
+        return
+
+    @callback
+    def _send(event: Dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], event))
+
+    connection.send_result(msg["id"])
+    connection.subscriptions[msg["id"]] = runtime.async_add_subscriber(
+        _Subscriber(_send, first, last)
+    )
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "fertility_tracker/export_data",
@@ -446,6 +875,189 @@ async def ws_delete_cycle(hass, connection, msg):
     }
 )
 @websocket_api.async_response
+@instrumented_ws
 async def ws_export_data(hass, connection, msg):
     runtime = _get_runtime(hass, msg["entry_id"])
-    connection.send_result(msg["id"], runtime.data.as_dict())
\ No newline at end of file
+    connection.send_result(msg["id"], runtime.data.as_dict())
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "fertility_tracker/export_stream",
+        vol.Required("entry_id"): str,
+        vol.Optional("chunk_bytes", default=EXPORT_CHUNK_BYTES): vol.All(
+            int, vol.Range(min=1024, max=1024 * 1024)
+        ),
+    }
+)
+@websocket_api.async_response
+@instrumented_ws
+async def ws_export_stream(hass, connection, msg):
+    """Stream the history as ``start``, bounded ``chunk`` events and ``end``."""
+    runtime = _get_runtime(hass, msg["entry_id"])
+    cancelled = False
+
+    @callback
+    def _cancel() -> None:
+        nonlocal cancelled
+        cancelled = True
+
+    def _send(event: Dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], event))
+
+    connection.subscriptions[msg["id"]] = _cancel
+    connection.send_result(msg["id"])
+    _send({**export_header(runtime.data), "type": "start"})
+
+    rows = chunks = 0
+    for chunk in iter_export_chunks(runtime.data, msg["chunk_bytes"]):
+        if cancelled:
+            return
+        _send({"type": "chunk", "seq": chunks, "rows": chunk})
+        rows += len(chunk)
+        chunks += 1
+        # Let other tasks run (and the socket drain) between chunks
+        await asyncio.sleep(0)
+    connection.subscriptions.pop(msg["id"], None)
+    _send({"type": "end", "rows": rows, "chunks": chunks})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "fertility_tracker/forecast",
+        vol.Required("entry_id"): str,
+        vol.Required("start"): str,
+        vol.Required("end"): str,
+    }
+)
+@websocket_api.async_response
+@instrumented_ws
+async def ws_forecast(hass, connection, msg):
+    """Per-day cycle day, risk level and window membership for [start, end]."""
+    runtime = _get_runtime(hass, msg["entry_id"])
+    try:
+        first = coerce_date(msg["start"])
+        last = coerce_date(msg["end"])
+        if (last - first).days >= FORECAST_MAX_DAYS:
+            raise ValueError(f"range is limited to {FORECAST_MAX_DAYS} days")
+        forecast = forecast_range(runtime.data, first, last)
+    except ValueError as err:
+        connection.send_error(msg["id"], "invalid_format", str(err))
+        return
+    connection.send_result(msg["id"], forecast.as_dict())
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "fertility_tracker/projection",
+        vol.Required("entry_id"): str,
+        vol.Optional("date"): str,
+    }
+)
+@websocket_api.async_response
+@instrumented_ws
+async def ws_projection(hass, connection, msg):
+    """The projected cycle table, and which cycle holds ``date`` if given."""
+    runtime = _get_runtime(hass, msg["entry_id"])
+    projection = runtime.data.projection()
+    result: Dict[str, Any] = {
+        "revision": runtime.data.revision,
+        "cycles": [c.as_dict() for c in projection.cycles],
+    }
+    if msg.get("date"):
+        try:
+            cycle = projection.cycle_for(coerce_date(msg["date"]))
+        except ValueError as err:
+            connection.send_error(msg["id"], "invalid_format", str(err))
+            return
+        result["cycle"] = cycle.as_dict() if cycle else None
+    connection.send_result(msg["id"], result)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "fertility_tracker/distribution",
+        vol.Required("entry_id"): str,
+        vol.Optional("date"): str,
+        vol.Optional("coverage", default=DISTRIBUTION_COVERAGE): vol.All(
+            vol.Coerce(float), vol.Range(min=0.05, max=0.99)
+        ),
+    }
+)
+@websocket_api.async_response
+@instrumented_ws
+async def ws_distribution(hass, connection, msg):
+    """Per-day next-period and ovulation probabilities with ``coverage`` intervals.
+
+    With ``date``, the period distribution is conditioned on no period having
+    started before it (``period`` is None once that date is past the horizon).
+    """
+    runtime = _get_runtime(hass, msg["entry_id"])
+    dist = runtime.data.distribution()
+    if dist is None:
+        connection.send_result(msg["id"], {"revision": runtime.data.revision, "distribution": None})
+        return
+    result = dist.as_dict(msg["coverage"])
+    if msg.get("date"):
+        try:
+            period = dist.period.given_not_before(coerce_date(msg["date"]))
+        except ValueError as err:
+            connection.send_error(msg["id"], "invalid_format", str(err))
+            return
+        result["period"] = period.as_dict(msg["coverage"]) if period else None
+    connection.send_result(msg["id"], {"revision": runtime.data.revision, "distribution": result})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "fertility_tracker/risk_timeline",
+        vol.Required("entry_id"): str,
+        vol.Optional("start"): str,
+        vol.Optional("end"): str,
+    }
+)
+@websocket_api.async_response
+@instrumented_ws
+async def ws_risk_timeline(hass, connection, msg):
+    """Risk runs for [start, end], defaulting to the previous cycle through the horizon."""
+    runtime = _get_runtime(hass, msg["entry_id"])
+    try:
+        first = coerce_date(msg["start"]) if msg.get("start") else None
+        last = coerce_date(msg["end"]) if msg.get("end") else None
+    except ValueError as err:
+        connection.send_error(msg["id"], "invalid_format", str(err))
+        return
+    connection.send_result(
+        msg["id"],
+        {"revision": runtime.data.revision, "runs": risk_strip(runtime.data, first, last)},
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "fertility_tracker/stats",
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def ws_stats(hass, connection, msg):
+    connection.send_result(msg["id"], _get_runtime(hass, msg["entry_id"]).stats())
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "fertility_tracker/import",
+        vol.Required("entry_id"): str,
+        vol.Optional("format", default="json"): vol.In(["json", "csv"]),
+        vol.Required("data"): vol.Any(str, dict),
+    }
+)
+@websocket_api.async_response
+@instrumented_ws
+async def ws_import(hass, connection, msg):
+    runtime = _get_runtime(hass, msg["entry_id"])
+    try:
+        counts = await runtime.async_import(msg["data"], msg["format"])
+    except ValueError as err:
+        connection.send_error(msg["id"], "invalid_format", str(err))
+        return
+    connection.send_result(msg["id"], counts)
@@ -3,13 +3,15 @@ from __future__ import annotations
 import datetime as dt
 from typing import List, Optional
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 
 from .const import DOMAIN
-from .helpers import FertilityData, calculate_metrics_for_date
+from .helpers import FertilityData, predicted_ovulation_dates
+from .instrumentation import timed
 
 # How far ahead we look when choosing the current/next event for .event
 _LOOKAHEAD_DAYS_FOR_EVENT = 60
@@ -44,31 +46,96 @@ def _end_exclusive(end_like: dt.date | dt.datetime, tz: dt.tzinfo) -> dt.datetim
     return _as_local_datetime(end_like, tz) + dt.timedelta(days=1)
 
 
-def _coerce_date_like(x) -> Optional[dt.date]:
-    """Coerce helper metrics' date into dt.date (accepts str/date/datetime/None)."""
-    if x is None:
-        return None
-    if isinstance(x, dt.date) and not isinstance(x, dt.datetime):
-        return x
-    if isinstance(x, dt.datetime):
-        return x.date()
-    if isinstance(x, str):
-        try:
-            return dt.date.fromisoformat(x)
-        except Exception:
-            return None
-    return None
+def build_calendar_events(
+    data: FertilityData,
+    start_date: dt.datetime,
+    end_date: dt.datetime,
+    tz: dt.tzinfo,
+) -> List[CalendarEvent]:
+    """Return events between local-aware start_date (inclusive) and end_date (exclusive)."""
+    events: List[CalendarEvent] = []
+
+    # ---- Period events from stored cycles ----
+    # Only cycles starting inside the window, plus the one before it whose
+    # period may run into the window's first days
+    lo, hi = data.cycles.start_range(
+        _as_local_datetime(start_date, tz).date(),
+        (_as_local_datetime(end_date, tz) - dt.timedelta(microseconds=1)).date(),
+    )
+    for i in range(max(0, lo - 1), hi):
+        c = data.cycles[i]
+        if not c.start:
+            continue
+        p_start = _as_local_datetime(c.start, tz)
+        if c.end:
+            p_end_excl = _end_exclusive(c.end, tz)
+        else:
+            assumed_end = c.start + dt.timedelta(days=_DEFAULT_PERIOD_LENGTH_DAYS - 1)
+            p_end_excl = _end_exclusive(assumed_end, tz)
+
+        if p_start < end_date and p_end_excl > start_date:
+            events.append(
+                CalendarEvent(
+                    summary="Period",
+                    start=p_start,
+                    end=p_end_excl,
+                    description=(c.notes or ""),
+                )
+            )
+
+    # ---- Predicted ranges (Fertile Window + Implantation Window) ----
+    # Project the ovulation dates predicted for days inside the requested window.
+    end_d = (end_date - dt.timedelta(seconds=1)).date()
+    ovul_dates = predicted_ovulation_dates(data, start_date.date(), end_d)
+
+    # For each distinct ovulation date, add the windows if they overlap the query
+    for ov in ovul_dates:
+        # Fertile window: [ov - 5, ov] inclusive -> exclusive end ov + 1
+        fert_start_d = ov - dt.timedelta(days=_FERTILE_BEFORE_DAYS)
+        fert_end_d = ov  # inclusive
+        fert_start = _as_local_datetime(fert_start_d, tz)
+        fert_end_excl = _end_exclusive(fert_end_d, tz)
+        if fert_start < end_date and fert_end_excl > start_date:
+            events.append(
+                CalendarEvent(
+                    summary="Fertile Window",
+                    start=fert_start,
+                    end=fert_end_excl,
+                    description="Predicted fertile days",
+                )
+            )
+
+        # Implantation window: [ov + 6, ov + 10] inclusive
+        impl_start_d = ov + dt.timedelta(days=_IMPLANT_START_OFFSET)
+        impl_end_d = ov + dt.timedelta(days=_IMPLANT_END_OFFSET)
+        impl_start = _as_local_datetime(impl_start_d, tz)
+        impl_end_excl = _end_exclusive(impl_end_d, tz)
+        if impl_start < end_date and impl_end_excl > start_date:
+            events.append(
+                CalendarEvent(
+                    summary="Implantation Window",
+                    start=impl_start,
+                    end=impl_end_excl,
+                    description="Predicted implantation likelihood window",
+                )
+            )
 
+    # Sort chronologically for stability
+    events.sort(key=lambda ev: _as_local_datetime(ev.start, tz))
+    return events
 
-class FertilityTrackerCalendar(CalendarEntity):
+
+class FertilityTrackerCalendar(CoordinatorEntity, CalendarEntity):
     """Calendar that exposes period days + predicted fertile/implantation windows."""
 
     _attr_has_entity_name = True
 
-    def __init__(self, hass: HomeAssistant, entry_id: str, data: FertilityData) -> None:
+    def __init__(self, hass: HomeAssistant, entry_id: str, runtime) -> None:
+        super().__init__(runtime.coordinator)
         self.hass = hass
         self._entry_id = entry_id
-        self._data = data
+        self._runtime = runtime
+        data = runtime.data
         self._attr_unique_id = f"{entry_id}_calendar"
         self._attr_name = f"{data.name} Calendar"
         self._event: Optional[CalendarEvent] = None
@@ -80,6 +147,10 @@ class FertilityTrackerCalendar(CalendarEntity):
             model="Cycle calendar",
         )
 
+    @property
+    def _data(self) -> FertilityData:
+        return self._runtime.data
+
     # ---------- Core Calendar API ----------
 
     @property
@@ -87,14 +158,23 @@ class FertilityTrackerCalendar(CalendarEntity):
         """Return the current or next event for HA to show as entity state."""
         return self._event
 
-    async def async_update(self) -> None:
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._refresh_event()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._refresh_event()
+        self.async_write_ha_state()
+
+    def _refresh_event(self) -> None:
         """Set .event to the current ongoing or next upcoming event."""
         tz = dt_util.get_time_zone(self.hass.config.time_zone)
         now = dt_util.now(tz)
-        # Look back a little to catch events that started just before now.
-        start = now - dt.timedelta(days=1)
+        # Events are whole days, so anything ongoing now overlaps today's midnight.
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         end = now + dt.timedelta(days=_LOOKAHEAD_DAYS_FOR_EVENT)
-        events = await self.async_get_events(self.hass, start, end)
+        events = build_calendar_events(self._data, start, end, tz)
 
         current: Optional[CalendarEvent] = None
         upcoming: Optional[CalendarEvent] = None
@@ -124,80 +204,8 @@ class FertilityTrackerCalendar(CalendarEntity):
         # Normalize window to local-aware datetimes
         start_date = start_date.astimezone(tz) if start_date.tzinfo else start_date.replace(tzinfo=tz)
         end_date = end_date.astimezone(tz) if end_date.tzinfo else end_date.replace(tzinfo=tz)
-
-        events: List[CalendarEvent] = []
-
-        # ---- Period events from stored cycles ----
-        for c in self._data.cycles:
-            if not c.start:
-                continue
-            p_start = _as_local_datetime(c.start, tz)
-            if c.end:
-                p_end_excl = _end_exclusive(c.end, tz)
-            else:
-                assumed_end = c.start + dt.timedelta(days=_DEFAULT_PERIOD_LENGTH_DAYS - 1)
-                p_end_excl = _end_exclusive(assumed_end, tz)
-
-            if p_start < end_date and p_end_excl > start_date:
-                events.append(
-                    CalendarEvent(
-                        summary="Period",
-                        start=p_start,
-                        end=p_end_excl,
-                        description=(c.notes or ""),
-                    )
-                )
-
-        # ---- Predicted ranges (Fertile Window + Implantation Window) ----
-        # Find predicted ovulation dates that fall around the requested window.
-        # We scan the requested range day-by-day and collect distinct predictions.
-        ovul_dates: set[dt.date] = set()
-        cur = start_date.date()
-        end_d = (end_date - dt.timedelta(seconds=1)).date()
-        while cur <= end_d:
-            # midday local to avoid DST edge cases
-            probe_dt = dt.datetime(cur.year, cur.month, cur.day, 12, tzinfo=tz)
-            m = calculate_metrics_for_date(self._data, probe_dt)
-            ov = _coerce_date_like(getattr(m, "predicted_ovulation_date", None))
-            if ov:
-                ovul_dates.add(ov)
-            cur += dt.timedelta(days=1)
-
-        # For each distinct ovulation date, add the windows if they overlap the query
-        for ov in sorted(ovul_dates):
-            # Fertile window: [ov - 5, ov] inclusive -> exclusive end ov + 1
-            fert_start_d = ov - dt.timedelta(days=_FERTILE_BEFORE_DAYS)
-            fert_end_d = ov  # inclusive
-            fert_start = _as_local_datetime(fert_start_d, tz)
-            fert_end_excl = _end_exclusive(fert_end_d, tz)
-            if fert_start < end_date and fert_end_excl > start_date:
-                events.append(
-                    CalendarEvent(
-                        summary="Fertile Window",
-                        start=fert_start,
-                        end=fert_end_excl,
-                        description="Predicted fertile days",
-                    )
-                )
-
-            # Implantation window: [ov + 6, ov + 10] inclusive
-            impl_start_d = ov + dt.timedelta(days=_IMPLANT_START_OFFSET)
-            impl_end_d = ov + dt.timedelta(days=_IMPLANT_END_OFFSET)
-            impl_start = _as_local_datetime(impl_start_d, tz)
-            impl_end_excl = _end_exclusive(impl_end_d, tz)
-            if impl_start < end_date and impl_end_excl > start_date:
-                events.append(
-                    CalendarEvent(
-                        summary="Implantation Window",
-                        start=impl_start,
-                        end=impl_end_excl,
-                        description="Predicted implantation likelihood window",
-                    )
-                )
-
-        # Sort chronologically for stability
-        events.sort(key=lambda ev: _as_local_datetime(ev.start, tz))
-        return events
+        with timed(self._runtime.instruments, "calendar_query"):
+            return build_calendar_events(self._data, start_date, end_date, tz)
 
 
 # ---------- Platform setup ----------
@@ -205,4 +213,4 @@ class FertilityTrackerCalendar(CalendarEntity):
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     """Set up the calendar entity for an entry."""
     runtime = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([FertilityTrackerCalendar(hass, entry.entry_id, runtime.data)], True)
+    async_add_entities([FertilityTrackerCalendar(hass, entry.entry_id, runtime)])
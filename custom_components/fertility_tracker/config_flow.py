@@ -8,6 +8,7 @@ from homeassistant.config_entries import ConfigEntry, OptionsFlow
 from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.selector import (
+    BooleanSelector,
     TextSelector,
     TextSelectorConfig,
     NumberSelector,
@@ -33,6 +34,11 @@ from .const import (
     CONF_DAILY_REMINDER_TIME,
     CONF_QUIET_HOURS_START,
     CONF_QUIET_HOURS_END,
+    CONF_SAVE_DELAY,
+    CONF_SAVE_MAX_DELAY,
+    CONF_STORAGE_ENGINE,
+    CONF_INSTRUMENTATION,
+    CONF_TRIGGER_COOLDOWN,
     DEFAULT_LUTEAL_DAYS,
     DEFAULT_RECENT_WEIGHT,
     DEFAULT_LONG_WEIGHT,
@@ -40,6 +46,13 @@ from .const import (
     DEFAULT_DAILY_REMINDER_TIME,
     DEFAULT_QUIET_HOURS_START,
     DEFAULT_QUIET_HOURS_END,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_SAVE_MAX_DELAY,
+    DEFAULT_STORAGE_ENGINE,
+    DEFAULT_INSTRUMENTATION,
+    DEFAULT_TRIGGER_COOLDOWN,
+    STORAGE_ENGINE_SNAPSHOT,
+    STORAGE_ENGINE_JOURNAL,
 )
 
 # Keep this to satisfy the tests that expect "Wife Tracker"
@@ -146,6 +159,34 @@ class OptionsFlowHandler(OptionsFlow):
                     CONF_QUIET_HOURS_END,
                     default=o.get(CONF_QUIET_HOURS_END, DEFAULT_QUIET_HOURS_END),
                 ): TimeSelector(TimeSelectorConfig()),
+                vol.Optional(
+                    CONF_SAVE_DELAY,
+                    default=o.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY),
+                ): NumberSelector(
+                    NumberSelectorConfig(min=0, max=60, step=0.5, mode=NumberSelectorMode.BOX)
+                ),
+                vol.Optional(
+                    CONF_SAVE_MAX_DELAY,
+                    default=o.get(CONF_SAVE_MAX_DELAY, DEFAULT_SAVE_MAX_DELAY),
+                ): NumberSelector(
+                    NumberSelectorConfig(min=0, max=300, step=1, mode=NumberSelectorMode.BOX)
+                ),
+                vol.Optional(
+                    CONF_STORAGE_ENGINE,
+                    default=o.get(CONF_STORAGE_ENGINE, DEFAULT_STORAGE_ENGINE),
+                ): SelectSelector(
+                    SelectSelectorConfig(
+                        mode="dropdown",
+                        options=[
+                            SelectOptionDict(label="Snapshot", value=STORAGE_ENGINE_SNAPSHOT),
+                            SelectOptionDict(label="Journal", value=STORAGE_ENGINE_JOURNAL),
+                        ],
+                    )
+                ),
+                vol.Optional(
+                    CONF_INSTRUMENTATION,
+                    default=o.get(CONF_INSTRUMENTATION, DEFAULT_INSTRUMENTATION),
+                ): BooleanSelector(),
                 vol.Optional(
                     CONF_TRIGGER_ENTITIES,
                     default=o.get(CONF_TRIGGER_ENTITIES, []),
@@ -156,6 +197,12 @@ class OptionsFlowHandler(OptionsFlow):
                         multiple=True,
                     )
                 ),
+                vol.Optional(
+                    CONF_TRIGGER_COOLDOWN,
+                    default=o.get(CONF_TRIGGER_COOLDOWN, DEFAULT_TRIGGER_COOLDOWN),
+                ): NumberSelector(
+                    NumberSelectorConfig(min=0, max=3600, step=10, mode=NumberSelectorMode.BOX)
+                ),
                 vol.Optional(
                     CONF_NOTIFY_SERVICES,
                     default=o.get(CONF_NOTIFY_SERVICES, []),
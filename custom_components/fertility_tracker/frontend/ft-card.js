@@ -45,8 +45,84 @@
   .ft-drop svg{width:100%;height:100%;display:block;filter:drop-shadow(0 0 2px rgba(0,0,0,.45))}
   .ft-legend{display:flex;gap:14px;align-items:center;margin-top:8px;opacity:.8;font-size:.9em}
   .ft-pill{display:inline-block;width:14px;height:14px;border-radius:4px;background:rgba(244,67,54,0.28);border:1px solid rgba(244,67,54,0.45)}
+  .ft-risk{position:absolute;left:6px;right:6px;top:0;height:3px;border-radius:0 0 3px 3px}
+  .ft-risk.low{background:rgba(76,175,80,0.7)}
+  .ft-risk.medium{background:rgba(255,152,0,0.8)}
+  .ft-risk.high{background:rgba(233,30,99,0.85)}
   `;
 
+  // Same logic as ft-delta.js (which the panel imports); the card stays a
+  // classic script so existing /local/ resources keep loading. Keep in step.
+  const byStart = (a, b) => (a.start < b.start ? -1 : a.start > b.start ? 1 : 0);
+  const byTs = (a, b) => new Date(a.ts) - new Date(b.ts);
+
+  function localYMD(ts) {
+    const d = new Date(ts);
+    const m = String(d.getMonth() + 1).padStart(2, "0");
+    return `${d.getFullYear()}-${m}-${String(d.getDate()).padStart(2, "0")}`;
+  }
+
+  // Same rules as the server's windowed snapshot: a cycle overlapping
+  // [start, end], an event whose local date falls inside it.
+  function cycleInWindow(c, win) {
+    return !win || (c.start <= win.end && (c.end || c.start) >= win.start);
+  }
+
+  function eventInWindow(e, win) {
+    if (!win) return true;
+    const day = localYMD(e.ts);
+    return day >= win.start && day <= win.end;
+  }
+
+  // Apply one delta to `data`, keeping server order. `win` is the {start, end}
+  // the snapshot was requested for (omit for the full history); rows outside
+  // it are dropped so the client never holds more than it subscribed to.
+  function applyDelta(data, ev, win) {
+    const d = ev.data;
+    switch (ev.type) {
+      case "cycle_added":
+        if (cycleInWindow(d, win)) {
+          data.cycles.push(d);
+          data.cycles.sort(byStart);
+        }
+        break;
+      case "cycle_updated":
+        data.cycles = data.cycles.filter((c) => c.id !== d.id);
+        if (cycleInWindow(d, win)) {
+          data.cycles.push(d);
+          data.cycles.sort(byStart);
+        }
+        break;
+      case "cycle_deleted":
+        data.cycles = data.cycles.filter((c) => c.id !== d.id);
+        break;
+      case "sex_logged":
+        if (eventInWindow(d, win)) {
+          data.sex_events.push(d);
+          data.sex_events.sort(byTs);
+        }
+        break;
+      case "test_logged":
+        if (eventInWindow(d, win)) {
+          data.pregnancy_tests.push(d);
+          data.pregnancy_tests.sort(byTs);
+        }
+        break;
+      case "history_imported":
+        data.cycles = data.cycles.concat(d.cycles.filter((c) => cycleInWindow(c, win))).sort(byStart);
+        data.sex_events = data.sex_events
+          .concat(d.sex_events.filter((e) => eventInWindow(e, win)))
+          .sort(byTs);
+        data.pregnancy_tests = data.pregnancy_tests
+          .concat(d.pregnancy_tests.filter((e) => eventInWindow(e, win)))
+          .sort(byTs);
+        break;
+      case "options_changed":
+        Object.assign(data, d);
+        break;
+    }
+  }
+
   function todayLocalYMD() {
     const d = new Date();
     const y = d.getFullYear();
@@ -135,27 +211,95 @@
       await this._refresh();
     }
 
+    connectedCallback() {
+      if (this._initDone && !this._unsub && this._entryId) this._refresh();
+    }
+
+    disconnectedCallback() {
+      this._unsubscribe();
+    }
+
+    _unsubscribe() {
+      if (this._unsub) {
+        this._unsub.then((unsub) => unsub()).catch(() => {});
+        this._unsub = null;
+      }
+    }
+
+    // (Re)subscribe for the months around the one shown; the server sends a
+    // snapshot and then deltas, so mutations never re-download the history.
     async _refresh() {
       this._loading = true;
       this._render();
+      this._unsubscribe();
       if (!this._entryId) {
         this._data = null;
         this._loading = false;
         this._render();
         return;
       }
+      const { start, end } = this._windowBounds();
+      this._window = { start, end };
+      this._unsub = this._hass.connection.subscribeMessage((ev) => this._onEvent(ev), {
+        type: "fertility_tracker/subscribe",
+        entry_id: this._entryId,
+        start, end,
+      });
       try {
-        this._data = await this._hass.callWS({
-          type: "fertility_tracker/list_cycles",
-          entry_id: this._entryId,
-        });
+        await this._unsub;
       } catch (e) {
+        this._unsub = null;
         this._data = null;
+        this._loading = false;
+        this._render();
+      }
+    }
+
+    _onEvent(ev) {
+      if (ev.type === "snapshot") {
+        this._data = ev.data;
+        this._risk = ev.risk || [];
+        this._revision = ev.revision;
+        this._loading = false;
+        this._render();
+        return;
+      }
+      if (ev.type === "metrics_changed") return;
+      if (ev.type === "risk_changed") {
+        this._risk = ev.data;
+        this._render();
+        return;
       }
-      this._loading = false;
+      if (ev.revision !== this._revision + 1) {
+        // Missed a delta: start over from a fresh snapshot
+        this._refresh();
+        return;
+      }
+      this._revision = ev.revision;
+      applyDelta(this._data, ev, this._window);
       this._render();
     }
 
+    _windowBounds() {
+      const now = new Date();
+      const back = Math.min(this._monthOffset, 0) - 12;
+      const ahead = Math.max(this._monthOffset, 0) + 3;
+      return {
+        start: ymd(new Date(now.getFullYear(), now.getMonth() + back, 1)),
+        end: ymd(new Date(now.getFullYear(), now.getMonth() + ahead + 1, 0)),
+      };
+    }
+
+    _changeMonth(delta) {
+      this._monthOffset += delta;
+      const { start, end } = this._windowBounds();
+      if (this._window && (start < this._window.start || end > this._window.end)) {
+        this._refresh();
+      } else {
+        this._render();
+      }
+    }
+
     async _addPeriod(start, end, notes) {
       if (!this._entryId || !start) return;
       await this._hass.callWS({
@@ -163,7 +307,6 @@
         entry_id: this._entryId,
         start, end, notes,
       });
-      await this._refresh();
     }
 
     async _editCycle(cycleId, start, end, notes) {
@@ -175,7 +318,6 @@
         ...(end ? { end } : {}),
         ...(notes != null ? { notes } : {}),
       });
-      await this._refresh();
     }
 
     async _deleteCycle(cycleId) {
@@ -185,7 +327,6 @@
         entry_id: this._entryId,
         cycle_id: cycleId,
       });
-      await this._refresh();
     }
 
     // Services
@@ -196,7 +337,6 @@
         protected: !!protectedFlag,
         ...(note ? { notes: note } : {}),
       });
-      await this._refresh();
     }
 
     // Presets
@@ -250,6 +390,19 @@
       return false;
     }
 
+    _riskLevel(key) {
+      // Runs are sorted and do not overlap: binary search by date
+      const runs = this._risk || [];
+      let lo = 0, hi = runs.length - 1;
+      while (lo <= hi) {
+        const mid = (lo + hi) >> 1;
+        if (runs[mid].end < key) lo = mid + 1;
+        else if (runs[mid].start > key) hi = mid - 1;
+        else return runs[mid].level;
+      }
+      return null;
+    }
+
     _sexEventsByDay() {
       const map = new Map(); // ymd -> array of events
       const events = this._data?.sex_events || [];
@@ -337,7 +490,9 @@
         const cls = ["ft-day", isThisMonth ? "" : "muted", this._isPeriodDay(d) ? "ft-period" : ""].join(" ");
         const key = ymd(d);
         const drops = sexMap.get(key) || [];
+        const risk = this._riskLevel(key);
         html += `<div class="${cls}" data-date="${key}">
+          ${risk ? `<div class="ft-risk ${risk}" title="${risk} risk"></div>` : ""}
           <div class="ft-day-num">${d.getDate()}</div>
           ${drops.length ? `<div class="ft-droplets">${this._renderDroplets(drops)}</div>` : ""}
         </div>`;
@@ -346,6 +501,9 @@
       html += `</div>
         <div class="ft-legend">
           <span class="ft-pill"></span> Period day
+          <span style="display:inline-flex;align-items:center;gap:6px">
+            <span class="ft-pill" style="height:4px;background:rgba(233,30,99,0.85);border:0"></span> Predicted risk
+          </span>
           <span style="display:inline-flex;align-items:center;gap:6px">
             <span class="ft-drop">${dropletSVG()}</span> Sex logged
           </span>
@@ -362,8 +520,8 @@
     }
 
     _wireCalendar() {
-      this._root.querySelector("#ft-prev")?.addEventListener("click", () => { this._monthOffset -= 1; this._render(); });
-      this._root.querySelector("#ft-next")?.addEventListener("click", () => { this._monthOffset += 1; this._render(); });
+      this._root.querySelector("#ft-prev")?.addEventListener("click", () => this._changeMonth(-1));
+      this._root.querySelector("#ft-next")?.addEventListener("click", () => this._changeMonth(1));
       // Day click? Optional: quick-add start/end, or show popup — skipped to keep it simple.
     }
 
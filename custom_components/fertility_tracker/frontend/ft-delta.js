@@ -0,0 +1,74 @@
+// custom_components/fertility_tracker/frontend/ft-delta.js
+// Apply fertility_tracker/subscribe deltas to a snapshot. Imported by
+// panel.js; ft-card.js carries a copy because it also loads as a classic
+// (non-module) resource. Change both together.
+
+const byStart = (a, b) => (a.start < b.start ? -1 : a.start > b.start ? 1 : 0);
+const byTs = (a, b) => new Date(a.ts) - new Date(b.ts);
+
+function localYMD(ts) {
+  const d = new Date(ts);
+  const m = String(d.getMonth() + 1).padStart(2, "0");
+  return `${d.getFullYear()}-${m}-${String(d.getDate()).padStart(2, "0")}`;
+}
+
+// Same rules as the server's windowed snapshot: a cycle overlapping
+// [start, end], an event whose local date falls inside it.
+function cycleInWindow(c, win) {
+  return !win || (c.start <= win.end && (c.end || c.start) >= win.start);
+}
+
+function eventInWindow(e, win) {
+  if (!win) return true;
+  const day = localYMD(e.ts);
+  return day >= win.start && day <= win.end;
+}
+
+// Apply one delta to `data`, keeping server order. `win` is the {start, end}
+// the snapshot was requested for (omit for the full history); rows outside
+// it are dropped so the client never holds more than it subscribed to.
+export function applyDelta(data, ev, win) {
+  const d = ev.data;
+  switch (ev.type) {
+    case "cycle_added":
+      if (cycleInWindow(d, win)) {
+        data.cycles.push(d);
+        data.cycles.sort(byStart);
+      }
+      break;
+    case "cycle_updated":
+      data.cycles = data.cycles.filter((c) => c.id !== d.id);
+      if (cycleInWindow(d, win)) {
+        data.cycles.push(d);
+        data.cycles.sort(byStart);
+      }
+      break;
+    case "cycle_deleted":
+      data.cycles = data.cycles.filter((c) => c.id !== d.id);
+      break;
+    case "sex_logged":
+      if (eventInWindow(d, win)) {
+        data.sex_events.push(d);
+        data.sex_events.sort(byTs);
+      }
+      break;
+    case "test_logged":
+      if (eventInWindow(d, win)) {
+        data.pregnancy_tests.push(d);
+        data.pregnancy_tests.sort(byTs);
+      }
+      break;
+    case "history_imported":
+      data.cycles = data.cycles.concat(d.cycles.filter((c) => cycleInWindow(c, win))).sort(byStart);
+      data.sex_events = data.sex_events
+        .concat(d.sex_events.filter((e) => eventInWindow(e, win)))
+        .sort(byTs);
+      data.pregnancy_tests = data.pregnancy_tests
+        .concat(d.pregnancy_tests.filter((e) => eventInWindow(e, win)))
+        .sort(byTs);
+      break;
+    case "options_changed":
+      Object.assign(data, d);
+      break;
+  }
+}
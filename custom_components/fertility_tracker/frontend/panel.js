@@ -2,6 +2,8 @@
 // Full-screen sidebar panel available at /fertility-tracker
 // Home Assistant will look for <ha-panel-fertility-tracker>.
 
+import { applyDelta } from "./ft-delta.js";
+
 class HaPanelFertilityTracker extends HTMLElement {
   set hass(hass) {
     this._hass = hass;
@@ -163,7 +165,7 @@ class HaPanelFertilityTracker extends HTMLElement {
         <tbody>
           ${cycles.map(c => `
             <tr>
-              <td style="padding:6px 8px;"><code>${c.cycle_id}</code></td>
+              <td style="padding:6px 8px;"><code>${c.id}</code></td>
               <td style="padding:6px 8px;">${c.start}</td>
               <td style="padding:6px 8px;">${c.end || "—"}</td>
               <td style="padding:6px 8px;">${c.notes || ""}</td>
@@ -174,24 +176,52 @@ class HaPanelFertilityTracker extends HTMLElement {
     `;
   }
 
+  disconnectedCallback() {
+    this._unsubscribe();
+  }
+
+  _unsubscribe() {
+    if (this._unsub) {
+      this._unsub.then((unsub) => unsub()).catch(() => {});
+      this._unsub = null;
+    }
+  }
+
+  // Subscribe once: a snapshot, then deltas from any client or automation
   async _load() {
     const zone = this._root.getElementById("cyclesZone");
+    this._unsubscribe();
     if (!this._entry_id) {
       zone.innerHTML = `<em class="muted">No entry configured/found.</em>`;
       return;
     }
+    this._unsub = this._hass.connection.subscribeMessage((ev) => this._onEvent(ev), {
+      type: "fertility_tracker/subscribe",
+      entry_id: this._entry_id,
+    });
     try {
-      const data = await this._hass.callWS({
-        type: "fertility_tracker/list_cycles",
-        entry_id: this._entry_id,
-      });
-      zone.innerHTML = this._cyclesToHtml(data);
-      this._setOut(JSON.stringify(data, null, 2));
+      await this._unsub;
     } catch (e) {
+      this._unsub = null;
       this._setOut("Error loading cycles: " + (e?.message || e));
     }
   }
 
+  _onEvent(ev) {
+    if (ev.type === "metrics_changed" || ev.type === "risk_changed") return;
+    if (ev.type === "snapshot") {
+      this._data = ev.data;
+    } else if (ev.revision !== this._revision + 1) {
+      this._load(); // missed a delta
+      return;
+    } else {
+      applyDelta(this._data, ev);
+    }
+    this._revision = ev.revision;
+    this._root.getElementById("cyclesZone").innerHTML = this._cyclesToHtml(this._data);
+    this._setOut(JSON.stringify(this._data, null, 2));
+  }
+
   async _add() {
     try {
       const start = this._root.getElementById("start").value;
@@ -205,7 +235,6 @@ class HaPanelFertilityTracker extends HTMLElement {
         ...(end ? { end } : {}),
         ...(notes ? { notes } : {}),
       });
-      await this._load();
     } catch (e) {
       this._setOut("Add error: " + (e?.message || e));
     }
@@ -227,7 +256,6 @@ class HaPanelFertilityTracker extends HTMLElement {
         ...(end ? { end } : {}),
         ...(notes ? { notes } : {}),
       });
-      await this._load();
     } catch (e) {
       this._setOut("Edit error: " + (e?.message || e));
     }
@@ -242,7 +270,6 @@ class HaPanelFertilityTracker extends HTMLElement {
         entry_id: this._entry_id,
         cycle_id,
       });
-      await this._load();
     } catch (e) {
       this._setOut("Delete error: " + (e?.message || e));
     }
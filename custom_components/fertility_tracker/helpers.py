@@ -1,20 +1,40 @@
 from __future__ import annotations
 
+import base64
+import bisect
+import csv
 import datetime as dt
+import heapq
+import io
+import itertools
+import json
+import logging
+import math
+import sys
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
-from statistics import mean, pstdev
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, Iterator
 
 from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
 
 from .const import (
+    DISTRIBUTION_COVERAGE,
+    DISTRIBUTION_DEFAULT_STD,
+    DISTRIBUTION_MIN_STD,
+    DISTRIBUTION_SIGMAS,
+    PROJECTION_CYCLES,
     RISK_LOW,
     RISK_MEDIUM,
     RISK_HIGH,
+    WINDOW_FERTILE,
+    WINDOW_IMPLANTATION,
+    WINDOW_NEAR_FERTILE,
 )
 
+_LOGGER = logging.getLogger(__name__)
+
 # ---------------- Utilities ----------------
 
 def _get_local_tz(hass: HomeAssistant) -> dt.tzinfo:
@@ -44,13 +64,39 @@ def coerce_date(s: str | dt.date | dt.datetime) -> dt.date:
 
 # ---------------- Data Models ----------------
 
-@dataclass
+# (op, payload) callback fired by FertilityData mutators; payloads are JSON-safe
+MutationListener = Callable[[str, Dict[str, Any]], None]
+
+# Fixed-offset tzinfo objects shared by all parsed timestamps; fromisoformat
+# otherwise builds a new one per value.
+_SHARED_TZ: Dict[dt.timedelta, dt.tzinfo] = {}
+
+
+def _compact_ts(ts: dt.datetime) -> dt.datetime:
+    tz = ts.tzinfo
+    if type(tz) is not dt.timezone:
+        return ts
+    shared = _SHARED_TZ.setdefault(tz.utcoffset(None), tz)
+    return ts if shared is tz else ts.replace(tzinfo=shared)
+
+
+def _intern(text: str | None) -> str | None:
+    # Notes and results repeat a lot ("Started today", "negative"); keep one copy
+    return sys.intern(text) if isinstance(text, str) else text
+
+
+# Events are slotted: histories can hold many thousands of them and a
+# per-instance __dict__ roughly doubles their size.
+@dataclass(slots=True)
 class CycleEvent:
     id: str
     start: dt.date
     end: dt.date | None = None
     notes: str | None = None
 
+    def __post_init__(self) -> None:
+        self.notes = _intern(self.notes)
+
     def as_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
@@ -69,12 +115,16 @@ class CycleEvent:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SexEvent:
     ts: dt.datetime
     protected: bool
     notes: str | None = None
 
+    def __post_init__(self) -> None:
+        self.ts = _compact_ts(self.ts)
+        self.notes = _intern(self.notes)
+
     def as_dict(self) -> Dict[str, Any]:
         return {
             "ts": self.ts.isoformat(),
@@ -91,11 +141,15 @@ class SexEvent:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PregnancyTestEvent:
     ts: dt.datetime
     result: str
 
+    def __post_init__(self) -> None:
+        self.ts = _compact_ts(self.ts)
+        self.result = _intern(self.result)
+
     def as_dict(self) -> Dict[str, Any]:
         return {"ts": self.ts.isoformat(), "result": self.result}
 
@@ -104,6 +158,208 @@ class PregnancyTestEvent:
         return PregnancyTestEvent(ts=dt.datetime.fromisoformat(d["ts"]), result=d["result"])
 
 
+def _event_key(event: SexEvent | PregnancyTestEvent) -> dt.datetime:
+    """Sort key for timestamped events (naive legacy values are read as UTC)."""
+    ts = event.ts
+    return ts if ts.tzinfo else ts.replace(tzinfo=dt.timezone.utc)
+
+
+class CycleStore:
+    """Cycles kept in start order, with an id index.
+
+    Inserts use bisect on a parallel list of start dates and ``move`` only
+    repositions the edited cycle, so no operation re-sorts the collection.
+    Iteration, ``len`` and indexing behave like the plain list it replaces.
+    """
+
+    def __init__(self, cycles: Iterable[CycleEvent] = ()) -> None:
+        self._items: list[CycleEvent] = sorted(cycles, key=lambda c: c.start)
+        self._starts: list[dt.date] = [c.start for c in self._items]
+        self._by_id: Dict[str, CycleEvent] = {c.id: c for c in self._items}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[CycleEvent]:
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CycleStore):
+            return self._items == other._items
+        return self._items == other
+
+    def __repr__(self) -> str:
+        return f"CycleStore({self._items!r})"
+
+    def get(self, cycle_id: str) -> CycleEvent | None:
+        return self._by_id.get(cycle_id)
+
+    def index_of(self, cycle: CycleEvent) -> int:
+        i = bisect.bisect_left(self._starts, cycle.start)
+        while self._items[i] is not cycle:
+            i += 1
+        return i
+
+    def insert(self, cycle: CycleEvent) -> int:
+        """Insert after any cycles with the same start; return its index."""
+        i = bisect.bisect_right(self._starts, cycle.start)
+        self._items.insert(i, cycle)
+        self._starts.insert(i, cycle.start)
+        self._by_id[cycle.id] = cycle
+        return i
+
+    def pop(self, index: int) -> CycleEvent:
+        cycle = self._items.pop(index)
+        del self._starts[index]
+        del self._by_id[cycle.id]
+        return cycle
+
+    def merge(self, cycles: list[CycleEvent]) -> None:
+        """Merge cycles already sorted by start in one linear pass."""
+        merged: list[CycleEvent] = []
+        items, i, j = self._items, 0, 0
+        while i < len(items) and j < len(cycles):
+            if cycles[j].start < items[i].start:
+                merged.append(cycles[j])
+                j += 1
+            else:
+                merged.append(items[i])
+                i += 1
+        merged.extend(items[i:])
+        merged.extend(cycles[j:])
+        self._items = merged
+        self._starts = [c.start for c in merged]
+        self._by_id.update((c.id, c) for c in cycles)
+
+    def start_range(self, first: dt.date, last: dt.date) -> tuple[int, int]:
+        """Return the slice bounds of cycles starting within [first, last]."""
+        return (
+            bisect.bisect_left(self._starts, first),
+            bisect.bisect_right(self._starts, last),
+        )
+
+
+class CycleLengthStats:
+    """Running statistics over completed cycle lengths (gaps between starts).
+
+    Count, sum and sum of squares are exact integers, so lengths can be added or
+    removed anywhere in the history without floating-point drift. The newest
+    ``recent_window`` lengths are kept in a ring buffer with a running sum.
+    """
+
+    def __init__(self, recent_window: int) -> None:
+        self.count = 0
+        self._sum = 0
+        self._sum_sq = 0
+        self.recent: deque[int] = deque(maxlen=max(1, int(recent_window)))
+        self._recent_sum = 0
+
+    def add(self, length: int) -> None:
+        self.count += 1
+        self._sum += length
+        self._sum_sq += length * length
+
+    def remove(self, length: int) -> None:
+        self.count -= 1
+        self._sum -= length
+        self._sum_sq -= length * length
+
+    def push_recent(self, length: int) -> None:
+        if len(self.recent) == self.recent.maxlen:
+            self._recent_sum -= self.recent[0]
+        self.recent.append(length)
+        self._recent_sum += length
+
+    def reset_recent(self, lengths: list[int], recent_window: int) -> None:
+        self.recent = deque(maxlen=max(1, int(recent_window)))
+        self._recent_sum = 0
+        for length in lengths:
+            self.push_recent(length)
+
+    def mean(self) -> float | None:
+        if not self.count:
+            return None
+        return self._sum / self.count
+
+    def pstdev(self) -> float | None:
+        if self.count < 2:
+            return None
+        n = self.count
+        return math.sqrt((n * self._sum_sq - self._sum * self._sum) / (n * n))
+
+    def weighted_avg(self, w_recent: float, w_long: float) -> float | None:
+        if not self.count:
+            return None
+        if self.count <= self.recent.maxlen:
+            return self.mean()
+        return w_recent * (self._recent_sum / len(self.recent)) + w_long * self.mean()
+
+
+class _LazyEvents:
+    """Event-list field that can hold stored rows and parse them on first use.
+
+    Setup only needs the cycles, so ``from_dict`` keeps the sex-event and test
+    rows as loaded and they are parsed (and sorted) the first time anything
+    reads or mutates the list. Until then ``as_dict`` returns the rows as-is.
+    """
+
+    def __init__(self, parse: Callable[[Dict[str, Any]], Any]) -> None:
+        self._parse = parse
+        self._name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> Any:
+        if obj is None:
+            return None  # dataclass default; __set__ turns it into []
+        events = obj.__dict__.get(self._name)
+        if events is None:
+            raw = _raw_key(self._name)
+            events = sorted(self._parse_rows(obj.__dict__.get(raw) or []), key=_event_key)
+            # Only drop the stored rows once they are parsed
+            obj.__dict__[self._name] = events
+            obj.__dict__.pop(raw, None)
+        return events
+
+    def _parse_rows(self, rows: list[Dict[str, Any]]) -> Iterator[Any]:
+        for row in rows:
+            try:
+                yield self._parse(row)
+            except (KeyError, TypeError, ValueError) as exc:
+                _LOGGER.warning("Skipping malformed %s row %r: %s", self._name, row, exc)
+
+    def __set__(self, obj: Any, value: list | None) -> None:
+        obj.__dict__.pop(_raw_key(self._name), None)
+        obj.__dict__[self._name] = [] if value is None else value
+
+
+def _raw_key(section: str) -> str:
+    return f"_raw_{section}"
+
+
+# Settings copied from the entry options (see FertilityData.set_options)
+_OPTION_FIELDS = frozenset(
+    {
+        "luteal_days",
+        "recent_weight",
+        "long_weight",
+        "recent_window",
+        "notify_services",
+        "trigger_entities",
+        "quiet_hours_start",
+        "quiet_hours_end",
+        "daily_reminder_time",
+    }
+)
+
+
 @dataclass
 class FertilityData:
     name: str
@@ -117,11 +373,40 @@ class FertilityData:
     quiet_hours_end: str
     daily_reminder_time: str
 
-    cycles: list[CycleEvent] = field(default_factory=list)
-    sex_events: list[SexEvent] = field(default_factory=list)
-    pregnancy_tests: list[PregnancyTestEvent] = field(default_factory=list)
+    cycles: CycleStore = field(default_factory=CycleStore)
+    sex_events: list[SexEvent] = _LazyEvents(SexEvent.from_dict)
+    pregnancy_tests: list[PregnancyTestEvent] = _LazyEvents(PregnancyTestEvent.from_dict)
 
     last_notified_date: str | None = None  # ISO date string
+    # Notifications waiting for delivery (see outbox.py); one row per key
+    outbox: list[Dict[str, Any]] = field(default_factory=list)
+
+    # Runtime-only bookkeeping (never serialized). ``revision`` is bumped by every
+    # mutation; the metrics cache is keyed by (revision, local date).
+    revision: int = field(default=0, repr=False, compare=False)
+    metrics_cache_hits: int = field(default=0, repr=False, compare=False)
+    metrics_cache_misses: int = field(default=0, repr=False, compare=False)
+    _metrics_cache: Dict[tuple[int, dt.date], "Metrics"] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    _length_stats: CycleLengthStats = field(init=False, repr=False, compare=False)
+    _projection: tuple[tuple, "Projection"] | None = field(
+        default=None, repr=False, compare=False
+    )
+    _distribution: tuple[tuple, "PeriodDistribution | None"] | None = field(
+        default=None, repr=False, compare=False
+    )
+    _risk_timeline: tuple[tuple, "RiskTimeline"] | None = field(
+        default=None, repr=False, compare=False
+    )
+    _mutation_listeners: list[MutationListener] = field(
+        default_factory=list, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.cycles, CycleStore):
+            self.cycles = CycleStore(self.cycles)
+        self.rebuild_stats()
 
     def as_dict(self) -> Dict[str, Any]:
         return {
@@ -136,11 +421,26 @@ class FertilityData:
             "quiet_hours_end": self.quiet_hours_end,
             "daily_reminder_time": self.daily_reminder_time,
             "cycles": [c.as_dict() for c in self.cycles],
-            "sex_events": [s.as_dict() for s in self.sex_events],
-            "pregnancy_tests": [p.as_dict() for p in self.pregnancy_tests],
+            "sex_events": self._section_dicts("sex_events"),
+            "pregnancy_tests": self._section_dicts("pregnancy_tests"),
             "last_notified_date": self.last_notified_date,
+            "outbox": self.outbox,
         }
 
+    def _section_dicts(self, section: str) -> list[Dict[str, Any]]:
+        rows = self.__dict__.get(_raw_key(section))
+        if rows is not None:
+            return rows
+        return [e.as_dict() for e in getattr(self, section)]
+
+    def _defer_section(self, section: str, rows: list[Dict[str, Any]]) -> None:
+        self.__dict__.pop(section, None)
+        self.__dict__[_raw_key(section)] = rows
+
+    def section_loaded(self, section: str) -> bool:
+        """Whether a lazy event section has been parsed from its stored rows."""
+        return _raw_key(section) not in self.__dict__
+
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "FertilityData":
         fd = FertilityData(
@@ -155,37 +455,1128 @@ class FertilityData:
             quiet_hours_end=d.get("quiet_hours_end", "07:00:00"),
             daily_reminder_time=d.get("daily_reminder_time", "09:00:00"),
         )
-        fd.cycles = [CycleEvent.from_dict(x) for x in d.get("cycles", [])]
-        # ✅ Fix bug: don't reference fd.sex_events in its own construction
-        fd.sex_events = [SexEvent.from_dict(x) for x in d.get("sex_events", [])]
-        fd.pregnancy_tests = [PregnancyTestEvent.from_dict(x) for x in d.get("pregnancy_tests", [])]
+        fd.cycles = CycleStore(CycleEvent.from_dict(x) for x in d.get("cycles", []))
+        fd.rebuild_stats()
+        # Events are parsed on first access; see _LazyEvents
+        for section in ("sex_events", "pregnancy_tests"):
+            if d.get(section):
+                fd._defer_section(section, list(d[section]))  # noqa: SLF001
         fd.last_notified_date = d.get("last_notified_date")
+        fd.outbox = [dict(row) for row in d.get("outbox", [])]
         return fd
 
+    # ---- Revision / metrics cache ----
+    def bump_revision(self) -> int:
+        """Mark the data as changed and drop cached metrics from older revisions."""
+        self.revision += 1
+        self._metrics_cache.clear()
+        return self.revision
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {
+            "revision": self.revision,
+            "hits": self.metrics_cache_hits,
+            "misses": self.metrics_cache_misses,
+            "size": len(self._metrics_cache),
+        }
+
+    # ---- Cycle-length statistics ----
+    def rebuild_stats(self) -> None:
+        """Recompute the running statistics from scratch (load/bulk changes only)."""
+        stats = CycleLengthStats(self.recent_window)
+        lengths = _completed_cycle_lengths(self.cycles)
+        for length in lengths:
+            stats.add(length)
+        stats.reset_recent(lengths[-stats.recent.maxlen:], self.recent_window)
+        self._length_stats = stats
+
+    def length_stats(self) -> CycleLengthStats:
+        stats = self._length_stats
+        if stats.recent.maxlen != max(1, int(self.recent_window)):
+            self._refresh_recent()
+        return stats
+
+    def _prediction_key(self) -> tuple:
+        return (
+            self.revision,
+            self.luteal_days,
+            self.recent_window,
+            self.recent_weight,
+            self.long_weight,
+        )
+
+    def projection(self) -> "Projection":
+        """Projected future cycles, rebuilt only after a mutation or settings change."""
+        key = self._prediction_key()
+        if self._projection is None or self._projection[0] != key:
+            self._projection = (key, build_projection(self, PROJECTION_CYCLES))
+        return self._projection[1]
+
+    def risk_timeline(self) -> "RiskTimeline":
+        """Per-day risk over the projection, cached like it."""
+        key = self._prediction_key()
+        if self._risk_timeline is None or self._risk_timeline[0] != key:
+            self._risk_timeline = (key, build_risk_timeline(self.projection()))
+        return self._risk_timeline[1]
+
+    def distribution(self) -> "PeriodDistribution | None":
+        """Next-period distribution, cached like the projection; None without history."""
+        key = self._prediction_key()
+        if self._distribution is None or self._distribution[0] != key:
+            self._distribution = (key, build_distribution(self))
+        return self._distribution[1]
+
+    def _gap(self, i: int, j: int) -> int:
+        return (self.cycles[j].start - self.cycles[i].start).days
+
+    def _refresh_recent(self) -> None:
+        window = max(1, int(self.recent_window))
+        first = max(1, len(self.cycles) - window)
+        self._length_stats.reset_recent(
+            [self._gap(i - 1, i) for i in range(first, len(self.cycles))], window
+        )
+
+    def _stats_inserted(self, i: int) -> None:
+        """Account for the cycle that now sits at index ``i``."""
+        stats = self._length_stats
+        n = len(self.cycles)
+        if 0 < i < n - 1:
+            stats.remove(self._gap(i - 1, i + 1))
+        if i > 0:
+            stats.add(self._gap(i - 1, i))
+        if i < n - 1:
+            stats.add(self._gap(i, i + 1))
+        if i == n - 1 and i > 0:
+            stats.push_recent(self._gap(i - 1, i))
+        elif i >= n - stats.recent.maxlen - 1:
+            self._refresh_recent()
+
+    def _stats_removing(self, i: int) -> None:
+        """Account for the cycle at index ``i`` before it leaves the list."""
+        stats = self._length_stats
+        n = len(self.cycles)
+        if i > 0:
+            stats.remove(self._gap(i - 1, i))
+        if i < n - 1:
+            stats.remove(self._gap(i, i + 1))
+        if 0 < i < n - 1:
+            stats.add(self._gap(i - 1, i + 1))
+
+    def _stats_removed(self, i: int) -> None:
+        """Refresh the recent ring buffer if the removal at ``i`` touched it."""
+        if i >= len(self.cycles) - self._length_stats.recent.maxlen:
+            self._refresh_recent()
+
+    # ---- Cycle placement (no revision bump, no records) ----
+    def _insert_cycle(self, cycle: CycleEvent) -> None:
+        self._stats_inserted(self.cycles.insert(cycle))
+
+    def _remove_cycle(self, cycle: CycleEvent) -> None:
+        i = self.cycles.index_of(cycle)
+        self._stats_removing(i)
+        self.cycles.pop(i)
+        self._stats_removed(i)
+
+    def _move_cycle(self, cycle: CycleEvent, start: dt.date) -> None:
+        if start != cycle.start:
+            self._remove_cycle(cycle)
+            cycle.start = start
+            self._insert_cycle(cycle)
+
+    # ---- Mutation records ----
+    def add_mutation_listener(self, listener: MutationListener) -> Callable[[], None]:
+        """Call ``listener(op, payload)`` after every mutation; return a remover."""
+        self._mutation_listeners.append(listener)
+
+        def _remove() -> None:
+            if listener in self._mutation_listeners:
+                self._mutation_listeners.remove(listener)
+
+        return _remove
+
+    def _emit(self, op: str, payload: Dict[str, Any]) -> None:
+        for listener in list(self._mutation_listeners):
+            listener(op, payload)
+
+    def apply_record(self, op: str, payload: Dict[str, Any]) -> None:
+        """Re-apply a mutation record (journal replay); listeners are not called."""
+        if op == "add_period":
+            self._insert_cycle(CycleEvent.from_dict(payload))
+        elif op == "edit_cycle":
+            c = self.cycles.get(payload["id"])
+            if c is None:
+                return
+            self._move_cycle(c, coerce_date(payload["start"]))
+            c.end = coerce_date(payload["end"]) if payload.get("end") else None
+            c.notes = _intern(payload.get("notes"))
+        elif op == "delete_cycle":
+            c = self.cycles.get(payload["id"])
+            if c is None:
+                return
+            self._remove_cycle(c)
+        elif op == "log_sex":
+            bisect.insort(self.sex_events, SexEvent.from_dict(payload), key=_event_key)
+        elif op == "log_test":
+            bisect.insort(
+                self.pregnancy_tests, PregnancyTestEvent.from_dict(payload), key=_event_key
+            )
+        elif op == "import":
+            self._merge_batch(
+                ImportBatch(
+                    periods=[CycleEvent.from_dict(x) for x in payload.get("cycles", [])],
+                    sex_events=[SexEvent.from_dict(x) for x in payload.get("sex_events", [])],
+                    pregnancy_tests=[
+                        PregnancyTestEvent.from_dict(x) for x in payload.get("pregnancy_tests", [])
+                    ],
+                )
+            )
+        elif op == "set_meta":
+            self.last_notified_date = payload.get("last_notified_date")
+            return
+        elif op == "set_options":
+            for key in _OPTION_FIELDS.intersection(payload):
+                setattr(self, key, payload[key])
+        elif op == "outbox_put":
+            self._outbox_put(payload)
+            return
+        elif op == "outbox_drop":
+            self._outbox_drop(payload["keys"])
+            return
+        else:
+            raise ValueError(f"Unknown mutation record: {op}")
+        self.bump_revision()
+
     # ---- Mutators used by WS/services ----
     def add_period(self, start: dt.date, end: dt.date | None, notes: str | None) -> None:
-        self.cycles.append(CycleEvent(id=str(uuid.uuid4()), start=start, end=end, notes=notes))
-        self.cycles.sort(key=lambda c: c.start)
+        cycle = CycleEvent(id=str(uuid.uuid4()), start=start, end=end, notes=notes)
+        self._insert_cycle(cycle)
+        self.bump_revision()
+        self._emit("add_period", cycle.as_dict())
 
     def edit_cycle(self, cycle_id: str, start: dt.date | None, end: dt.date | None, notes: str | None) -> bool:
-        for c in self.cycles:
-            if c.id == cycle_id:
-                if start:
-                    c.start = start
-                if end is not None:
-                    c.end = end
-                if notes is not None:
-                    c.notes = notes
-                self.cycles.sort(key=lambda c: c.start)
-                return True
-        return False
+        c = self.cycles.get(cycle_id)
+        if c is None:
+            return False
+        if start:
+            self._move_cycle(c, start)
+        if end is not None:
+            c.end = end
+        if notes is not None:
+            c.notes = _intern(notes)
+        self.bump_revision()
+        self._emit("edit_cycle", c.as_dict())
+        return True
 
     def delete_cycle(self, cycle_id: str) -> bool:
-        for i, c in enumerate(self.cycles):
-            if c.id == cycle_id:
-                del self.cycles[i]
-                return True
+        c = self.cycles.get(cycle_id)
+        if c is None:
+            return False
+        self._remove_cycle(c)
+        self.bump_revision()
+        self._emit("delete_cycle", {"id": cycle_id})
+        return True
+
+    def add_sex_event(self, ts: dt.datetime, protected: bool, notes: str | None) -> None:
+        event = SexEvent(ts=ts, protected=protected, notes=notes)
+        bisect.insort(self.sex_events, event, key=_event_key)
+        self.bump_revision()
+        self._emit("log_sex", event.as_dict())
+
+    def add_pregnancy_test(self, ts: dt.datetime, result: str) -> None:
+        event = PregnancyTestEvent(ts=ts, result=result)
+        bisect.insort(self.pregnancy_tests, event, key=_event_key)
+        self.bump_revision()
+        self._emit("log_test", event.as_dict())
+
+    def import_history(self, batch: "ImportBatch") -> Dict[str, Dict[str, int]]:
+        """Merge a validated batch, skipping duplicates and conflicting periods.
+
+        Everything accepted is merged into place in one pass, with a single
+        statistics rebuild, revision bump and mutation record.
+        """
+        counts = {
+            k: {"periods": 0, "sex_events": 0, "pregnancy_tests": 0}
+            for k in ("inserted", "skipped", "conflicting")
+        }
+        accepted = ImportBatch()
+        accepted_ids: set[str] = set()
+
+        for cycle in sorted(batch.periods, key=lambda c: c.start):
+            verdict = self._period_verdict(cycle, accepted.periods)
+            counts[verdict]["periods"] += 1
+            if verdict == "inserted":
+                if cycle.id in accepted_ids or self.cycles.get(cycle.id):
+                    cycle.id = str(uuid.uuid4())
+                accepted_ids.add(cycle.id)
+                accepted.periods.append(cycle)
+
+        seen_sex = {(e.ts, e.protected) for e in self.sex_events}
+        for event in batch.sex_events:
+            key = (event.ts, event.protected)
+            if key in seen_sex:
+                counts["skipped"]["sex_events"] += 1
+                continue
+            seen_sex.add(key)
+            accepted.sex_events.append(event)
+            counts["inserted"]["sex_events"] += 1
+
+        seen_tests = {(e.ts, e.result) for e in self.pregnancy_tests}
+        for event in batch.pregnancy_tests:
+            key = (event.ts, event.result)
+            if key in seen_tests:
+                counts["skipped"]["pregnancy_tests"] += 1
+                continue
+            seen_tests.add(key)
+            accepted.pregnancy_tests.append(event)
+            counts["inserted"]["pregnancy_tests"] += 1
+
+        if accepted.periods or accepted.sex_events or accepted.pregnancy_tests:
+            self._merge_batch(accepted)
+            self.bump_revision()
+            self._emit(
+                "import",
+                {
+                    "cycles": [c.as_dict() for c in accepted.periods],
+                    "sex_events": [e.as_dict() for e in accepted.sex_events],
+                    "pregnancy_tests": [e.as_dict() for e in accepted.pregnancy_tests],
+                },
+            )
+        return counts
+
+    def _period_verdict(self, cycle: CycleEvent, accepted: list[CycleEvent]) -> str:
+        """Classify an incoming period against stored and already-accepted ones."""
+        # Incoming periods are visited in start order, so only the last accepted one can clash
+        neighbours = []
+        i = bisect.bisect_right(self.cycles._starts, cycle.start)  # noqa: SLF001
+        if i:
+            neighbours.append(self.cycles[i - 1])
+        if i < len(self.cycles):
+            neighbours.append(self.cycles[i])
+        if accepted:
+            neighbours.append(accepted[-1])
+
+        for other in neighbours:
+            if other.start == cycle.start:
+                same = (cycle.end is None or cycle.end == other.end) and (
+                    cycle.notes is None or cycle.notes == other.notes
+                )
+                return "skipped" if same else "conflicting"
+            first, second = sorted((other, cycle), key=lambda c: c.start)
+            if first.end is not None and second.start <= first.end:
+                return "conflicting"
+        return "inserted"
+
+    def _merge_batch(self, batch: "ImportBatch") -> None:
+        self.cycles.merge(sorted(batch.periods, key=lambda c: c.start))
+        self.rebuild_stats()
+        if batch.sex_events:
+            self.sex_events = list(
+                heapq.merge(
+                    self.sex_events, sorted(batch.sex_events, key=_event_key), key=_event_key
+                )
+            )
+        if batch.pregnancy_tests:
+            self.pregnancy_tests = list(
+                heapq.merge(
+                    self.pregnancy_tests,
+                    sorted(batch.pregnancy_tests, key=_event_key),
+                    key=_event_key,
+                )
+            )
+
+    def set_options(self, values: Dict[str, Any]) -> bool:
+        """Copy changed settings onto the data; True if any changed."""
+        changed = {k: v for k, v in values.items() if getattr(self, k) != v}
+        if not changed:
+            return False
+        for key, value in changed.items():
+            setattr(self, key, value)
+        # Settings feed the predictions: drop metrics cached for the old ones
+        self.bump_revision()
+        self._emit("set_options", changed)
+        return True
+
+    def mark_notified(self, day: str) -> None:
+        """Record the ISO date of the last risk notification."""
+        self.last_notified_date = day
+        self._emit("set_meta", {"last_notified_date": day})
+
+    # ---- Outbox (not part of the history: no revision bump) ----
+    def queue_notification(self, row: Dict[str, Any]) -> None:
+        """Add an outbox row, replacing any queued row with the same key."""
+        self._outbox_put(row)
+        self._emit("outbox_put", row)
+
+    def drop_notifications(self, keys: Iterable[str]) -> None:
+        keys = sorted(set(keys))
+        self._outbox_drop(keys)
+        self._emit("outbox_drop", {"keys": keys})
+
+    def _outbox_put(self, row: Dict[str, Any]) -> None:
+        for i, queued in enumerate(self.outbox):
+            if queued["key"] == row["key"]:
+                self.outbox[i] = row
+                return
+        self.outbox.append(row)
+
+    def _outbox_drop(self, keys: Iterable[str]) -> None:
+        gone = set(keys)
+        self.outbox = [row for row in self.outbox if row["key"] not in gone]
+
+
+# ---------------- Bulk import ----------------
+
+@dataclass
+class ImportBatch:
+    periods: list[CycleEvent] = field(default_factory=list)
+    sex_events: list[SexEvent] = field(default_factory=list)
+    pregnancy_tests: list[PregnancyTestEvent] = field(default_factory=list)
+
+
+# Every CSV row needs a type; periods are dated by start, sex/test rows by ts
+_CSV_REQUIRED = ("type",)
+_CSV_DATE_COLUMNS = ("start", "ts")
+_TRUE = {"1", "true", "yes", "y", "on"}
+_FALSE = {"0", "false", "no", "n", "off", ""}
+
+
+def _aware(ts: str | dt.datetime, tz: dt.tzinfo) -> dt.datetime:
+    value = ts if isinstance(ts, dt.datetime) else dt.datetime.fromisoformat(str(ts))
+    return value if value.tzinfo else value.replace(tzinfo=tz)
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
         return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _rows_from_csv(text: str) -> Iterator[tuple[str, Dict[str, Any]]]:
+    reader = csv.DictReader(io.StringIO(text))
+    header = set(reader.fieldnames or ())
+    missing = [c for c in _CSV_REQUIRED if c not in header]
+    if header.isdisjoint(_CSV_DATE_COLUMNS):
+        missing.append(" or ".join(_CSV_DATE_COLUMNS))
+    if missing:
+        raise ValueError(f"CSV header is missing: {', '.join(missing)}")
+    for row in reader:
+        kind = (row.get("type") or "").strip().lower()
+        yield kind, {
+            k: (v if v != "" else None) for k, v in row.items() if k not in (None, "type")
+        }
+
+
+def _rows_from_json(payload: str | Dict[str, Any]) -> Iterator[tuple[str, Dict[str, Any]]]:
+    doc = json.loads(payload) if isinstance(payload, str) else payload
+    if not isinstance(doc, dict):
+        raise ValueError("JSON import must be an object")
+    for kind, key in (("period", "cycles"), ("period", "periods"), ("sex", "sex_events"), ("test", "pregnancy_tests")):
+        for row in doc.get(key) or []:
+            yield kind, row
+
+
+def parse_history(payload: str | Dict[str, Any], fmt: str, tz: dt.tzinfo) -> ImportBatch:
+    """Validate a JSON or CSV history in one pass.
+
+    JSON uses the export layout (``cycles``/``periods``, ``sex_events``,
+    ``pregnancy_tests``); CSV rows carry a ``type`` of period, sex or test.
+    Naive timestamps are taken as local time. Raises ``ValueError`` listing every
+    bad row so nothing is imported from a partially valid file.
+    """
+    rows = _rows_from_csv(payload) if fmt == "csv" else _rows_from_json(payload)
+    batch = ImportBatch()
+    errors: list[str] = []
+    for n, (kind, row) in enumerate(rows, start=1):
+        try:
+            if kind == "period":
+                start = coerce_date(row["start"])
+                end = coerce_date(row["end"]) if row.get("end") else None
+                if end is not None and end < start:
+                    raise ValueError("end is before start")
+                batch.periods.append(
+                    CycleEvent(
+                        id=row.get("id") or str(uuid.uuid4()),
+                        start=start,
+                        end=end,
+                        notes=row.get("notes"),
+                    )
+                )
+            elif kind == "sex":
+                batch.sex_events.append(
+                    SexEvent(
+                        ts=_aware(row["ts"], tz),
+                        protected=_as_bool(row.get("protected")),
+                        notes=row.get("notes"),
+                    )
+                )
+            elif kind == "test":
+                result = str(row.get("result") or "").strip().lower()
+                if not result:
+                    raise ValueError("result is required")
+                batch.pregnancy_tests.append(
+                    PregnancyTestEvent(ts=_aware(row["ts"], tz), result=result)
+                )
+            else:
+                raise ValueError(f"unknown type {kind!r}")
+        except KeyError as err:
+            errors.append(f"row {n}: missing {err}")
+        except (TypeError, ValueError) as err:
+            errors.append(f"row {n}: {err}")
+    if errors:
+        shown = "; ".join(errors[:10])
+        more = f" (+{len(errors) - 10} more)" if len(errors) > 10 else ""
+        raise ValueError(f"Invalid import: {shown}{more}")
+    return batch
+
+
+# ---------------- Streaming export ----------------
+
+# Same columns parse_history reads, plus the cycle id so a re-import dedupes
+EXPORT_CSV_COLUMNS = ("type", "id", "start", "end", "ts", "protected", "result", "notes")
+_EXPORT_SECTIONS = (("period", "cycles"), ("sex", "sex_events"), ("test", "pregnancy_tests"))
+
+
+def export_header(data: FertilityData) -> Dict[str, Any]:
+    """Everything in ``as_dict`` except the event lists."""
+    return {
+        "type": "header",
+        "name": data.name,
+        "revision": data.revision,
+        "luteal_days": data.luteal_days,
+        "recent_weight": data.recent_weight,
+        "long_weight": data.long_weight,
+        "recent_window": data.recent_window,
+        "last_notified_date": data.last_notified_date,
+    }
+
+
+def _iter_live(
+    data: FertilityData,
+    section: str,
+    key: Callable[[Any], Any],
+    resume: Callable[[Any, Any], int],
+) -> Iterator[Any]:
+    """Walk a sorted section in place, surviving mutations between steps.
+
+    While the revision holds, this is a plain index walk. After a change the
+    position is found again from the last key yielded (the ``[key, n]`` scheme
+    of list_window cursors), so rows added or removed behind it shift nothing.
+    """
+    items = getattr(data, section)
+    seen = data.revision
+    i, last, n = 0, None, 0
+    while True:
+        if data.revision != seen:
+            seen = data.revision
+            items = getattr(data, section)  # an import may have replaced the list
+            if last is not None:
+                i = resume(items, last) + n
+        if i >= len(items):
+            return
+        item = items[i]
+        i += 1
+        k = key(item)
+        n = n + 1 if k == last else 1
+        last = k
+        yield item
+
+
+def iter_export_rows(data: FertilityData) -> Iterator[Dict[str, Any]]:
+    """Yield one flat, typed row per cycle, sex event and pregnancy test.
+
+    Sections are walked in place, not copied, so memory stays flat however
+    long the history; rows changed while a consumer awaits between them are
+    exported as they are when reached.
+    """
+    for kind, section in _EXPORT_SECTIONS:
+        if section == "cycles":
+            rows = _iter_live(
+                data,
+                section,
+                lambda c: c.start,
+                lambda cycles, start: cycles.start_range(start, start)[0],
+            )
+        else:
+            rows = _iter_live(
+                data,
+                section,
+                _event_key,
+                lambda events, ts: bisect.bisect_left(events, ts, key=_event_key),
+            )
+        for item in rows:
+            yield {"type": kind, **item.as_dict()}
+
+
+def iter_export_ndjson(data: FertilityData) -> Iterator[str]:
+    """Yield the header and then one JSON line per row."""
+    yield json.dumps(export_header(data), separators=(",", ":")) + "\n"
+    for row in iter_export_rows(data):
+        yield json.dumps(row, separators=(",", ":")) + "\n"
+
+
+def iter_export_csv(data: FertilityData) -> Iterator[str]:
+    """Yield CSV lines that ``parse_history(..., "csv", ...)`` reads back."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for row in iter_export_rows(data):
+        writer.writerow(row)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def iter_export_chunks(data: FertilityData, max_bytes: int) -> Iterator[list[Dict[str, Any]]]:
+    """Group export rows into lists whose JSON size stays near ``max_bytes``."""
+    chunk: list[Dict[str, Any]] = []
+    size = 0
+    for row in iter_export_rows(data):
+        row_size = len(json.dumps(row, separators=(",", ":")))
+        if chunk and size + row_size > max_bytes:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(row)
+        size += row_size
+    if chunk:
+        yield chunk
+
+
+# ---------------- Windowed listing ----------------
+
+def _encode_cursor(state: Dict[str, Any]) -> str:
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(raw)
+    except ValueError as err:
+        raise ValueError("Invalid cursor") from err
+    if not isinstance(state, dict):
+        raise ValueError("Invalid cursor")
+    return state
+
+
+def _page(
+    keys: Callable[[int], Any],
+    lo: int,
+    hi: int,
+    resume: Callable[[Any], int],
+    after: list | None,
+    parse: Callable[[str], Any],
+    limit: int,
+) -> tuple[int, int, list | None]:
+    """Return the [begin, end) slice for one section and its continuation state.
+
+    ``after`` is ``[key, n]``: resume past the first ``n`` items sharing ``key``,
+    so paging stays stable when unrelated items are inserted meanwhile.
+    """
+    begin = lo
+    if after is not None:
+        try:
+            key = parse(after[0])
+            begin = max(lo, resume(key) + int(after[1]))
+        except (TypeError, ValueError, IndexError, KeyError) as err:
+            raise ValueError("Invalid cursor") from err
+    end = min(hi, begin + limit)
+    if end >= hi:
+        return begin, end, None
+    last = keys(end - 1)
+    return begin, end, [last.isoformat(), end - resume(last)]
+
+
+def list_window(
+    data: FertilityData,
+    first: dt.date,
+    last: dt.date,
+    tz: dt.tzinfo,
+    limit: int,
+    cursor: str | None = None,
+) -> Dict[str, Any]:
+    """Return cycles, sex events and tests in [first, last], ``limit`` per section.
+
+    Cycles are located by bisect on the start-date index (plus a period still
+    running on ``first``); events by bisect on their timestamp. ``next_cursor``
+    is ``None`` once every section is exhausted.
+    """
+    state = _decode_cursor(cursor) if cursor else {}
+    result: Dict[str, Any] = {"name": data.name, "revision": data.revision}
+    next_state: Dict[str, Any] = {}
+
+    cycles = data.cycles
+    lo, hi = cycles.start_range(first, last)
+    if lo and cycles[lo - 1].end is not None and cycles[lo - 1].end >= first:
+        lo -= 1
+    if "cycles" not in state or state["cycles"] is not None:
+        begin, end, after = _page(
+            lambda i: cycles[i].start,
+            lo,
+            hi,
+            lambda key: cycles.start_range(key, key)[0],
+            state.get("cycles"),
+            dt.date.fromisoformat,
+            limit,
+        )
+        result["cycles"] = [cycles[i].as_dict() for i in range(begin, end)]
+        next_state["cycles"] = after
+    else:
+        result["cycles"] = []
+        next_state["cycles"] = None
+
+    lo_ts = dt.datetime.combine(first, dt.time.min, tzinfo=tz)
+    hi_ts = dt.datetime.combine(last + dt.timedelta(days=1), dt.time.min, tzinfo=tz)
+    for section in ("sex_events", "pregnancy_tests"):
+        events = getattr(data, section)
+        if section in state and state[section] is None:
+            result[section] = []
+            next_state[section] = None
+            continue
+        begin, end, after = _page(
+            lambda i, events=events: _event_key(events[i]),
+            bisect.bisect_left(events, lo_ts, key=_event_key),
+            bisect.bisect_left(events, hi_ts, key=_event_key),
+            lambda key, events=events: bisect.bisect_left(events, key, key=_event_key),
+            state.get(section),
+            dt.datetime.fromisoformat,
+            limit,
+        )
+        result[section] = [events[i].as_dict() for i in range(begin, end)]
+        next_state[section] = after
+
+    more = any(v is not None for v in next_state.values())
+    result["next_cursor"] = _encode_cursor(next_state) if more else None
+    return result
+
+
+# ---------------- Projection ----------------
+
+@dataclass(frozen=True, slots=True)
+class ProjectedCycle:
+    """One cycle of the projection; index 0 is the last logged one."""
+
+    index: int
+    start: dt.date
+    next_start: dt.date
+    ovulation: dt.date
+    fertile_start: dt.date
+    fertile_end: dt.date
+    implantation_start: dt.date
+    implantation_end: dt.date
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "start": self.start.isoformat(),
+            "next_start": self.next_start.isoformat(),
+            "ovulation": self.ovulation.isoformat(),
+            "fertile_start": self.fertile_start.isoformat(),
+            "fertile_end": self.fertile_end.isoformat(),
+            "implantation_start": self.implantation_start.isoformat(),
+            "implantation_end": self.implantation_end.isoformat(),
+        }
+
+
+class Projection:
+    """Projected cycles rolled forward from the last logged start, built on demand.
+
+    Cycle ``k`` starts ``round(k * avg)`` days after the last logged start, so
+    rounding does not drift and cycle 0 matches the single next-period
+    prediction. A start is a closed form in ``k``: a one-day lookup builds only
+    the cycle holding the day, and ``cycles`` builds the full table the first
+    time something reads the whole horizon.
+
+    Days before the last logged start belong to cycle 0, as the single-cycle
+    prediction always treated them; days past the horizon belong to none.
+    """
+
+    __slots__ = ("_origin", "_avg", "_luteal", "_count", "_made", "_all")
+
+    def __init__(self, origin: dt.date, avg: float, luteal_days: int, count: int) -> None:
+        self._origin = origin
+        self._avg = avg
+        self._luteal = dt.timedelta(days=luteal_days)
+        self._count = count
+        self._made: Dict[int, ProjectedCycle] = {}
+        self._all: list[ProjectedCycle] | None = None
+
+    @property
+    def cycles(self) -> list[ProjectedCycle]:
+        if self._all is None:
+            self._all = [self._cycle(k) for k in range(self._count)]
+        return self._all
+
+    @property
+    def horizon(self) -> dt.date | None:
+        """First day past the last projected cycle; None without a projection."""
+        return self._start(self._count) if self._count else None
+
+    def cycle_for(self, d: dt.date) -> ProjectedCycle | None:
+        k = self._index(d)
+        return self._cycle(k) if k is not None else None
+
+    def overlapping(self, first: dt.date, last: dt.date) -> list[ProjectedCycle]:
+        """Cycles holding at least one day of [first, last]."""
+        lo = self._index(first)
+        if lo is None or first > last:
+            return []
+        hi = self._index(last)
+        return [self._cycle(k) for k in range(lo, self._count if hi is None else hi + 1)]
+
+    def bounds(self) -> list[tuple[int, int, int]]:
+        """(start, next start, ovulation) of every cycle as day ordinals.
+
+        The bulk readers (risk timeline) only need these, not the dates.
+        """
+        origin = self._origin.toordinal()
+        avg = self._avg
+        luteal = self._luteal.days
+        starts = [origin + int(round(k * avg)) for k in range(self._count + 1)]
+        return [(starts[k], starts[k + 1], starts[k + 1] - luteal) for k in range(self._count)]
+
+    def _start(self, k: int) -> dt.date:
+        return self._origin + dt.timedelta(days=int(round(k * self._avg)))
+
+    def _index(self, d: dt.date) -> int | None:
+        """Index of the cycle holding ``d``, or None past the horizon."""
+        if self._count == 0:
+            return None
+        if d < self._origin:
+            return 0
+        k = int((d - self._origin).days // self._avg)
+        # Rounding can put the estimate one cycle off either way
+        while k > 0 and self._start(k) > d:
+            k -= 1
+        while self._start(k + 1) <= d:
+            k += 1
+        return k if k < self._count else None
+
+    def _cycle(self, k: int) -> ProjectedCycle:
+        cycle = self._made.get(k)
+        if cycle is None:
+            next_start = self._start(k + 1)
+            ovulation = next_start - self._luteal
+            cycle = self._made[k] = ProjectedCycle(
+                index=k,
+                start=self._start(k),
+                next_start=next_start,
+                ovulation=ovulation,
+                fertile_start=ovulation - dt.timedelta(days=5),
+                fertile_end=ovulation + dt.timedelta(days=1),
+                implantation_start=ovulation + dt.timedelta(days=6),
+                implantation_end=ovulation + dt.timedelta(days=10),
+            )
+        return cycle
+
+
+def build_projection(data: FertilityData, count: int) -> Projection:
+    """Project ``count`` cycles forward from the last logged start."""
+    avg_len = data.length_stats().weighted_avg(data.recent_weight, data.long_weight)
+    if not data.cycles or not avg_len:
+        return Projection(dt.date.min, 1.0, 0, 0)
+    return Projection(data.cycles[-1].start, avg_len, int(data.luteal_days), count)
+
+
+# ---------------- Risk timeline ----------------
+
+_RISK_LOW = (RISK_LOW, "Safe to have unprotected sex today (low pregnancy risk).", None)
+_RISK_NEAR_FERTILE = (RISK_MEDIUM, "Medium pregnancy risk today (near fertile window).", WINDOW_NEAR_FERTILE)
+_RISK_FERTILE = (RISK_HIGH, "High pregnancy risk today (fertile window).", WINDOW_FERTILE)
+_RISK_IMPLANTATION = (RISK_HIGH, "High implantation risk today (post-ovulation).", WINDOW_IMPLANTATION)
+
+
+def _classify(c: ProjectedCycle, d: dt.date) -> tuple[str, str, str | None]:
+    """Risk level, label and window of day ``d`` within projected cycle ``c``."""
+    # Implantation emphasis overrides the fertile-window label
+    if c.implantation_start <= d <= c.implantation_end:
+        return _RISK_IMPLANTATION
+    if c.fertile_start <= d <= c.fertile_end:
+        return _RISK_FERTILE
+    if c.fertile_start - dt.timedelta(days=2) <= d <= c.fertile_end + dt.timedelta(days=2):
+        return _RISK_NEAR_FERTILE
+    return _RISK_LOW
+
+
+@dataclass(frozen=True, slots=True)
+class RiskRun:
+    """Consecutive days [start, end] sharing one risk level and label."""
+
+    start: dt.date
+    end: dt.date
+    level: str
+    label: str
+    window: str | None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "level": self.level,
+            "label": self.label,
+            "window": self.window,
+        }
+
+
+class RiskTimeline:
+    """Run-length encoded daily risk, looked up by bisect on run starts.
+
+    Runs are kept as day ordinals and ``RiskRun`` objects are only made for
+    the runs that are read. The first run is open towards the past (days
+    before the last logged start take cycle 0's windows, as the metrics always
+    did); days past the projection horizon have no risk.
+    """
+
+    __slots__ = ("_starts", "_ends", "_risks", "_runs")
+
+    def __init__(self, starts: list[int], ends: list[int], risks: list[tuple]) -> None:
+        self._starts = starts  # ordinals
+        self._ends = ends  # ordinals, inclusive
+        self._risks = risks  # (level, label, window)
+        self._runs: list[RiskRun | None] = [None] * len(starts)
+
+    @property
+    def runs(self) -> list[RiskRun]:
+        return [self._run(i) for i in range(len(self._starts))]
+
+    def at(self, d: dt.date) -> RiskRun | None:
+        o = d.toordinal()
+        i = bisect.bisect_right(self._starts, o) - 1
+        if i < 0 or o > self._ends[i]:
+            return None
+        return self._run(i)
+
+    def next_change(self, d: dt.date) -> dt.date | None:
+        """First day after ``d`` whose risk differs from ``d``'s; None past the horizon."""
+        run = self.at(d)
+        return run.end + dt.timedelta(days=1) if run is not None else None
+
+    def between(self, first: dt.date, last: dt.date) -> list[RiskRun]:
+        """Runs holding days of [first, last], clipped to it."""
+        if not self._starts or first > last:
+            return []
+        lo = max(0, bisect.bisect_right(self._starts, first.toordinal()) - 1)
+        hi = bisect.bisect_right(self._starts, last.toordinal())
+        out = []
+        for i in range(lo, hi):
+            run = self._run(i)
+            if run.end < first:
+                continue
+            if run.start < first or run.end > last:
+                run = RiskRun(max(run.start, first), min(run.end, last), run.level, run.label, run.window)
+            out.append(run)
+        return out
+
+    def _run(self, i: int) -> RiskRun:
+        run = self._runs[i]
+        if run is None:
+            run = self._runs[i] = RiskRun(
+                dt.date.fromordinal(self._starts[i]),
+                dt.date.fromordinal(self._ends[i]),
+                *self._risks[i],
+            )
+        return run
+
+
+# Windows of a projected cycle as half-open day ranges around ovulation, in
+# day order; days outside them are low risk. Must agree with _classify.
+_RISK_SEGMENTS = (
+    (-7, -5, _RISK_NEAR_FERTILE),
+    (-5, 2, _RISK_FERTILE),
+    (2, 4, _RISK_NEAR_FERTILE),
+    (6, 11, _RISK_IMPLANTATION),
+)
+
+
+def build_risk_timeline(projection: Projection) -> RiskTimeline:
+    """Lay each projected cycle's windows end to end and merge equal runs.
+
+    Risk only changes at window edges, so each cycle contributes a handful of
+    segments rather than one classification per day. Days are ordinals here;
+    dates are only made for the runs that are read.
+    """
+    starts: list[int] = []
+    stops: list[int] = []  # exclusive while building
+    risks: list[tuple] = []
+
+    def add(a: int, b: int, risk: tuple) -> None:
+        if a >= b:
+            return
+        if stops and stops[-1] == a and risks[-1][1] == risk[1]:
+            stops[-1] = b
+        else:
+            starts.append(a)
+            stops.append(b)
+            risks.append(risk)
+
+    for k, (lo, stop, ovulation) in enumerate(projection.bounds()):
+        if k == 0:
+            lo = dt.date.min.toordinal()
+        at = lo
+        for first, last, risk in _RISK_SEGMENTS:
+            a = max(lo, ovulation + first)
+            b = min(stop, ovulation + last)
+            if a >= b:
+                continue
+            add(at, a, _RISK_LOW)
+            add(a, b, risk)
+            at = b
+        add(at, stop, _RISK_LOW)
+
+    return RiskTimeline(starts, [b - 1 for b in stops], risks)
+
+
+def next_transition(data: FertilityData, d: dt.date) -> dt.date | None:
+    """First day after ``d`` whose metrics differ from ``d``'s, or None if none will.
+
+    Once the last logged cycle has started its day count changes daily;
+    before that (a start logged ahead) only the risk-run boundaries and the
+    start itself change anything, and without history nothing does.
+    """
+    if not data.cycles:
+        return None
+    last_start = data.cycles[-1].start
+    if d >= last_start:
+        return d + dt.timedelta(days=1)
+    change = data.risk_timeline().next_change(d)
+    return last_start if change is None else min(change, last_start)
+
+
+def risk_strip(
+    data: FertilityData, first: dt.date | None = None, last: dt.date | None = None
+) -> list[Dict[str, Any]]:
+    """Risk runs for cards, by default from the previous logged start to the horizon."""
+    timeline = data.risk_timeline()
+    if timeline.at(dt.date.min) is None:
+        return []
+    if first is None:
+        first = data.cycles[-2].start if len(data.cycles) > 1 else data.cycles[-1].start
+    if last is None:
+        last = data.projection().horizon - dt.timedelta(days=1)
+    return [r.as_dict() for r in timeline.between(first, last)]
+
+
+# ---------------- Distribution ----------------
+
+class DayDistribution:
+    """Probability of an event falling on each day from ``first`` on; sums to 1."""
+
+    __slots__ = ("first", "probabilities", "_cumulative")
+
+    def __init__(self, first: dt.date, probabilities: list[float]) -> None:
+        self.first = first
+        self.probabilities = probabilities
+        self._cumulative = list(itertools.accumulate(probabilities))
+
+    @property
+    def last(self) -> dt.date:
+        return self.first + dt.timedelta(days=len(self.probabilities) - 1)
+
+    def probability(self, d: dt.date) -> float:
+        i = (d - self.first).days
+        return self.probabilities[i] if 0 <= i < len(self.probabilities) else 0.0
+
+    def most_likely(self) -> dt.date:
+        probs = self.probabilities
+        return self.first + dt.timedelta(days=max(range(len(probs)), key=probs.__getitem__))
+
+    def interval(self, coverage: float = DISTRIBUTION_COVERAGE) -> tuple[dt.date, dt.date]:
+        """Equal-tailed day range holding at least ``coverage`` of the mass."""
+        tail = (1 - coverage) / 2 * self._cumulative[-1]
+        lo = bisect.bisect_right(self._cumulative, tail)
+        hi = bisect.bisect_left(self._cumulative, self._cumulative[-1] - tail)
+        last = len(self.probabilities) - 1
+        return (
+            self.first + dt.timedelta(days=min(lo, last)),
+            self.first + dt.timedelta(days=min(hi, last)),
+        )
+
+    def shifted(self, days: int) -> "DayDistribution":
+        return DayDistribution(self.first + dt.timedelta(days=days), self.probabilities)
+
+    def given_not_before(self, d: dt.date) -> "DayDistribution | None":
+        """The distribution once the event is known not to have happened before ``d``.
+
+        None when ``d`` is past every day with any probability.
+        """
+        skip = (d - self.first).days
+        if skip <= 0:
+            return self
+        rest = self.probabilities[skip:]
+        mass = sum(rest)
+        if mass <= 0:
+            return None
+        return DayDistribution(d, [p / mass for p in rest])
+
+    def as_dict(self, coverage: float = DISTRIBUTION_COVERAGE) -> Dict[str, Any]:
+        lo, hi = self.interval(coverage)
+        return {
+            "first": self.first.isoformat(),
+            "probabilities": [round(p, 6) for p in self.probabilities],
+            "most_likely": self.most_likely().isoformat(),
+            "interval_start": lo.isoformat(),
+            "interval_end": hi.isoformat(),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodDistribution:
+    """Where the next period after the last logged one, and its ovulation, may fall."""
+
+    mean: float
+    std: float
+    period: DayDistribution
+    ovulation: DayDistribution
+
+    def as_dict(self, coverage: float = DISTRIBUTION_COVERAGE) -> Dict[str, Any]:
+        return {
+            "mean": round(self.mean, 3),
+            "std": round(self.std, 3),
+            "coverage": coverage,
+            "period": self.period.as_dict(coverage),
+            "ovulation": self.ovulation.as_dict(coverage),
+        }
+
+
+def build_distribution(data: FertilityData) -> PeriodDistribution | None:
+    """Discretized normal over the length of the current cycle.
+
+    The mean is the weighted average the projection uses, so the most likely
+    day is its first ``next_start``. Day ``k`` gets the normal mass of
+    [k - 0.5, k + 0.5): the CDF is evaluated once per bin edge over the whole
+    horizon and differenced, then renormalized after clipping to lengths >= 1.
+    Ovulation is the same distribution, ``luteal_days`` earlier.
+    """
+    stats = data.length_stats()
+    mean = stats.weighted_avg(data.recent_weight, data.long_weight)
+    if not data.cycles or not mean:
+        return None
+    std = stats.pstdev()
+    std = max(DISTRIBUTION_MIN_STD, DISTRIBUTION_DEFAULT_STD if std is None else std)
+
+    lo = max(1, math.floor(mean - DISTRIBUTION_SIGMAS * std))
+    hi = math.ceil(mean + DISTRIBUTION_SIGMAS * std)
+    scale = std * math.sqrt(2)
+    cdf = [math.erf((k - 0.5 - mean) / scale) for k in range(lo, hi + 2)]
+    mass = [b - a for a, b in zip(cdf, cdf[1:])]
+    total = sum(mass)
+
+    period = DayDistribution(
+        data.cycles[-1].start + dt.timedelta(days=lo), [m / total for m in mass]
+    )
+    return PeriodDistribution(
+        mean=mean,
+        std=std,
+        period=period,
+        ovulation=period.shifted(-int(data.luteal_days)),
+    )
 
 
 @dataclass
@@ -204,6 +1595,12 @@ class Metrics:
     risk_level: str | None
     risk_label: str | None
 
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            k: v.isoformat() if isinstance(v, dt.date) else v
+            for k, v in self.__dict__.items()
+        }
+
 
 def _completed_cycle_lengths(cycles: list[CycleEvent]) -> list[int]:
     lens = []
@@ -214,75 +1611,53 @@ def _completed_cycle_lengths(cycles: list[CycleEvent]) -> list[int]:
     return lens
 
 
-def _weighted_avg_length(lengths: list[int], recent_window: int, w_recent: float, w_long: float) -> float | None:
-    if not lengths:
-        return None
-    if len(lengths) <= recent_window:
-        return mean(lengths)
-    recent = lengths[-recent_window:]
-    long = lengths
-    return w_recent * mean(recent) + w_long * mean(long)
+# Upper bound on cached days per entry; the calendar may probe many dates at once.
+_METRICS_CACHE_MAX = 64
 
 
-def _std(lengths: list[int]) -> float | None:
-    if len(lengths) < 2:
-        return None
-    try:
-        return pstdev(lengths)
-    except Exception:  # noqa: BLE001
-        return None
+def calculate_metrics_for_date(data: FertilityData, when: dt.datetime) -> Metrics:
+    """Return metrics for the local date of ``when``, memoized per data revision."""
+    key = (data.revision, when.date())
+    cached = data._metrics_cache.get(key)  # noqa: SLF001
+    if cached is not None:
+        data.metrics_cache_hits += 1
+        return cached
 
+    data.metrics_cache_misses += 1
+    metrics = _compute_metrics(data, key[1])
+    cache = data._metrics_cache  # noqa: SLF001
+    if len(cache) >= _METRICS_CACHE_MAX:
+        cache.pop(next(iter(cache)))
+    cache[key] = metrics
+    return metrics
 
-def calculate_metrics_for_date(data: FertilityData, when: dt.datetime) -> Metrics:
-    d = when.date()
-    cycles = sorted(data.cycles, key=lambda c: c.start)
-    lengths = _completed_cycle_lengths(cycles)
-    avg_len = _weighted_avg_length(lengths, data.recent_window, data.recent_weight, data.long_weight)
-    std_len = _std(lengths)
 
-    last_start = cycles[-1].start if cycles else None
+def _compute_metrics(data: FertilityData, d: dt.date) -> Metrics:
+    stats = data.length_stats()
+    avg_len = stats.weighted_avg(data.recent_weight, data.long_weight)
+    std_len = stats.pstdev()
+
+    last_start = data.cycles[-1].start if data.cycles else None
 
     cycle_day = None
     if last_start:
         cycle_day = (d - last_start).days + 1 if d >= last_start else None
 
-    next_period = None
-    if last_start and avg_len:
-        next_period = last_start + dt.timedelta(days=int(round(avg_len)))
-
-    pred_ovulation = None
-    if next_period:
-        pred_ovulation = next_period - dt.timedelta(days=int(data.luteal_days))
-
-    fertile_start = fertile_end = None
-    if pred_ovulation:
-        fertile_start = pred_ovulation - dt.timedelta(days=5)
-        fertile_end = pred_ovulation + dt.timedelta(days=1)
-
-    implant_start = implant_end = None
-    if pred_ovulation:
-        implant_start = pred_ovulation + dt.timedelta(days=6)
-        implant_end = pred_ovulation + dt.timedelta(days=10)
-
-    # Risk labeling
-    risk_level: str | None = None
-    risk_label: str | None = None
-
-    if fertile_start and fertile_end:
-        if fertile_start <= d <= fertile_end:
-            risk_level = RISK_HIGH
-            risk_label = "High pregnancy risk today (fertile window)."
-        elif (fertile_start - dt.timedelta(days=2)) <= d <= (fertile_end + dt.timedelta(days=2)):
-            risk_level = RISK_MEDIUM
-            risk_label = "Medium pregnancy risk today (near fertile window)."
-        else:
-            risk_level = RISK_LOW
-            risk_label = "Safe to have unprotected sex today (low pregnancy risk)."
+    # Predictions come from the projected cycle holding d, so days past the
+    # next expected start roll over to the following projected cycle.
+    projected = data.projection().cycle_for(d)
+    next_period = pred_ovulation = None
+    fertile_start = fertile_end = implant_start = implant_end = None
+    if projected is not None:
+        next_period = projected.next_start
+        pred_ovulation = projected.ovulation
+        fertile_start, fertile_end = projected.fertile_start, projected.fertile_end
+        implant_start, implant_end = projected.implantation_start, projected.implantation_end
 
-    # Implantation emphasis overrides label (keep level high)
-    if implant_start and implant_end and implant_start <= d <= implant_end:
-        risk_level = RISK_HIGH
-        risk_label = "High implantation risk today (post-ovulation)."
+    # Same classification the risk timeline is built from, for this day only
+    risk_level = risk_label = None
+    if projected is not None:
+        risk_level, risk_label, _window = _classify(projected, d)
 
     return Metrics(
         date=d,
@@ -298,3 +1673,96 @@ def calculate_metrics_for_date(data: FertilityData, when: dt.datetime) -> Metric
         risk_level=risk_level,
         risk_label=risk_label,
     )
+
+
+def predicted_ovulation_dates(data: FertilityData, first: dt.date, last: dt.date) -> list[dt.date]:
+    """Return the distinct predicted ovulation dates for days in [first, last]."""
+    return [c.ovulation for c in data.projection().overlapping(first, last)]
+
+
+@dataclass
+class Forecast:
+    """Per-day metrics for [start, end] as parallel lists.
+
+    The scalar prediction fields are those of ``start``'s projected cycle.
+    """
+
+    start: dt.date
+    end: dt.date
+    cycle_length_avg: float | None
+    cycle_length_std: float | None
+    next_period_date: dt.date | None
+    predicted_ovulation_date: dt.date | None
+    fertile_window_start: dt.date | None
+    fertile_window_end: dt.date | None
+    implantation_window_start: dt.date | None
+    implantation_window_end: dt.date | None
+    cycle_day: list[int | None]
+    risk_level: list[str | None]
+    fertile: list[bool]
+    implantation: list[bool]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            k: v.isoformat() if isinstance(v, dt.date) else v
+            for k, v in self.__dict__.items()
+        }
+
+
+def _fill(values: list, first: dt.date, lo: dt.date, hi: dt.date, value: Any) -> None:
+    """Set ``values`` to ``value`` for the days of [lo, hi] that fall in the range."""
+    a = max(0, (lo - first).days)
+    b = min(len(values), (hi - first).days + 1)
+    if a < b:
+        values[a:b] = [value] * (b - a)
+
+
+def forecast_range(data: FertilityData, start: dt.date, end: dt.date) -> Forecast:
+    """Return metrics for every day in [start, end] in one pass.
+
+    The statistics, projection and risk timeline are shared by every day, so
+    they are computed once and the per-day values are written as slices
+    between run and window boundaries; day ``i`` matches
+    ``calculate_metrics_for_date(data, start + i days)``.
+    """
+    if end < start:
+        raise ValueError("end is before start")
+    base = calculate_metrics_for_date(data, dt.datetime.combine(start, dt.time(12)))
+    n = (end - start).days + 1
+
+    cycle_day: list[int | None] = [None] * n
+    last_start = data.cycles[-1].start if data.cycles else None
+    if last_start is not None and last_start <= end:
+        skip = max(0, (last_start - start).days)
+        first_day = (start + dt.timedelta(days=skip) - last_start).days + 1
+        cycle_day[skip:] = range(first_day, first_day + n - skip)
+
+    risk: list[str | None] = [None] * n
+    for run in data.risk_timeline().between(start, end):
+        _fill(risk, start, run.start, run.end, run.level)
+
+    fertile = [False] * n
+    implantation = [False] * n
+    for c in data.projection().overlapping(start, end):
+        # Each day takes the windows of its own projected cycle only
+        lo = start if c.index == 0 else max(start, c.start)
+        hi = min(end, c.next_start - dt.timedelta(days=1))
+        _fill(fertile, start, max(lo, c.fertile_start), min(hi, c.fertile_end), True)
+        _fill(implantation, start, max(lo, c.implantation_start), min(hi, c.implantation_end), True)
+
+    return Forecast(
+        start=start,
+        end=end,
+        cycle_length_avg=base.cycle_length_avg,
+        cycle_length_std=base.cycle_length_std,
+        next_period_date=base.next_period_date,
+        predicted_ovulation_date=base.predicted_ovulation_date,
+        fertile_window_start=base.fertile_window_start,
+        fertile_window_end=base.fertile_window_end,
+        implantation_window_start=base.implantation_window_start,
+        implantation_window_end=base.implantation_window_end,
+        cycle_day=cycle_day,
+        risk_level=risk,
+        fertile=fertile,
+        implantation=implantation,
+    )
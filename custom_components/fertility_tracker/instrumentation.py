@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, ContextManager, Dict
+
+from .const import DOMAIN, INSTRUMENT_WINDOW
+
+# Handed out when instrumentation is off: no clock reads, no allocation
+_NO_TIMER = contextlib.nullcontext()
+
+
+class RollingHistogram:
+    """Latencies for one operation.
+
+    Count, total and max cover the entry's lifetime; percentiles are taken over
+    the last ``size`` samples so they follow current behaviour.
+    """
+
+    __slots__ = ("count", "total", "max", "_recent")
+
+    def __init__(self, size: int = INSTRUMENT_WINDOW) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self._recent.append(seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        recent = sorted(self._recent)
+
+        def pct(p: float) -> float | None:
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))] * 1000, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else None,
+            "max_ms": round(self.max * 1000, 3),
+            "p50_ms": pct(0.5),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+        }
+
+
+class _Timer:
+    __slots__ = ("_hist", "_t0")
+
+    def __init__(self, hist: RollingHistogram) -> None:
+        self._hist = hist
+        self._t0 = 0.0
+
+    def __enter__(self) -> None:
+        self._t0 = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        self._hist.add(time.perf_counter() - self._t0)
+
+
+class Instruments:
+    """Per-entry timing histograms, keyed by operation name."""
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, RollingHistogram] = {}
+
+    def timer(self, name: str) -> _Timer:
+        hist = self._histograms.get(name)
+        if hist is None:
+            hist = self._histograms[name] = RollingHistogram()
+        return _Timer(hist)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: h.as_dict() for name, h in sorted(self._histograms.items())}
+
+
+def timed(instruments: Instruments | None, name: str) -> ContextManager[None]:
+    """``with timed(runtime.instruments, "op"):`` -- a no-op when switched off."""
+    if instruments is None:
+        return _NO_TIMER
+    return instruments.timer(name)
+
+
+def instrumented_ws(
+    handler: Callable[..., Awaitable[None]],
+) -> Callable[..., Awaitable[None]]:
+    """Time an async WS handler against the entry named by ``msg["entry_id"]``."""
+    name = f"ws:{handler.__name__.removeprefix('ws_')}"
+
+    @functools.wraps(handler)
+    async def _wrapper(hass, connection, msg) -> None:
+        runtime = hass.data.get(DOMAIN, {}).get(msg.get("entry_id"))
+        with timed(getattr(runtime, "instruments", None), name):
+            await handler(hass, connection, msg)
+
+    return _wrapper
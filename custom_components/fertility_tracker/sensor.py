@@ -2,18 +2,19 @@ from __future__ import annotations
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-from .helpers import calculate_metrics_for_date, today_local
+from .const import DISTRIBUTION_COVERAGE, DOMAIN
+from .helpers import Metrics
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     runtime = hass.data[DOMAIN][entry.entry_id]
     async_add_entities([FertilityRiskSensor(hass, entry.entry_id, runtime)])
 
-class FertilityRiskSensor(SensorEntity):
+class FertilityRiskSensor(CoordinatorEntity, SensorEntity):
     """Simple risk level sensor: 'low' | 'medium' | 'high'."""
 
     _attr_has_entity_name = True
@@ -21,11 +22,14 @@ class FertilityRiskSensor(SensorEntity):
     _attr_native_value = None
 
     def __init__(self, hass: HomeAssistant, entry_id: str, runtime) -> None:
+        super().__init__(runtime.coordinator)
         self.hass = hass
         self._runtime = runtime
         self._entry_id = entry_id
         self._attr_name = "Fertility Risk"
         self._attr_unique_id = f"{entry_id}_fertility_risk"
+        if self.coordinator.data is not None:
+            self._apply_metrics(self.coordinator.data)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -37,12 +41,17 @@ class FertilityRiskSensor(SensorEntity):
             entry_type=DeviceEntryType.SERVICE,
         )
 
-    async def async_update(self) -> None:
-        metrics = calculate_metrics_for_date(self._runtime.data, today_local(self.hass))
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._apply_metrics(self.coordinator.data)
+        self.async_write_ha_state()
+
+    def _apply_metrics(self, metrics: Metrics) -> None:
+        run = self.coordinator.risk
         # ✅ Tests expect a simple enum value
-        self._attr_native_value = metrics.risk_level or "unknown"
+        self._attr_native_value = run.level if run else "unknown"
         self._attr_extra_state_attributes = {
-            "risk_label": metrics.risk_label,
+            "risk_label": run.label if run else None,
             "cycle_day": metrics.cycle_day,
             "cycle_length_avg": metrics.cycle_length_avg,
             "cycle_length_std": metrics.cycle_length_std,
@@ -53,3 +62,18 @@ class FertilityRiskSensor(SensorEntity):
             "implantation_window_start": metrics.implantation_window_start.isoformat() if metrics.implantation_window_start else None,
             "implantation_window_end": metrics.implantation_window_end.isoformat() if metrics.implantation_window_end else None,
         }
+        # Ranges the next period / ovulation fall in with DISTRIBUTION_COVERAGE odds
+        dist = self._runtime.data.distribution()
+        period = ovulation = (None, None)
+        if dist is not None:
+            period = dist.period.interval(DISTRIBUTION_COVERAGE)
+            ovulation = dist.ovulation.interval(DISTRIBUTION_COVERAGE)
+        self._attr_extra_state_attributes.update(
+            {
+                "prediction_confidence": DISTRIBUTION_COVERAGE,
+                "next_period_earliest": period[0].isoformat() if period[0] else None,
+                "next_period_latest": period[1].isoformat() if period[1] else None,
+                "ovulation_earliest": ovulation[0].isoformat() if ovulation[0] else None,
+                "ovulation_latest": ovulation[1].isoformat() if ovulation[1] else None,
+            }
+        )
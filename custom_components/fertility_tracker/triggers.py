@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, Iterable
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import DATA_TRIGGERS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Called in the event loop with the reason; must not block
+TriggerHandler = Callable[[str], None]
+
+
+def trigger_reason(old: State | None, new: State | None) -> str | None:
+    """Why a state change should notify, or None if it should not.
+
+    Only an actual transition counts: arriving home for a device_tracker or
+    turning on for a binary_sensor. Attribute-only updates and repeats of
+    the same state are ignored.
+    """
+    if new is None or old is None or old.state == new.state:
+        return None
+    if new.domain == "device_tracker" and new.state == "home":
+        return f"{new.entity_id} is home"
+    if new.domain == "binary_sensor" and new.state == "on":
+        return f"{new.entity_id} turned on"
+    return None
+
+
+class TriggerDispatcher:
+    """One state listener per trigger entity, shared by every entry watching it.
+
+    Keeps an entity -> entries index; each state change is filtered once with
+    ``trigger_reason`` and only real transitions are handed to the entries
+    interested in that entity. Changing an entry's entities subscribes and
+    unsubscribes only the difference.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._entries_by_entity: Dict[str, set[str]] = {}
+        self._entities_by_entry: Dict[str, frozenset[str]] = {}
+        self._handlers: Dict[str, TriggerHandler] = {}
+        self._unsubs: Dict[str, CALLBACK_TYPE] = {}
+        self.events = 0
+        self.ignored = 0
+        self.dispatched = 0
+
+    @callback
+    def async_set_entities(
+        self, entry_id: str, entity_ids: Iterable[str], handler: TriggerHandler
+    ) -> None:
+        """Make ``entry_id`` watch exactly ``entity_ids``, calling ``handler(reason)``."""
+        wanted = frozenset(entity_ids)
+        current = self._entities_by_entry.get(entry_id, frozenset())
+        self._handlers[entry_id] = handler
+        self._entities_by_entry[entry_id] = wanted
+        for entity_id in current - wanted:
+            self._unwatch(entry_id, entity_id)
+        for entity_id in wanted - current:
+            self._entries_by_entity.setdefault(entity_id, set()).add(entry_id)
+            if entity_id not in self._unsubs:
+                self._unsubs[entity_id] = async_track_state_change_event(
+                    self.hass, entity_id, self._state_changed
+                )
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        for entity_id in self._entities_by_entry.pop(entry_id, frozenset()):
+            self._unwatch(entry_id, entity_id)
+        self._handlers.pop(entry_id, None)
+
+    @callback
+    def async_shutdown(self) -> None:
+        for unsub in self._unsubs.values():
+            unsub()
+        self._unsubs.clear()
+        self._entries_by_entity.clear()
+        self._entities_by_entry.clear()
+        self._handlers.clear()
+
+    def entities_for(self, entry_id: str) -> frozenset[str]:
+        return self._entities_by_entry.get(entry_id, frozenset())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entities": len(self._unsubs),
+            "entries": len(self._entities_by_entry),
+            "events": self.events,
+            "ignored": self.ignored,
+            "dispatched": self.dispatched,
+        }
+
+    def _unwatch(self, entry_id: str, entity_id: str) -> None:
+        entries = self._entries_by_entity.get(entity_id)
+        if entries is None:
+            return
+        entries.discard(entry_id)
+        if not entries:
+            del self._entries_by_entity[entity_id]
+            self._unsubs.pop(entity_id)()
+
+    @callback
+    def _state_changed(self, event: Event) -> None:
+        self.events += 1
+        reason = trigger_reason(event.data.get("old_state"), event.data.get("new_state"))
+        if reason is None:
+            self.ignored += 1
+            return
+        for entry_id in tuple(self._entries_by_entity.get(event.data["entity_id"], ())):
+            self.dispatched += 1
+            self._handlers[entry_id](reason)
+
+
+@callback
+def async_get_dispatcher(hass: HomeAssistant) -> TriggerDispatcher:
+    """The domain's trigger dispatcher, created on first use."""
+    dispatcher = hass.data.get(DATA_TRIGGERS)
+    if dispatcher is None:
+        dispatcher = hass.data[DATA_TRIGGERS] = TriggerDispatcher(hass)
+    return dispatcher
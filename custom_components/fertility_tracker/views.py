@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import logging
+from http import HTTPStatus
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+
+from .const import DOMAIN, EXPORT_CHUNK_BYTES
+from .helpers import iter_export_csv, iter_export_ndjson
+
+_LOGGER = logging.getLogger(__name__)
+
+_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson", iter_export_ndjson),
+    "csv": ("text/csv", "csv", iter_export_csv),
+}
+
+
+class FertilityExportView(HomeAssistantView):
+    """Download an entry's history as NDJSON or CSV, streamed row by row.
+
+    Lines are generated lazily and flushed every ``EXPORT_CHUNK_BYTES``, so the
+    response never holds more than one chunk regardless of history size.
+    """
+
+    url = "/api/fertility_tracker/{entry_id}/export"
+    name = "api:fertility_tracker:export"
+    requires_auth = True
+
+    async def get(self, request: web.Request, entry_id: str) -> web.StreamResponse:
+        hass = request.app[KEY_HASS]
+        runtime = hass.data.get(DOMAIN, {}).get(entry_id)
+        if runtime is None:
+            return self.json_message("Unknown entry", HTTPStatus.NOT_FOUND)
+        fmt = request.query.get("format", "ndjson")
+        if fmt not in _FORMATS:
+            return self.json_message(
+                f"format must be one of: {', '.join(_FORMATS)}", HTTPStatus.BAD_REQUEST
+            )
+        content_type, ext, lines = _FORMATS[fmt]
+
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": f"{content_type}; charset=utf-8",
+                "Content-Disposition": f'attachment; filename="fertility_tracker_{entry_id}.{ext}"',
+            }
+        )
+        await response.prepare(request)
+
+        pending: list[bytes] = []
+        size = 0
+        for line in lines(runtime.data):
+            data = line.encode()
+            pending.append(data)
+            size += len(data)
+            if size >= EXPORT_CHUNK_BYTES:
+                # Awaiting the write also yields to the loop between chunks
+                await response.write(b"".join(pending))
+                pending, size = [], 0
+        if pending:
+            await response.write(b"".join(pending))
+        await response.write_eof()
+        return response
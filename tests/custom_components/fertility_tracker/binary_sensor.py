@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.device_registry import DeviceEntryType
+
+from .const import DOMAIN, RISK_LOW, WINDOW_IMPLANTATION
+from .helpers import RiskRun
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        [
+            SafeUnprotectedSexTodayBinary(hass, entry.entry_id, runtime),
+            HighImplantationRiskTodayBinary(hass, entry.entry_id, runtime),
+        ]
+    )
+
+
+class _BaseFertilityBinary(BinarySensorEntity):
+    """Binary sensor derived from today's risk run.
+
+    Listens to risk transitions only, so it is not touched on recomputes that
+    leave today's risk unchanged, and writes state only when its value flips.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_device_class = BinarySensorDeviceClass.SAFETY  # closest fit; informational
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, runtime) -> None:
+        self.hass = hass
+        self._runtime = runtime
+        self._entry_id = entry_id
+        self._attr_is_on = self._is_on(runtime.coordinator.risk)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry_id)},
+            name=self._runtime.data.name,
+            manufacturer="Custom",
+            model="Fertility Tracker",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._runtime.coordinator.async_add_risk_listener(self._handle_risk_change)
+        )
+
+    @callback
+    def _handle_risk_change(self) -> None:
+        is_on = self._is_on(self._runtime.coordinator.risk)
+        if is_on != self._attr_is_on:
+            self._attr_is_on = is_on
+            self.async_write_ha_state()
+
+    def _is_on(self, run: RiskRun | None) -> bool:
+        """Whether today's risk run turns this sensor on; subclasses narrow it."""
+        return False
+
+
+class SafeUnprotectedSexTodayBinary(_BaseFertilityBinary):
+    def __init__(self, hass: HomeAssistant, entry_id: str, runtime) -> None:
+        super().__init__(hass, entry_id, runtime)
+        self._attr_name = "Safe unprotected sex today"
+        self._attr_unique_id = f"{entry_id}_safe_unprotected_sex_today"
+
+    def _is_on(self, run: RiskRun | None) -> bool:
+        # Safe when today's risk is explicitly low
+        return run is not None and run.level == RISK_LOW
+
+
+class HighImplantationRiskTodayBinary(_BaseFertilityBinary):
+    def __init__(self, hass: HomeAssistant, entry_id: str, runtime) -> None:
+        super().__init__(hass, entry_id, runtime)
+        self._attr_name = "High implantation risk today"
+        self._attr_unique_id = f"{entry_id}_high_implantation_risk_today"
+
+    def _is_on(self, run: RiskRun | None) -> bool:
+        return run is not None and run.window == WINDOW_IMPLANTATION
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+DOMAIN = "fertility_tracker"
+
+PLATFORMS = ["sensor", "binary_sensor", "calendar"]
+
+# hass.data keys of domain-wide helpers (hass.data[DOMAIN] holds the runtimes)
+DATA_REMINDERS = f"{DOMAIN}_reminders"
+DATA_TRIGGERS = f"{DOMAIN}_triggers"
+# entry_id -> live fertility_tracker/subscribe clients; survives entry reloads
+DATA_SUBSCRIBERS = f"{DOMAIN}_subscribers"
+
+STORAGE_VERSION = 1
+STORAGE_KEY_PREFIX = "fertility_tracker_"
+STORAGE_ENGINE_SNAPSHOT = "snapshot"
+STORAGE_ENGINE_JOURNAL = "journal"
+# Journal compaction thresholds (whichever is reached first)
+JOURNAL_MAX_BYTES = 256 * 1024
+JOURNAL_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+CONF_NAME = "name"
+CONF_LUTEAL_DAYS = "luteal_days"
+CONF_RECENT_WEIGHT = "recent_weight"
+CONF_LONG_WEIGHT = "long_weight"
+CONF_RECENT_WINDOW = "recent_window"
+CONF_NOTIFY_SERVICES = "notify_services"
+CONF_TRIGGER_ENTITIES = "trigger_entities"
+CONF_DAILY_REMINDER_TIME = "daily_reminder_time"
+CONF_QUIET_HOURS_START = "quiet_hours_start"
+CONF_QUIET_HOURS_END = "quiet_hours_end"
+CONF_SAVE_DELAY = "save_delay"
+CONF_SAVE_MAX_DELAY = "save_max_delay"
+CONF_STORAGE_ENGINE = "storage_engine"
+CONF_INSTRUMENTATION = "instrumentation"
+CONF_TRIGGER_COOLDOWN = "trigger_cooldown"
+
+DEFAULT_LUTEAL_DAYS = 14
+DEFAULT_RECENT_WEIGHT = 0.7
+DEFAULT_LONG_WEIGHT = 0.3
+DEFAULT_RECENT_WINDOW = 3
+DEFAULT_DAILY_REMINDER_TIME = "09:00:00"  # local time; “ask if period happened”
+DEFAULT_QUIET_HOURS_START = "22:00:00"
+DEFAULT_QUIET_HOURS_END = "07:00:00"
+DEFAULT_SAVE_DELAY = 2.0  # seconds; 0 writes through on every change
+DEFAULT_SAVE_MAX_DELAY = 15.0  # seconds; bound on how long a dirty mark may wait
+DEFAULT_STORAGE_ENGINE = STORAGE_ENGINE_SNAPSHOT
+DEFAULT_INSTRUMENTATION = False
+DEFAULT_TRIGGER_COOLDOWN = 300.0  # seconds; trigger events within it are dropped
+
+# Page sizes for fertility_tracker/list_cycles windowed queries
+LIST_DEFAULT_LIMIT = 100
+LIST_MAX_LIMIT = 1000
+
+# Streaming export: rows per WS chunk / HTTP write are grouped up to this size
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Future cycles rolled forward from the last logged start (about two years)
+PROJECTION_CYCLES = 24
+
+# Next-period distribution: a normal over cycle lengths, discretized per day.
+# The spread falls back to DISTRIBUTION_DEFAULT_STD until two lengths are known
+# and never drops below DISTRIBUTION_MIN_STD; the horizon covers +/- SIGMAS.
+DISTRIBUTION_DEFAULT_STD = 3.0
+DISTRIBUTION_MIN_STD = 1.0
+DISTRIBUTION_SIGMAS = 4
+DISTRIBUTION_COVERAGE = 0.8
+
+# Longest span fertility_tracker/forecast returns in one call
+FORECAST_MAX_DAYS = 3660
+
+# Instrumentation: samples kept per operation for rolling percentiles
+INSTRUMENT_WINDOW = 256
+
+# Notification fan-out: targets sent at once, per-call timeout, and the
+# circuit breaker (consecutive failures that open it, seconds it stays open)
+NOTIFY_CONCURRENCY = 4
+NOTIFY_TIMEOUT = 10.0
+NOTIFY_BREAKER_FAILURES = 3
+NOTIFY_BREAKER_RESET = 300.0
+
+# Outbox: seconds before an undelivered digest is retried, and how many
+# attempts a queued notification gets before it is given up
+OUTBOX_RETRY = 300.0
+OUTBOX_MAX_ATTEMPTS = 5
+
+ATTR_CYCLE_DAY = "cycle_day"
+ATTR_CYCLE_LEN_AVG = "cycle_length_avg"
+ATTR_CYCLE_LEN_STD = "cycle_length_std"
+ATTR_NEXT_PERIOD = "next_period_date"
+ATTR_PRED_OVULATION = "predicted_ovulation_date"
+ATTR_FERTILE_START = "fertile_window_start"
+ATTR_FERTILE_END = "fertile_window_end"
+ATTR_IMPLANT_START = "implantation_window_start"
+ATTR_IMPLANT_END = "implantation_window_end"
+ATTR_RISK_LABEL = "risk_label"
+ATTR_LAST_PERIOD_START = "last_period_start"
+ATTR_LAST_PERIOD_END = "last_period_end"
+
+RISK_LOW = "low"
+RISK_MEDIUM = "medium"
+RISK_HIGH = "high"
+
+# Which window a day's risk comes from (None outside all of them)
+WINDOW_NEAR_FERTILE = "near_fertile"
+WINDOW_FERTILE = "fertile"
+WINDOW_IMPLANTATION = "implantation"
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from typing import TYPE_CHECKING, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .helpers import (
+    Metrics,
+    RiskRun,
+    calculate_metrics_for_date,
+    next_transition,
+    today_local,
+)
+from .instrumentation import timed
+
+if TYPE_CHECKING:
+    from . import EntryRuntime
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _risk_key(run: RiskRun | None) -> tuple | None:
+    return (run.level, run.label, run.window) if run is not None else None
+
+
+class FertilityCoordinator(DataUpdateCoordinator[Metrics]):
+    """Compute today's metrics once per entry and push them to the entities.
+
+    There is no update interval. The runtime calls ``async_recompute`` after a
+    mutation or a time zone change, and every computation arms a single
+    point-in-time wakeup for the next local midnight whose metrics differ
+    (see ``next_transition``). Entities that only show today's risk listen
+    through ``async_add_risk_listener`` and are called when the risk run
+    changes, not on every recompute.
+    """
+
+    def __init__(self, hass: HomeAssistant, runtime: "EntryRuntime") -> None:
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{runtime.entry.entry_id}",
+            update_interval=None,
+        )
+        self._runtime = runtime
+        self.risk: RiskRun | None = None
+        self._risk_listeners: list[Callable[[], None]] = []
+        self._wakeup_unsub: CALLBACK_TYPE | None = None
+        self.next_wakeup: dt.datetime | None = None
+        self.wakeups = 0
+
+    def _compute(self) -> Metrics:
+        with timed(self._runtime.instruments, "metrics"):
+            metrics = calculate_metrics_for_date(self._runtime.data, today_local(self.hass))
+        self._track_transitions(metrics.date)
+        return metrics
+
+    async def _async_update_data(self) -> Metrics:
+        return self._compute()
+
+    @callback
+    def async_recompute(self) -> None:
+        """Recompute today's metrics and notify listeners."""
+        self.async_set_updated_data(self._compute())
+
+    # ---- Transitions ----
+    @callback
+    def async_add_risk_listener(self, update: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call ``update`` whenever today's risk level, label or window changes."""
+        self._risk_listeners.append(update)
+
+        @callback
+        def _remove() -> None:
+            if update in self._risk_listeners:
+                self._risk_listeners.remove(update)
+
+        return _remove
+
+    def _track_transitions(self, today: dt.date) -> None:
+        data = self._runtime.data
+        run = data.risk_timeline().at(today)
+        changed = _risk_key(run) != _risk_key(self.risk)
+        self.risk = run
+
+        # The instant is rebuilt from the local date each time, so DST shifts
+        # and time zone changes move it with the wall clock.
+        self.async_cancel_wakeup()
+        day = next_transition(data, today)
+        self.next_wakeup = dt_util.start_of_local_day(day) if day is not None else None
+        if self.next_wakeup is not None:
+            self._wakeup_unsub = async_track_point_in_time(
+                self.hass, self._async_wakeup, self.next_wakeup
+            )
+
+        if changed:
+            for update in list(self._risk_listeners):
+                update()
+
+    @callback
+    def _async_wakeup(self, _now: dt.datetime) -> None:
+        self._wakeup_unsub = None
+        self.wakeups += 1
+        self.async_recompute()
+
+    @callback
+    def async_cancel_wakeup(self) -> None:
+        if self._wakeup_unsub:
+            self._wakeup_unsub()
+            self._wakeup_unsub = None
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_NOTIFY_SERVICES, CONF_TRIGGER_ENTITIES
+
+# Device and person names; the history itself is never included, only counts
+TO_REDACT = {CONF_NOTIFY_SERVICES, CONF_TRIGGER_ENTITIES, "service"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return options, counters and hot-path timings for one entry."""
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+        "sections": {
+            "sex_events_loaded": runtime.data.section_loaded("sex_events"),
+            "pregnancy_tests_loaded": runtime.data.section_loaded("pregnancy_tests"),
+        },
+        "stats": async_redact_data(runtime.stats(), TO_REDACT),
+    }
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    NOTIFY_BREAKER_FAILURES,
+    NOTIFY_BREAKER_RESET,
+    NOTIFY_CONCURRENCY,
+    NOTIFY_TIMEOUT,
+)
+from .instrumentation import RollingHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+OUTCOME_SENT = "sent"
+OUTCOME_FAILED = "failed"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_SKIPPED = "skipped"
+
+
+def split_service(svc: str) -> tuple[str, str]:
+    """``notify.phone`` -> (notify, phone); a bare name means the notify domain."""
+    try:
+        domain, service = svc.split(".")
+    except ValueError:
+        domain, service = "notify", svc
+    return domain, service
+
+
+class _Target:
+    """Breaker state and outcome counters for one notify service."""
+
+    __slots__ = (
+        "failures",
+        "open_until",
+        "trial_in_flight",
+        "latency",
+        "outcomes",
+        "last_outcome",
+        "last_error",
+    )
+
+    def __init__(self) -> None:
+        self.failures = 0  # consecutive
+        self.open_until = 0.0
+        self.trial_in_flight = False  # half-open: the one probe is out
+        self.latency = RollingHistogram()
+        self.outcomes = dict.fromkeys(
+            (OUTCOME_SENT, OUTCOME_FAILED, OUTCOME_TIMEOUT, OUTCOME_SKIPPED), 0
+        )
+        self.last_outcome: str | None = None
+        self.last_error: str | None = None
+
+    def record(self, outcome: str, error: str | None = None) -> None:
+        self.outcomes[outcome] += 1
+        self.last_outcome = outcome
+        if outcome != OUTCOME_SKIPPED:
+            self.last_error = error
+
+
+class Notifier:
+    """Sends one message to several notify services at once.
+
+    At most ``concurrency`` calls are in flight and each is cut off after
+    ``timeout`` seconds, so a hung notifier costs the caller one timeout
+    rather than delaying every later target. A failure only affects its own
+    target. After ``failures`` consecutive failures a target's breaker opens
+    and it is skipped for ``reset`` seconds; the next send after that is a
+    single trial that closes the breaker on success or reopens it. Sends that
+    arrive while the trial is out are skipped too.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        concurrency: int = NOTIFY_CONCURRENCY,
+        timeout: float = NOTIFY_TIMEOUT,
+        failures: int = NOTIFY_BREAKER_FAILURES,
+        reset: float = NOTIFY_BREAKER_RESET,
+    ) -> None:
+        self.hass = hass
+        self._timeout = timeout
+        self._failures = failures
+        self._reset = reset
+        self._limit = asyncio.Semaphore(concurrency)
+        self._targets: Dict[str, _Target] = {}
+
+    async def async_send(
+        self, services: Iterable[str], title: str, message: str
+    ) -> Dict[str, str]:
+        """Notify every service; returns each one's outcome."""
+        services = list(dict.fromkeys(services))
+        if not services:
+            return {}
+        data = {"title": title, "message": message}
+        outcomes = await asyncio.gather(*(self._send_one(svc, data) for svc in services))
+        return dict(zip(services, outcomes))
+
+    def stats(self) -> list[Dict[str, Any]]:
+        now = self.hass.loop.time()
+        return [
+            {
+                "service": svc,
+                "breaker": (
+                    "open"
+                    if now < t.open_until
+                    else "half_open" if t.trial_in_flight else "closed"
+                ),
+                "consecutive_failures": t.failures,
+                "last_outcome": t.last_outcome,
+                "last_error": t.last_error,
+                **t.outcomes,
+                "latency": t.latency.as_dict(),
+            }
+            for svc, t in sorted(self._targets.items())
+        ]
+
+    async def _send_one(self, svc: str, data: Dict[str, Any]) -> str:
+        target = self._targets.get(svc)
+        if target is None:
+            target = self._targets[svc] = _Target()
+        if self.hass.loop.time() < target.open_until or target.trial_in_flight:
+            target.record(OUTCOME_SKIPPED)
+            return OUTCOME_SKIPPED
+        # Past an opened breaker's reset this send is the trial; hold the rest
+        target.trial_in_flight = target.failures >= self._failures
+
+        domain, service = split_service(svc)
+        try:
+            async with self._limit:
+                t0 = time.perf_counter()
+                try:
+                    async with asyncio.timeout(self._timeout):
+                        await self.hass.services.async_call(
+                            domain, service, dict(data), blocking=True
+                        )
+                except TimeoutError:
+                    outcome, error = OUTCOME_TIMEOUT, "TimeoutError"
+                except Exception as exc:  # noqa: BLE001 - one target must not sink the rest
+                    # Only the type is kept: messages tend to name the device
+                    outcome, error = OUTCOME_FAILED, type(exc).__name__
+                    _LOGGER.debug("Notification via %s raised", svc, exc_info=True)
+                else:
+                    outcome, error = OUTCOME_SENT, None
+                target.latency.add(time.perf_counter() - t0)
+        finally:
+            target.trial_in_flight = False
+
+        target.record(outcome, error)
+        if outcome == OUTCOME_SENT:
+            target.failures = 0
+            target.open_until = 0.0
+            return outcome
+
+        target.failures += 1
+        _LOGGER.warning("Notification via %s failed: %s", svc, error)
+        if target.failures >= self._failures:
+            target.open_until = self.hass.loop.time() + self._reset
+            _LOGGER.warning(
+                "Skipping %s for %ss after %d consecutive failures",
+                svc,
+                self._reset,
+                target.failures,
+            )
+        return outcome
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+from typing import TYPE_CHECKING, Any, Dict
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY
+from .notifier import OUTCOME_SENT
+
+if TYPE_CHECKING:
+    from . import EntryRuntime
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def digest(name: str, rows: list[Dict[str, Any]]) -> tuple[str, str]:
+    """Title and message for delivering ``rows`` as one notification."""
+    if len(rows) == 1:
+        return rows[0]["title"], rows[0]["message"]
+    prefix = f"{name}: "
+    lines = [
+        f"{row['day']} {row['title'].removeprefix(prefix)}: {row['message']}"
+        for row in sorted(rows, key=lambda r: (r["day"], r["queued_at"]))
+    ]
+    return f"{name}: {len(rows)} notifications", "\n".join(lines)
+
+
+class Outbox:
+    """Outbound notifications for one entry, delivered by a single drain.
+
+    Messages are queued as rows in ``FertilityData.outbox`` and written to the
+    entry's store before anything is sent, so a restart resumes the queue.
+    A row's key is its kind and day: queueing the same kind twice on one day
+    replaces the queued message instead of sending both.
+
+    The drain is one task. Outside quiet hours it sends every queued row as
+    one digest and drops the rows once a target accepted it; during quiet
+    hours it parks and a single timer restarts it when they end. If no target
+    accepts the digest it is retried after OUTBOX_RETRY seconds, and a row is
+    given up after OUTBOX_MAX_ATTEMPTS tries.
+    """
+
+    def __init__(self, hass: HomeAssistant, runtime: EntryRuntime) -> None:
+        self.hass = hass
+        self.runtime = runtime
+        self._task: asyncio.Task | None = None
+        self._again = False
+        self._timer: CALLBACK_TYPE | None = None
+        self.resume_at: dt.datetime | None = None
+        self.delivered = 0
+        self.digests = 0
+        self.merged = 0
+        self.failed_attempts = 0
+        self.given_up = 0
+
+    async def async_put(self, kind: str, day: dt.date, title: str, message: str) -> None:
+        """Queue a message, persist it, and let the drain deliver it."""
+        data = self.runtime.data
+        key = f"{kind}:{day.isoformat()}"
+        if any(row["key"] == key for row in data.outbox):
+            self.merged += 1
+        data.queue_notification(
+            {
+                "key": key,
+                "kind": kind,
+                "day": day.isoformat(),
+                "title": title,
+                "message": message,
+                "queued_at": dt_util.utcnow().isoformat(),
+                "attempts": 0,
+            }
+        )
+        await self.runtime.async_save()
+        self.async_kick()
+
+    @callback
+    def async_kick(self) -> None:
+        """Run the drain now, or once more after the one in progress."""
+        if self._task is not None and not self._task.done():
+            self._again = True
+            return
+        self._cancel_timer()
+        self._task = self.hass.async_create_task(self._async_drain())
+
+    async def async_shutdown(self) -> None:
+        if self._task is not None and not self._task.done():
+            # Sends are bounded by the notifier timeout; rows stay queued otherwise
+            self._again = False
+            await self._task
+        self._cancel_timer()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self.runtime.data.outbox),
+            "resume_at": self.resume_at.isoformat() if self.resume_at else None,
+            "delivered": self.delivered,
+            "digests": self.digests,
+            "merged": self.merged,
+            "failed_attempts": self.failed_attempts,
+            "given_up": self.given_up,
+        }
+
+    # ---- Internals ----
+    async def _async_drain(self) -> None:
+        while True:
+            self._again = False
+            await self._drain_once()
+            if not self._again:
+                return
+
+    async def _drain_once(self) -> None:
+        runtime = self.runtime
+        rows = list(runtime.data.outbox)
+        if not rows:
+            return
+        until = runtime.quiet_until(dt_util.now(dt_util.get_time_zone(self.hass.config.time_zone)))
+        if until is not None:
+            _LOGGER.debug("Parking %d notification(s) until %s", len(rows), until)
+            self._arm(until)
+            return
+
+        title, message = digest(runtime.data.name, rows)
+        outcomes = await runtime._send_notifications(title, message)  # noqa: SLF001
+
+        # Rows replaced while the digest was out are left for the next pass
+        sent = {row["key"]: row for row in rows}
+        done = [row for row in runtime.data.outbox if sent.get(row["key"]) == row]
+        if not outcomes or OUTCOME_SENT in outcomes.values():
+            # Nobody to notify counts as done: nothing would ever take the rows
+            runtime.data.drop_notifications(row["key"] for row in done)
+            self.delivered += len(done)
+            self.digests += len(rows) > 1
+        else:
+            self.failed_attempts += 1
+            retry = [{**row, "attempts": row["attempts"] + 1} for row in done]
+            gone = [row["key"] for row in retry if row["attempts"] >= OUTBOX_MAX_ATTEMPTS]
+            if gone:
+                _LOGGER.warning("Giving up on %d undeliverable notification(s)", len(gone))
+                self.given_up += len(gone)
+                runtime.data.drop_notifications(gone)
+            for row in retry:
+                if row["attempts"] < OUTBOX_MAX_ATTEMPTS:
+                    runtime.data.queue_notification(row)
+            if runtime.data.outbox:
+                self._arm(dt_util.utcnow() + dt.timedelta(seconds=OUTBOX_RETRY))
+        # Written before returning so a restart neither resends nor loses rows
+        await runtime.async_save()
+
+    def _arm(self, at: dt.datetime) -> None:
+        self._cancel_timer()
+        self.resume_at = at
+        self._timer = async_track_point_in_time(self.hass, self._timer_fired, at)
+
+    def _cancel_timer(self) -> None:
+        if self._timer:
+            self._timer()
+        self._timer = None
+        self.resume_at = None
+
+    @callback
+    def _timer_fired(self, _now: dt.datetime) -> None:
+        self._timer = None
+        self.resume_at = None
+        self.async_kick()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import datetime as dt
+import heapq
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict
+
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_REMINDERS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Dates on which a reminder can matter, or None when it cannot on any day
+PromptDays = Callable[[], "tuple[dt.date, dt.date] | None"]
+ReminderAction = Callable[[dt.date], Awaitable[None]]
+
+
+@dataclass(slots=True)
+class _Reminder:
+    at: dt.time
+    days: PromptDays
+    action: ReminderAction
+    fire_at: dt.datetime | None = None
+
+
+class ReminderScheduler:
+    """Daily reminders for every entry, driven by one timer.
+
+    Each entry's next deadline sits in a min-heap of ``(fire_at, entry_id)``
+    and a single point-in-time timer is armed for the earliest one. Deadlines
+    are only placed on days ``days()`` allows, so an entry far from its
+    predicted period is not woken at all until its data changes.
+
+    Rescheduling pushes a new row and leaves the old one in place; rows whose
+    time no longer matches their entry are dropped as they reach the top.
+    Deadlines are built from the local date and time each day, so a DST
+    change keeps the wall-clock time and never fires a day twice or skips it.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._reminders: Dict[str, _Reminder] = {}
+        self._heap: list[tuple[dt.datetime, str]] = []
+        self._timer: CALLBACK_TYPE | None = None
+        self._timer_at: dt.datetime | None = None
+        self._config_unsub = hass.bus.async_listen(
+            EVENT_CORE_CONFIG_UPDATE, self._core_config_updated
+        )
+        self.fired = 0
+
+    @callback
+    def async_schedule(
+        self, entry_id: str, at: dt.time, days: PromptDays, action: ReminderAction
+    ) -> None:
+        """Register (or replace) ``entry_id``'s reminder at local time ``at``."""
+        self._reminders[entry_id] = _Reminder(at, days, action)
+        self._plan(entry_id, dt_util.utcnow())
+        self._arm()
+
+    @callback
+    def async_reschedule(self, entry_id: str) -> None:
+        """Recompute ``entry_id``'s next deadline, e.g. after its data changed."""
+        if entry_id in self._reminders:
+            self._plan(entry_id, dt_util.utcnow())
+            self._arm()
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        if self._reminders.pop(entry_id, None) is not None:
+            self._arm()
+
+    @callback
+    def async_shutdown(self) -> None:
+        self._reminders.clear()
+        self._heap.clear()
+        self._cancel_timer()
+        self._config_unsub()
+
+    def next_fire(self, entry_id: str) -> dt.datetime | None:
+        reminder = self._reminders.get(entry_id)
+        return reminder.fire_at if reminder else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._reminders),
+            "scheduled": sum(r.fire_at is not None for r in self._reminders.values()),
+            "heap": len(self._heap),
+            "fired": self.fired,
+            "next": self._timer_at.isoformat() if self._timer_at else None,
+        }
+
+    # ---- Internals ----
+    def _plan(self, entry_id: str, after: dt.datetime) -> None:
+        """Give the entry its first deadline after ``after`` on an allowed day."""
+        reminder = self._reminders[entry_id]
+        reminder.fire_at = None
+        window = reminder.days()
+        if window is None:
+            return
+        tz = dt_util.get_time_zone(self.hass.config.time_zone)
+        first, last = window
+        day = max(first, after.astimezone(tz).date())
+        while day <= last:
+            fire_at = dt_util.as_utc(dt.datetime.combine(day, reminder.at, tzinfo=tz))
+            if fire_at > after:
+                reminder.fire_at = fire_at
+                heapq.heappush(self._heap, (fire_at, entry_id))
+                return
+            day += dt.timedelta(days=1)
+
+    def _live(self, row: tuple[dt.datetime, str]) -> bool:
+        reminder = self._reminders.get(row[1])
+        return reminder is not None and reminder.fire_at == row[0]
+
+    def _arm(self) -> None:
+        """Point the timer at the earliest live deadline."""
+        heap = self._heap
+        while heap and not self._live(heap[0]):
+            heapq.heappop(heap)
+        if len(heap) > 2 * len(self._reminders) + 8:
+            self._heap = heap = [row for row in heap if self._live(row)]
+            heapq.heapify(heap)
+
+        top = heap[0][0] if heap else None
+        if top == self._timer_at:
+            return
+        self._cancel_timer()
+        if top is not None:
+            self._timer_at = top
+            self._timer = async_track_point_in_utc_time(self.hass, self._fire, top)
+
+    def _cancel_timer(self) -> None:
+        if self._timer:
+            self._timer()
+        self._timer = None
+        self._timer_at = None
+
+    @callback
+    def _fire(self, now: dt.datetime) -> None:
+        self._timer = None
+        self._timer_at = None
+        tz = dt_util.get_time_zone(self.hass.config.time_zone)
+        while self._heap and self._heap[0][0] <= now:
+            row = heapq.heappop(self._heap)
+            if not self._live(row):
+                continue
+            fire_at, entry_id = row
+            reminder = self._reminders[entry_id]
+            _LOGGER.debug("Daily reminder for %s due at %s", entry_id, fire_at)
+            self.fired += 1
+            self.hass.async_create_task(reminder.action(fire_at.astimezone(tz).date()))
+            self._plan(entry_id, fire_at)
+        self._arm()
+
+    @callback
+    def _core_config_updated(self, _event: Event) -> None:
+        # A time zone change moves every local deadline
+        now = dt_util.utcnow()
+        for entry_id in self._reminders:
+            self._plan(entry_id, now)
+        self._arm()
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> ReminderScheduler:
+    """The domain's scheduler, created on first use."""
+    scheduler = hass.data.get(DATA_REMINDERS)
+    if scheduler is None:
+        scheduler = hass.data[DATA_REMINDERS] = ReminderScheduler(hass)
+    return scheduler
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+
+from .const import (
+    STORAGE_VERSION,
+    STORAGE_KEY_PREFIX,
+    JOURNAL_MAX_BYTES,
+    JOURNAL_MAX_AGE_SECONDS,
+)
+from .helpers import FertilityData
+
+_LOGGER = logging.getLogger(__name__)
+
+# Snapshot keys that tie the snapshot to the journal; ignored by FertilityData.from_dict
+_SNAPSHOT_SEQ = "journal_seq"
+_SNAPSHOT_COMPACTED_AT = "journal_compacted_at"
+_RECORD_KEYS = {"seq", "op", "data"}
+
+
+def _read_journal(path: Path) -> tuple[list[Dict[str, Any]], int, bool]:
+    """Return (records, bytes of intact records, whether a torn tail was found)."""
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return [], 0, False
+
+    records: list[Dict[str, Any]] = []
+    good = 0
+    for line in raw.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            return records, good, True
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            return records, good, True
+        if not isinstance(rec, dict) or not _RECORD_KEYS <= rec.keys():
+            return records, good, True
+        records.append(rec)
+        good += len(line)
+    return records, good, False
+
+
+def _append_journal(path: Path, chunk: str) -> int:
+    data = chunk.encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    return len(data)
+
+
+def _truncate_journal(path: Path, size: int) -> None:
+    if size == 0:
+        path.unlink(missing_ok=True)
+        return
+    with path.open("r+b") as fh:
+        fh.truncate(size)
+
+
+class EntryStorage:
+    """Persistence for one entry: a JSON snapshot, optionally fronted by a journal.
+
+    In journal mode every mutation record from ``FertilityData`` is appended as
+    one JSON line, so a write costs O(1) in history size. The journal is folded
+    into a fresh snapshot once it passes ``JOURNAL_MAX_BYTES`` or
+    ``JOURNAL_MAX_AGE_SECONDS``. Records carry a sequence number and the snapshot
+    stores the last one it includes, so a crash between writing the snapshot and
+    truncating the journal never replays a record twice; a torn final line is
+    dropped on load.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, journal: bool) -> None:
+        self.hass = hass
+        key = f"{STORAGE_KEY_PREFIX}{entry_id}"
+        self.store = Store(hass, STORAGE_VERSION, key)
+        self.journal_path = Path(hass.config.path(STORAGE_DIR, f"{key}.journal"))
+        self.journal_enabled = journal
+
+        self._lock = asyncio.Lock()
+        self._pending: list[str] = []
+        self._seq = 0
+        self._journal_bytes = 0
+        self._compacted_at = time.time()
+        self.records_appended = 0
+        self.compactions = 0
+
+    @callback
+    def record(self, op: str, payload: Dict[str, Any]) -> None:
+        """Mutation listener: queue a journal line for the next write."""
+        if not self.journal_enabled:
+            return
+        self._seq += 1
+        self._pending.append(
+            json.dumps({"seq": self._seq, "op": op, "data": payload}, separators=(",", ":"))
+            + "\n"
+        )
+
+    async def async_load(self, default: FertilityData) -> FertilityData:
+        """Return the snapshot with any newer journal records replayed onto it."""
+        snapshot = await self.store.async_load()
+        data = FertilityData.from_dict(snapshot) if snapshot else default
+        base_seq = int(snapshot.get(_SNAPSHOT_SEQ, 0)) if snapshot else 0
+        if snapshot and snapshot.get(_SNAPSHOT_COMPACTED_AT):
+            self._compacted_at = float(snapshot[_SNAPSHOT_COMPACTED_AT])
+
+        records, good_bytes, torn = await self.hass.async_add_executor_job(
+            _read_journal, self.journal_path
+        )
+        self._seq = base_seq
+        replayed = 0
+        for rec in records:
+            if rec["seq"] <= base_seq:
+                continue
+            data.apply_record(rec["op"], rec["data"])
+            self._seq = rec["seq"]
+            replayed += 1
+        if torn:
+            _LOGGER.warning(
+                "Dropped a torn record at the end of %s", self.journal_path.name
+            )
+            await self.hass.async_add_executor_job(
+                _truncate_journal, self.journal_path, good_bytes
+            )
+        self._journal_bytes = good_bytes
+        _LOGGER.debug(
+            "Loaded %s (journal: %d replayed, %d bytes)", self.journal_path.name, replayed, good_bytes
+        )
+
+        # Fold leftovers into a snapshot when the journal is off (or there is no base yet)
+        if (records and not self.journal_enabled) or (self.journal_enabled and not snapshot):
+            await self.async_compact(data)
+        return data
+
+    async def async_write(self, data: FertilityData) -> None:
+        """Persist ``data``: append pending records, or write a full snapshot."""
+        async with self._lock:
+            if not self.journal_enabled:
+                await self.store.async_save(data.as_dict())
+                return
+
+            if self._pending:
+                lines, self._pending = self._pending, []
+                self._journal_bytes += await self.hass.async_add_executor_job(
+                    _append_journal, self.journal_path, "".join(lines)
+                )
+                self.records_appended += len(lines)
+
+            if (
+                self._journal_bytes >= JOURNAL_MAX_BYTES
+                or time.time() - self._compacted_at >= JOURNAL_MAX_AGE_SECONDS
+            ):
+                await self._async_compact(data)
+
+    async def async_compact(self, data: FertilityData) -> None:
+        async with self._lock:
+            await self._async_compact(data)
+
+    async def _async_compact(self, data: FertilityData) -> None:
+        # The snapshot reflects every record issued so far, pending ones included
+        self._pending.clear()
+        now = time.time()
+        snapshot = data.as_dict()
+        snapshot[_SNAPSHOT_SEQ] = self._seq
+        snapshot[_SNAPSHOT_COMPACTED_AT] = now
+        await self.store.async_save(snapshot)
+        await self.hass.async_add_executor_job(_truncate_journal, self.journal_path, 0)
+        self._journal_bytes = 0
+        self._compacted_at = now
+        self.compactions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "engine": "journal" if self.journal_enabled else "snapshot",
+            "journal_bytes": self._journal_bytes,
+            "journal_seq": self._seq,
+            "records_appended": self.records_appended,
+            "compactions": self.compactions,
+        }
@@ -0,0 +1,489 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import random
+from statistics import mean, pstdev
+
+import pytest
+
+from custom_components.fertility_tracker.helpers import (
+    CycleStore,
+    FertilityData,
+    build_projection,
+    calculate_metrics_for_date,
+    coerce_date,
+    forecast_range,
+    iter_export_chunks,
+    iter_export_csv,
+    iter_export_ndjson,
+    iter_export_rows,
+    list_window,
+    next_transition,
+    parse_history,
+    risk_strip,
+)
+
+
+def _data() -> FertilityData:
+    return FertilityData(
+        name="Test",
+        luteal_days=14,
+        recent_weight=0.7,
+        long_weight=0.3,
+        recent_window=3,
+        notify_services=[],
+        trigger_entities=[],
+        quiet_hours_start="22:00:00",
+        quiet_hours_end="07:00:00",
+        daily_reminder_time="09:00:00",
+    )
+
+
+def test_metrics_cache_hits_until_mutation():
+    data = _data()
+    data.add_period(start=coerce_date("2025-07-01"), end=None, notes=None)
+    data.add_period(start=coerce_date("2025-08-01"), end=None, notes=None)
+    when = dt.datetime(2025, 8, 10, 12, 0)
+
+    first = calculate_metrics_for_date(data, when)
+    assert calculate_metrics_for_date(data, when.replace(hour=18)) is first
+    assert (data.metrics_cache_hits, data.metrics_cache_misses) == (1, 1)
+
+    rev = data.revision
+    data.add_period(start=coerce_date("2025-08-29"), end=None, notes=None)
+    assert data.revision == rev + 1
+    assert data.cache_stats()["size"] == 0
+
+    second = calculate_metrics_for_date(data, when)
+    assert second is not first
+    assert data.metrics_cache_misses == 2
+    assert second.cycle_length_avg != first.cycle_length_avg
+
+
+def _reference_avg_std(data: FertilityData):
+    starts = sorted(c.start for c in data.cycles)
+    lengths = [(b - a).days for a, b in zip(starts, starts[1:])]
+    if not lengths:
+        return None, None
+    if len(lengths) <= data.recent_window:
+        avg = mean(lengths)
+    else:
+        avg = data.recent_weight * mean(lengths[-data.recent_window:]) + data.long_weight * mean(lengths)
+    return avg, (pstdev(lengths) if len(lengths) >= 2 else None)
+
+
+def test_incremental_length_stats_match_full_recompute():
+    rng = random.Random(42)
+    data = _data()
+    base = dt.date(2020, 1, 1)
+
+    for step in range(400):
+        op = rng.random()
+        if op < 0.5 or len(data.cycles) < 3:
+            start = base + dt.timedelta(days=rng.randint(0, 2000))
+            data.add_period(start=start, end=None, notes=None)
+        elif op < 0.75:
+            c = rng.choice(data.cycles)
+            data.edit_cycle(c.id, start=c.start + dt.timedelta(days=rng.randint(-90, 90)), end=None, notes=None)
+        else:
+            data.delete_cycle(rng.choice(data.cycles).id)
+        if step % 50 == 0:
+            data.recent_window = rng.randint(1, 6)
+
+        stats = data.length_stats()
+        avg, std = _reference_avg_std(data)
+        got_avg = stats.weighted_avg(data.recent_weight, data.long_weight)
+        if avg is None:
+            assert got_avg is None
+        else:
+            assert got_avg == pytest.approx(avg)
+        if std is None:
+            assert stats.pstdev() is None
+        else:
+            assert stats.pstdev() == pytest.approx(std)
+        assert [c.start for c in data.cycles] == sorted(c.start for c in data.cycles)
+
+
+def test_cycle_store_keeps_order_and_id_index():
+    data = _data()
+    for day in ("2025-03-01", "2025-01-01", "2025-02-01", "2025-01-01"):
+        data.add_period(start=coerce_date(day), end=None, notes=day)
+    assert isinstance(data.cycles, CycleStore)
+    assert [c.start.isoformat() for c in data.cycles] == [
+        "2025-01-01", "2025-01-01", "2025-02-01", "2025-03-01"
+    ]
+
+    moved = data.cycles[0]
+    assert data.cycles.get(moved.id) is moved
+    assert data.edit_cycle(moved.id, start=coerce_date("2025-04-01"), end=None, notes=None)
+    assert data.cycles[-1] is moved
+    assert data.cycles.start_range(coerce_date("2025-01-15"), coerce_date("2025-03-01")) == (1, 3)
+
+    assert data.delete_cycle(moved.id)
+    assert data.cycles.get(moved.id) is None
+    assert not data.delete_cycle(moved.id)
+
+    restored = FertilityData.from_dict(data.as_dict())
+    assert restored.as_dict() == data.as_dict()
+    assert restored.cycles.get(data.cycles[1].id).start == data.cycles[1].start
+
+
+_CSV = """type,start,end,ts,protected,result,notes
+period,2025-01-03,2025-01-07,,,,
+period,2025-02-01,,,,,imported
+period,2025-03-02,2025-03-06,,,,
+period,2025-03-04,,,,,overlaps previous row
+sex,,,2025-02-14T21:00:00,false,,
+sex,,,2025-02-14T21:00:00,false,,
+test,,,2025-03-01T08:00:00,,Negative,
+"""
+
+
+def test_import_history_dedupes_and_merges_once():
+    data = _data()
+    data.add_period(start=coerce_date("2025-02-01"), end=None, notes="imported")
+    data.add_period(start=coerce_date("2025-04-01"), end=coerce_date("2025-04-05"), notes=None)
+    records = []
+    data.add_mutation_listener(lambda op, payload: records.append(op))
+    rev = data.revision
+
+    batch = parse_history(_CSV, "csv", dt.timezone.utc)
+    counts = data.import_history(batch)
+
+    assert counts["inserted"] == {"periods": 2, "sex_events": 1, "pregnancy_tests": 1}
+    assert counts["skipped"] == {"periods": 1, "sex_events": 1, "pregnancy_tests": 0}
+    assert counts["conflicting"] == {"periods": 1, "sex_events": 0, "pregnancy_tests": 0}
+    assert [c.start.isoformat() for c in data.cycles] == [
+        "2025-01-03", "2025-02-01", "2025-03-02", "2025-04-01"
+    ]
+    assert data.revision == rev + 1
+    assert records == ["import"]
+    assert data.pregnancy_tests[0].result == "negative"
+    assert data.sex_events[0].ts.tzinfo is not None
+
+    # Stats are rebuilt over the merged history
+    assert data.length_stats().count == 3
+
+    # Re-importing the export is a no-op
+    again = data.import_history(parse_history(data.as_dict(), "json", dt.timezone.utc))
+    assert sum(again["inserted"].values()) == 0
+
+
+def test_parse_history_names_missing_csv_columns():
+    with pytest.raises(ValueError, match=r"missing: start or ts$"):
+        parse_history("type,end,notes\nperiod,2025-01-07,\n", "csv", dt.timezone.utc)
+    with pytest.raises(ValueError, match=r"missing: type$"):
+        parse_history("start,end\n2025-01-03,2025-01-07\n", "csv", dt.timezone.utc)
+    # A file of periods alone needs no ts column
+    batch = parse_history("type,start\nperiod,2025-01-03\n", "csv", dt.timezone.utc)
+    assert [c.start.isoformat() for c in batch.periods] == ["2025-01-03"]
+
+
+def test_parse_history_reports_every_bad_row():
+    with pytest.raises(ValueError) as err:
+        parse_history(
+            {"periods": [{"start": "2025-13-01"}, {"end": "2025-01-01"}], "sex_events": [{"ts": "x"}]},
+            "json",
+            dt.timezone.utc,
+        )
+    assert "row 1" in str(err.value) and "row 2" in str(err.value) and "row 3" in str(err.value)
+
+
+def test_list_window_pages_are_stable_across_inserts():
+    data = _data()
+    base = dt.date(2024, 1, 1)
+    for i in range(30):
+        data.add_period(start=base + dt.timedelta(days=28 * i), end=None, notes=None)
+        data.add_sex_event(ts=dt.datetime(2024, 1, 10, 21, 0) + dt.timedelta(days=28 * i), protected=False, notes=None)
+    # An ongoing period that started before the window is included
+    data.cycles[4].end = base + dt.timedelta(days=28 * 4 + 6)
+    first = base + dt.timedelta(days=28 * 4 + 3)
+    last = base + dt.timedelta(days=28 * 20)
+
+    expected = [c.as_dict() for c in data.cycles if c.start <= last and (c.end or c.start) >= first]
+    seen, events, cursor, pages = [], [], None, 0
+    while True:
+        page = list_window(data, first, last, dt.timezone.utc, 4, cursor)
+        seen += page["cycles"]
+        events += page["sex_events"]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        if pages == 2:
+            # Out-of-window and already-paged inserts must not shift the next page
+            data.add_period(start=base - dt.timedelta(days=100), end=None, notes=None)
+            data.add_period(start=first + dt.timedelta(days=1), end=None, notes=None)
+
+    assert seen == expected
+    assert pages == 5
+    assert len(events) == 16
+    assert all(first.isoformat() <= e["ts"][:10] <= last.isoformat() for e in events)
+
+    with pytest.raises(ValueError):
+        list_window(data, first, last, dt.timezone.utc, 4, "not-a-cursor")
+
+
+def test_streaming_export_round_trips_and_stays_chunked():
+    data = _data()
+    base = dt.date(2023, 1, 1)
+    for i in range(40):
+        data.add_period(start=base + dt.timedelta(days=29 * i), end=None, notes=f"note, \"{i}\"")
+        data.add_sex_event(
+            ts=dt.datetime(2023, 1, 12, 22, 0, tzinfo=dt.timezone.utc) + dt.timedelta(days=29 * i),
+            protected=bool(i % 2),
+            notes=None,
+        )
+    data.add_pregnancy_test(ts=dt.datetime(2024, 3, 1, 7, 0, tzinfo=dt.timezone.utc), result="negative")
+
+    restored = _data()
+    counts = restored.import_history(parse_history("".join(iter_export_csv(data)), "csv", dt.timezone.utc))
+    assert counts["inserted"] == {"periods": 40, "sex_events": 40, "pregnancy_tests": 1}
+    assert restored.as_dict()["cycles"] == data.as_dict()["cycles"]
+    assert restored.as_dict()["sex_events"] == data.as_dict()["sex_events"]
+
+    lines = list(iter_export_ndjson(data))
+    assert json.loads(lines[0])["type"] == "header"
+    assert len(lines) == 1 + 81
+
+    chunks = list(iter_export_chunks(data, 1024))
+    assert len(chunks) > 1
+    assert sum(len(c) for c in chunks) == 81
+    assert all(len(json.dumps(c, separators=(",", ":"))) <= 1024 + len(c) + 1 for c in chunks)
+
+
+def test_export_walks_live_sections_across_mutations():
+    data = _data()
+    base = dt.date(2023, 1, 1)
+    for i in range(6):
+        data.add_period(start=base + dt.timedelta(days=29 * i), end=None, notes=None)
+    starts = [c.start for c in data.cycles]
+
+    rows = iter_export_rows(data)
+    seen = [next(rows)["start"] for _ in range(3)]
+    # Behind the cursor: an older period and a deletion; ahead: a newer period
+    data.add_period(start=base - dt.timedelta(days=60), end=None, notes=None)
+    data.delete_cycle(data.cycles[1].id)
+    data.add_period(start=base + dt.timedelta(days=29 * 6), end=None, notes=None)
+    seen += [row["start"] for row in rows if row["type"] == "period"]
+
+    expected = starts + [base + dt.timedelta(days=29 * 6)]
+    assert seen == [d.isoformat() for d in expected]
+
+
+def test_events_are_slotted_and_share_tzinfo():
+    a = FertilityData.from_dict(
+        {
+            "name": "Slots",
+            "sex_events": [
+                {"ts": "2025-01-01T21:00:00+02:00", "protected": False, "notes": "same"},
+                {"ts": "2025-01-02T21:00:00+02:00", "protected": True, "notes": "".join(["sa", "me"])},
+            ],
+            "pregnancy_tests": [{"ts": "2025-01-20T07:00:00+02:00", "result": "negative"}],
+        }
+    )
+    first, second = a.sex_events
+    assert not hasattr(first, "__dict__")
+    assert first.ts.tzinfo is second.ts.tzinfo is a.pregnancy_tests[0].ts.tzinfo
+    assert first.notes is second.notes
+    assert FertilityData.from_dict(a.as_dict()).as_dict() == a.as_dict()
+
+
+def test_event_sections_are_parsed_on_first_use():
+    stored = {
+        "name": "Lazy",
+        "cycles": [{"id": "a", "start": "2025-01-01"}, {"id": "b", "start": "2025-01-29"}],
+        "sex_events": [
+            {"ts": "2025-01-14T21:00:00+00:00", "protected": False, "notes": None},
+            {"ts": "2025-01-10T21:00:00+00:00", "protected": True, "notes": None},
+        ],
+        "pregnancy_tests": [{"ts": "2025-02-01T07:00:00+00:00", "result": "negative"}],
+    }
+    data = FertilityData.from_dict(stored)
+    calculate_metrics_for_date(data, dt.datetime(2025, 2, 3, 12, 0))
+    assert not data.section_loaded("sex_events")
+    assert data.as_dict()["sex_events"] == stored["sex_events"]
+
+    assert [e.ts.day for e in data.sex_events] == [10, 14]
+    assert data.section_loaded("sex_events")
+    assert not data.section_loaded("pregnancy_tests")
+
+    data.add_pregnancy_test(ts=dt.datetime(2025, 2, 5, 7, 0, tzinfo=dt.timezone.utc), result="positive")
+    assert [t.result for t in data.pregnancy_tests] == ["negative", "positive"]
+
+
+def test_malformed_stored_event_row_is_skipped_not_the_section(caplog):
+    good = {"ts": "2025-01-14T21:00:00+00:00", "protected": False, "notes": None}
+    data = FertilityData.from_dict(
+        {"name": "Lazy", "sex_events": [good, {"ts": "not a time"}, {"protected": True}]}
+    )
+    assert [e.ts.day for e in data.sex_events] == [14]
+    assert "Skipping malformed sex_events row" in caplog.text
+    # Reading again and saving keep the good row
+    assert len(data.sex_events) == 1
+    assert data.as_dict()["sex_events"] == [good]
+
+
+def test_forecast_range_matches_per_day_metrics():
+    rng = random.Random(7)
+    data = _data()
+    assert forecast_range(data, dt.date(2025, 1, 1), dt.date(2025, 1, 3)).risk_level == [None] * 3
+
+    day = dt.date(2024, 1, 1)
+    for _ in range(8):
+        data.add_period(start=day, end=None, notes=None)
+        day += dt.timedelta(days=rng.randint(25, 33))
+    last = data.cycles[-1].start
+
+    for _ in range(20):
+        first = last + dt.timedelta(days=rng.randint(-60, 40))
+        end = first + dt.timedelta(days=rng.randint(0, 90))
+        forecast = forecast_range(data, first, end)
+        for i in range((end - first).days + 1):
+            m = calculate_metrics_for_date(data, dt.datetime.combine(first + dt.timedelta(days=i), dt.time(9)))
+            assert forecast.cycle_day[i] == m.cycle_day
+            assert forecast.risk_level[i] == m.risk_level
+            assert forecast.fertile[i] == (m.fertile_window_start <= m.date <= m.fertile_window_end)
+            assert forecast.implantation[i] == (
+                m.implantation_window_start <= m.date <= m.implantation_window_end
+            )
+
+    with pytest.raises(ValueError):
+        forecast_range(data, last, last - dt.timedelta(days=1))
+
+
+def test_projection_rolls_cycles_forward_and_invalidates():
+    data = _data()
+    for day in ("2025-01-01", "2025-01-29", "2025-02-26"):
+        data.add_period(start=coerce_date(day), end=None, notes=None)
+    projection = data.projection()
+    assert data.projection() is projection
+    assert [c.start.isoformat() for c in projection.cycles[:3]] == ["2025-02-26", "2025-03-26", "2025-04-23"]
+
+    # Two cycles past the last logged start, predictions follow the projected cycle
+    m = calculate_metrics_for_date(data, dt.datetime(2025, 4, 30, 12, 0))
+    assert m.next_period_date == coerce_date("2025-05-21")
+    assert m.predicted_ovulation_date == coerce_date("2025-05-07")
+    assert m.cycle_day == 64
+    assert projection.cycle_for(coerce_date("2025-04-30")).index == 2
+    assert projection.cycle_for(coerce_date("2024-12-01")).index == 0
+    assert [c.index for c in projection.overlapping(coerce_date("2025-03-20"), coerce_date("2025-04-23"))] == [0, 1, 2]
+
+    data.add_period(start=coerce_date("2025-03-30"), end=None, notes=None)
+    assert data.projection() is not projection
+    assert data.projection().cycles[0].start == coerce_date("2025-03-30")
+
+
+def test_projection_lookups_match_the_full_table():
+    rng = random.Random(3)
+    for _ in range(20):
+        data = _data()
+        day = dt.date(2024, 1, 1)
+        for _ in range(rng.randint(2, 6)):
+            data.add_period(start=day, end=None, notes=None)
+            day += dt.timedelta(days=rng.randint(21, 38))
+        # A fresh projection per lookup, so single-day reads never see the table
+        table = build_projection(data, 24).cycles
+        origin, horizon = table[0].start, table[-1].next_start
+        for _ in range(50):
+            d = origin + dt.timedelta(days=rng.randint(-40, (horizon - origin).days + 40))
+            expected = [c for c in table if c.start <= d < c.next_start]
+            if d < origin:
+                expected = table[:1]
+            got = build_projection(data, 24).cycle_for(d)
+            assert ([got] if got else []) == expected
+            last = d + dt.timedelta(days=rng.randint(0, 90))
+            span = [c for c in table if c.next_start > d and (c.start <= last or c.index == 0)]
+            assert build_projection(data, 24).overlapping(d, last) == span
+
+
+def test_distribution_matches_projection_and_conditions_on_date():
+    data = _data()
+    for day in ("2025-01-01", "2025-01-27", "2025-02-26", "2025-03-24"):
+        data.add_period(start=coerce_date(day), end=None, notes=None)
+    dist = data.distribution()
+    assert data.distribution() is dist
+    assert sum(dist.period.probabilities) == pytest.approx(1.0)
+    assert dist.period.most_likely() == data.projection().cycles[0].next_start
+    assert dist.ovulation.most_likely() == data.projection().cycles[0].ovulation
+
+    first, last = dist.period.interval(0.8)
+    assert first < dist.period.most_likely() < last
+    inside = sum(dist.period.probability(first + dt.timedelta(days=i)) for i in range((last - first).days + 1))
+    assert inside >= 0.8
+    wider = dist.period.interval(0.95)
+    assert wider[0] <= first and wider[1] >= last
+
+    # Late period: mass before the date is dropped and the rest renormalized
+    late = dist.period.given_not_before(dist.period.most_likely() + dt.timedelta(days=1))
+    assert late.first == dist.period.most_likely() + dt.timedelta(days=1)
+    assert sum(late.probabilities) == pytest.approx(1.0)
+    assert dist.period.given_not_before(dist.period.last + dt.timedelta(days=1)) is None
+
+    data.add_period(start=coerce_date("2025-04-21"), end=None, notes=None)
+    assert data.distribution() is not dist
+    assert _data().distribution() is None
+
+
+def _reference_risk(data, d):
+    """The per-day window comparisons the timeline replaces."""
+    c = data.projection().cycle_for(d)
+    if c is None:
+        return None
+    level = "low"
+    if c.fertile_start <= d <= c.fertile_end:
+        level = "high"
+    elif c.fertile_start - dt.timedelta(days=2) <= d <= c.fertile_end + dt.timedelta(days=2):
+        level = "medium"
+    if c.implantation_start <= d <= c.implantation_end:
+        return "high", "implantation"
+    return level, None
+
+
+def test_risk_timeline_matches_per_day_rules():
+    rng = random.Random(7)
+    for _ in range(20):
+        data = _data()
+        data.luteal_days = rng.randint(10, 16)
+        day = dt.date(2024, 1, 1)
+        for _ in range(rng.randint(2, 6)):
+            data.add_period(start=day, end=None, notes=None)
+            day += dt.timedelta(days=rng.randint(21, 40))
+        timeline = data.risk_timeline()
+        assert data.risk_timeline() is timeline
+        runs = timeline.runs
+        assert all(a.end + dt.timedelta(days=1) == b.start for a, b in zip(runs, runs[1:]))
+        assert all((a.level, a.label) != (b.level, b.label) for a, b in zip(runs, runs[1:]))
+
+        first = data.cycles[0].start - dt.timedelta(days=40)
+        for i in range(900):
+            d = first + dt.timedelta(days=i)
+            run = timeline.at(d)
+            expected = _reference_risk(data, d)
+            if expected is None:
+                assert run is None
+            else:
+                assert (run.level, run.window == "implantation") == (expected[0], expected[1] is not None)
+
+    strip = risk_strip(data)
+    assert strip[0]["start"] == data.cycles[-2].start.isoformat()
+    assert strip[-1]["end"] == (data.projection().cycles[-1].next_start - dt.timedelta(days=1)).isoformat()
+    data.add_period(start=day, end=None, notes=None)
+    assert data.risk_timeline() is not timeline
+    assert risk_strip(_data()) == []
+
+
+def test_next_transition_follows_day_count_and_risk_runs():
+    data = _data()
+    assert next_transition(data, coerce_date("2025-01-10")) is None
+    for day in ("2025-01-01", "2025-01-29"):
+        data.add_period(start=coerce_date(day), end=None, notes=None)
+    # A cycle underway: the day count changes at every midnight
+    assert next_transition(data, coerce_date("2025-02-01")) == coerce_date("2025-02-02")
+
+    # Before the last logged start, only risk boundaries and that start matter
+    before = coerce_date("2025-01-10")
+    run = data.risk_timeline().at(before)
+    assert data.risk_timeline().next_change(before) == run.end + dt.timedelta(days=1)
+    assert next_transition(data, before) == min(run.end + dt.timedelta(days=1), coerce_date("2025-01-29"))
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from homeassistant.core import HomeAssistant, ServiceCall
+
+from custom_components.fertility_tracker.notifier import Notifier
+
+pytestmark = pytest.mark.asyncio
+
+
+def _register(hass: HomeAssistant, name: str, handler) -> list[ServiceCall]:
+    calls: list[ServiceCall] = []
+
+    async def _service(call: ServiceCall) -> None:
+        calls.append(call)
+        await handler()
+
+    hass.services.async_register("notify", name, _service)
+    return calls
+
+
+async def _ok() -> None:
+    return None
+
+
+async def _hang() -> None:
+    await asyncio.sleep(3600)
+
+
+async def _boom() -> None:
+    raise RuntimeError("device notify.broken went away")
+
+
+async def test_targets_are_isolated_and_bounded_by_timeout(hass: HomeAssistant):
+    fast = _register(hass, "fast", _ok)
+    _register(hass, "slow", _hang)
+    _register(hass, "broken", _boom)
+    notifier = Notifier(hass, timeout=0.05)
+
+    outcomes = await notifier.async_send(
+        ["notify.slow", "notify.broken", "fast", "missing"], "Title", "Body"
+    )
+    assert outcomes == {
+        "notify.slow": "timeout",
+        "notify.broken": "failed",
+        "fast": "sent",
+        "missing": "failed",
+    }
+    assert fast[0].data == {"title": "Title", "message": "Body"}
+
+    stats = {row["service"]: row for row in notifier.stats()}
+    assert stats["fast"]["sent"] == 1
+    assert stats["fast"]["latency"]["count"] == 1
+    assert stats["notify.slow"]["last_error"] == "TimeoutError"
+    # Error messages can name devices; only the type is kept
+    assert stats["notify.broken"]["last_error"] == "RuntimeError"
+    assert stats["missing"]["last_error"] == "ServiceNotFound"
+
+
+async def test_breaker_skips_a_failing_target_until_a_trial_succeeds(hass: HomeAssistant):
+    healthy = False
+
+    async def _flaky() -> None:
+        if not healthy:
+            raise RuntimeError("down")
+
+    calls = _register(hass, "flaky", _flaky)
+    notifier = Notifier(hass, failures=2, reset=3600)
+
+    for _ in range(2):
+        assert await notifier.async_send(["notify.flaky"], "t", "m") == {"notify.flaky": "failed"}
+    assert notifier.stats()[0]["breaker"] == "open"
+
+    assert await notifier.async_send(["notify.flaky"], "t", "m") == {"notify.flaky": "skipped"}
+    assert len(calls) == 2
+
+    # Once the reset has passed, one trial send goes through and closes it
+    notifier._targets["notify.flaky"].open_until = 0.0  # noqa: SLF001
+    healthy = True
+    assert await notifier.async_send(["notify.flaky"], "t", "m") == {"notify.flaky": "sent"}
+    row = notifier.stats()[0]
+    assert row["breaker"] == "closed"
+    assert row["consecutive_failures"] == 0
+    assert (row["sent"], row["failed"], row["skipped"]) == (1, 2, 1)
+
+
+async def test_half_open_breaker_lets_one_trial_through(hass: HomeAssistant):
+    release = asyncio.Event()
+
+    async def _still_down() -> None:
+        await release.wait()
+        raise RuntimeError("down")
+
+    calls = _register(hass, "flaky", _still_down)
+    notifier = Notifier(hass, failures=1, reset=3600)
+    release.set()
+    assert await notifier.async_send(["notify.flaky"], "t", "m") == {"notify.flaky": "failed"}
+
+    # Reset elapsed: a burst arrives while the target is still failing
+    notifier._targets["notify.flaky"].open_until = 0.0  # noqa: SLF001
+    release.clear()
+    burst = [
+        hass.async_create_task(notifier.async_send(["notify.flaky"], "t", "m"))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert len(calls) == 2
+    assert notifier.stats()[0]["breaker"] == "half_open"
+
+    release.set()
+    outcomes = [r["notify.flaky"] for r in await asyncio.gather(*burst)]
+    assert sorted(outcomes) == ["failed"] + ["skipped"] * 4
+    # The failed trial reopens the breaker
+    row = notifier.stats()[0]
+    assert row["breaker"] == "open"
+    assert (row["failed"], row["skipped"]) == (2, 4)
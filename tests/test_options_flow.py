@@ -15,6 +15,9 @@ from custom_components.fertility_tracker.const import (
     CONF_DAILY_REMINDER_TIME,
     CONF_QUIET_HOURS_START,
     CONF_QUIET_HOURS_END,
+    CONF_SAVE_DELAY,
+    CONF_STORAGE_ENGINE,
+    STORAGE_ENGINE_JOURNAL,
 )
 
 pytestmark = pytest.mark.asyncio
@@ -43,3 +46,36 @@ async def test_options_flow_sets_values(hass: HomeAssistant, setup_integration,
     assert config_entry.options[CONF_RECENT_WEIGHT] == 0.6
     assert config_entry.options[CONF_RECENT_WINDOW] == 4
     assert config_entry.options[CONF_DAILY_REMINDER_TIME] == "08:30:00"
+
+
+async def test_options_survive_reload_in_journal_mode(hass: HomeAssistant, config_entry):
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_STORAGE_ENGINE: STORAGE_ENGINE_JOURNAL, CONF_SAVE_DELAY: 0}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+
+    # A prediction setting is applied in place
+    hass.config_entries.async_update_entry(
+        config_entry, options={**config_entry.options, CONF_LUTEAL_DAYS: 11}
+    )
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN][config_entry.entry_id] is runtime
+    assert runtime.data.luteal_days == 11
+
+    assert await hass.config_entries.async_reload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    assert runtime.data.luteal_days == 11
+
+    # Settings read when the runtime is built reload the entry
+    hass.config_entries.async_update_entry(
+        config_entry, options={**config_entry.options, CONF_SAVE_DELAY: 4.0}
+    )
+    await hass.async_block_till_done()
+    reloaded = hass.data[DOMAIN][config_entry.entry_id]
+    assert reloaded is not runtime
+    assert reloaded._save_delay == 4.0  # noqa: SLF001
+    assert reloaded.data.luteal_days == 11
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from freezegun import freeze_time
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.fertility_tracker.const import DOMAIN, OUTBOX_RETRY
+from custom_components.fertility_tracker.helpers import coerce_date
+
+pytestmark = pytest.mark.asyncio
+
+DAY = coerce_date("2025-09-10")
+
+
+def _local(day: str, time: str) -> dt.datetime:
+    local = dt.datetime.combine(
+        coerce_date(day), dt.time.fromisoformat(time), tzinfo=dt_util.DEFAULT_TIME_ZONE
+    )
+    return dt_util.as_utc(local)
+
+
+async def test_quiet_hours_park_and_flush_one_digest(
+    hass: HomeAssistant, setup_integration, config_entry
+):
+    calls = async_mock_service(hass, "notify", "phone")
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    runtime.data.notify_services = ["notify.phone"]
+    outbox = runtime.outbox
+
+    with freeze_time(_local("2025-09-10", "23:00")):
+        await outbox.async_put("risk", DAY, "Wife Tracker: Today's fertility risk", "first")
+        await outbox.async_put("risk", DAY, "Wife Tracker: Today's fertility risk", "second")
+        await outbox.async_put("period_check", DAY, "Wife Tracker: Period check", "started?")
+        await hass.async_block_till_done()
+        assert calls == []
+        assert [row["key"] for row in runtime.data.outbox] == [
+            "risk:2025-09-10",
+            "period_check:2025-09-10",
+        ]
+        assert outbox.resume_at == _local("2025-09-11", "07:00:01")
+        assert outbox.stats()["merged"] == 1
+
+    with freeze_time(_local("2025-09-11", "07:00:02")):
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert calls[0].data["title"] == "Wife Tracker: 2 notifications"
+    assert calls[0].data["message"] == (
+        "2025-09-10 Today's fertility risk: second\n2025-09-10 Period check: started?"
+    )
+    assert runtime.data.outbox == []
+    assert outbox.stats()["delivered"] == 2
+    assert outbox.stats()["digests"] == 1
+
+
+async def test_queue_survives_a_reload(hass: HomeAssistant, setup_integration, config_entry):
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    runtime.data.notify_services = ["notify.phone"]
+
+    with freeze_time(_local("2025-09-10", "23:00")):
+        await runtime.outbox.async_put("risk", DAY, "t", "parked")
+        assert await hass.config_entries.async_reload(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        reloaded = hass.data[DOMAIN][config_entry.entry_id]
+        assert reloaded is not runtime
+        assert [row["message"] for row in reloaded.data.outbox] == ["parked"]
+        assert reloaded.outbox.resume_at == _local("2025-09-11", "07:00:01")
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_undelivered_digest_is_kept_and_retried(
+    hass: HomeAssistant, setup_integration, config_entry
+):
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    # Nothing is registered under this name, so every send fails
+    runtime.data.notify_services = ["notify.missing"]
+
+    with freeze_time(_local("2025-09-10", "12:00")):
+        await runtime.outbox.async_put("risk", DAY, "t", "m")
+        await hass.async_block_till_done()
+        assert runtime.data.outbox[0]["attempts"] == 1
+        assert runtime.outbox.resume_at == dt_util.utcnow() + dt.timedelta(seconds=OUTBOX_RETRY)
+
+    calls = async_mock_service(hass, "notify", "missing")
+    with freeze_time(_local("2025-09-10", "12:05:01")):
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+    assert len(calls) == 1
+    assert runtime.data.outbox == []
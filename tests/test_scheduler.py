@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from freezegun import freeze_time
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.fertility_tracker.const import (
+    CONF_DAILY_REMINDER_TIME,
+    DATA_REMINDERS,
+    DOMAIN,
+)
+from custom_components.fertility_tracker.helpers import coerce_date
+from custom_components.fertility_tracker.scheduler import ReminderScheduler
+
+pytestmark = pytest.mark.asyncio
+
+
+def _local(day: str, time: str) -> dt.datetime:
+    local = dt.datetime.combine(
+        coerce_date(day), dt.time.fromisoformat(time), tzinfo=dt_util.DEFAULT_TIME_ZONE
+    )
+    return dt_util.as_utc(local)
+
+
+async def test_one_timer_for_all_entries_and_far_entries_are_skipped(
+    hass: HomeAssistant, setup_integration, config_entry
+):
+    other = MockConfigEntry(domain=DOMAIN, data={"name": "Other"}, options={}, title="Other")
+    other.add_to_hass(hass)
+
+    with freeze_time(_local("2025-09-10", "12:00")):
+        assert await hass.config_entries.async_setup(other.entry_id)
+        await hass.async_block_till_done()
+        runtime = hass.data[DOMAIN][config_entry.entry_id]
+        runtime.data.add_period(start=coerce_date("2025-08-01"), end=None, notes=None)
+        runtime.data.add_period(start=coerce_date("2025-08-29"), end=None, notes=None)
+        await runtime.async_data_changed()
+
+        scheduler: ReminderScheduler = hass.data[DATA_REMINDERS]
+        first, last = runtime.prompt_days()
+        assert first > coerce_date("2025-09-11")
+        # Nothing to prompt until the predicted range; no history means never
+        assert scheduler.next_fire(config_entry.entry_id) == _local(first.isoformat(), "09:00")
+        assert scheduler.next_fire(other.entry_id) is None
+        assert scheduler.stats()["entries"] == 2
+        assert scheduler.stats()["scheduled"] == 1
+
+    with freeze_time(_local(first.isoformat(), "09:00:01")):
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+        assert scheduler.fired == 1
+        nxt = (first + dt.timedelta(days=1)).isoformat()
+        assert scheduler.next_fire(config_entry.entry_id) == _local(nxt, "09:00")
+
+        # Option changes move the deadline without a reload
+        hass.config_entries.async_update_entry(
+            config_entry, options={CONF_DAILY_REMINDER_TIME: "08:30:00"}
+        )
+        await hass.async_block_till_done()
+        assert runtime.data.daily_reminder_time == "08:30:00"
+        assert scheduler.next_fire(config_entry.entry_id) == _local(nxt, "08:30")
+
+    assert await hass.config_entries.async_unload(other.entry_id)
+    assert scheduler.stats()["entries"] == 1
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    assert DATA_REMINDERS not in hass.data
+
+
+async def test_deadlines_keep_wall_clock_time_across_dst(hass: HomeAssistant):
+    await hass.config.async_update(time_zone="Europe/Berlin")
+    scheduler = ReminderScheduler(hass)
+    fired: list[dt.date] = []
+
+    async def _action(day: dt.date) -> None:
+        fired.append(day)
+
+    window = (coerce_date("2025-10-25"), coerce_date("2025-10-27"))
+    with freeze_time("2025-10-24 12:00:00+00:00"):
+        scheduler.async_schedule("e1", dt.time(9), lambda: window, _action)
+        # CEST (+2) before the switch, CET (+1) after it
+        assert scheduler.next_fire("e1") == dt.datetime(2025, 10, 25, 7, tzinfo=dt.timezone.utc)
+
+    for utc_hour, day in ((7, 25), (8, 26), (8, 27)):
+        with freeze_time(dt.datetime(2025, 10, day, utc_hour, 0, 1, tzinfo=dt.timezone.utc)):
+            async_fire_time_changed(hass, dt_util.utcnow())
+            await hass.async_block_till_done()
+    assert fired == [dt.date(2025, 10, 25), dt.date(2025, 10, 26), dt.date(2025, 10, 27)]
+    # Past the window: nothing left to schedule
+    assert scheduler.next_fire("e1") is None
+    scheduler.async_shutdown()
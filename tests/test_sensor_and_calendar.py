@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import datetime as dt
+import random
+from statistics import mean
+
 import pytest
 from freezegun import freeze_time
 from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
-from custom_components.fertility_tracker.const import DOMAIN
-from custom_components.fertility_tracker.helpers import coerce_date
+from custom_components.fertility_tracker.const import DOMAIN, PROJECTION_CYCLES
+from custom_components.fertility_tracker.calendar import build_calendar_events
+from custom_components.fertility_tracker.helpers import (
+    FertilityData,
+    coerce_date,
+)
 
 pytestmark = pytest.mark.asyncio
 
@@ -46,3 +54,164 @@ async def test_sensor_states_and_calendar_events(hass: HomeAssistant, setup_inte
         summaries = [e.summary for e in events]
         assert any(s == "Period" for s in summaries)
         assert "Fertile Window" in summaries or "Implantation Window" in summaries
+
+
+async def test_entities_share_one_metrics_computation(hass: HomeAssistant, setup_integration, config_entry):
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    runtime.data.add_period(start=coerce_date("2025-08-01"), end=None, notes=None)
+    runtime.data.add_period(start=coerce_date("2025-09-02"), end=None, notes=None)
+
+    with freeze_time("2025-09-10 12:00:00"):
+        misses = runtime.data.metrics_cache_misses
+        runtime.coordinator.async_recompute()
+        await hass.async_block_till_done()
+        assert runtime.data.metrics_cache_misses == misses + 1
+
+        metrics = runtime.coordinator.data
+        assert hass.states.get("sensor.wife_tracker_fertility_risk").state == metrics.risk_level
+        safe = hass.states.get("binary_sensor.wife_tracker_safe_unprotected_sex_today")
+        assert safe.state == ("on" if "Safe" in metrics.risk_label else "off")
+
+
+async def test_entities_do_not_poll_and_follow_mutations(hass: HomeAssistant, setup_integration, config_entry):
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    for platform in ("sensor", "binary_sensor", "calendar"):
+        for entity in hass.data["entity_components"][platform].entities:
+            assert entity.should_poll is False
+
+    assert hass.states.get("sensor.wife_tracker_fertility_risk").state == "unknown"
+    with freeze_time("2025-09-10 12:00:00"):
+        await hass.services.async_call(
+            DOMAIN, "log_period_start", {"entry_id": config_entry.entry_id, "date": "2025-08-01"}, blocking=True
+        )
+        await hass.services.async_call(
+            DOMAIN, "log_period_start", {"entry_id": config_entry.entry_id, "date": "2025-09-02"}, blocking=True
+        )
+        await hass.async_block_till_done()
+        assert runtime.coordinator.data.cycle_day == 9
+        assert hass.states.get("sensor.wife_tracker_fertility_risk").state in ("low", "medium", "high")
+
+
+def _day_scan_ovulations(data, start_date, end_date, tz):
+    """Reference: the original single-cycle prediction, evaluated day by day.
+
+    Written from the pre-projection rule without the helpers: next start is
+    ``last start + round(avg)``, ovulation ``luteal_days`` before it, and a
+    day past a predicted start takes the next predicted cycle (``round(k *
+    avg)`` after the last start), up to PROJECTION_CYCLES of them.
+    """
+    starts = sorted(c.start for c in data.cycles)
+    lengths = [(b - a).days for a, b in zip(starts, starts[1:])]
+    if not lengths:
+        return []
+    window = data.recent_window
+    avg = (
+        mean(lengths)
+        if len(lengths) <= window
+        else data.recent_weight * mean(lengths[-window:]) + data.long_weight * mean(lengths)
+    )
+
+    def predicted_start(k):
+        return starts[-1] + dt.timedelta(days=int(round(k * avg)))
+
+    found: set[dt.date] = set()
+    cur = start_date.date()
+    end_d = (end_date - dt.timedelta(seconds=1)).date()
+    while cur <= end_d:
+        k = 1
+        while k <= PROJECTION_CYCLES and predicted_start(k) <= cur:
+            k += 1
+        if k <= PROJECTION_CYCLES:
+            found.add(predicted_start(k) - dt.timedelta(days=int(data.luteal_days)))
+        cur += dt.timedelta(days=1)
+    return sorted(found)
+
+
+def _periods_full_scan(data, start_date, end_date, tz):
+    """Reference: Period events from every stored cycle, as the calendar once did."""
+    out = []
+    for c in data.cycles:
+        last = c.end or c.start + dt.timedelta(days=4)
+        s = dt.datetime(c.start.year, c.start.month, c.start.day, tzinfo=tz)
+        e = dt.datetime(last.year, last.month, last.day, tzinfo=tz) + dt.timedelta(days=1)
+        if s < end_date and e > start_date:
+            out.append((s, e))
+    return out
+
+
+async def test_calendar_projection_matches_day_scan(hass: HomeAssistant):
+    rng = random.Random(1234)
+    tz = dt_util.get_time_zone(hass.config.time_zone)
+
+    for _ in range(25):
+        data = FertilityData.from_dict({"name": "Random"})
+        data.luteal_days = rng.randint(10, 16)
+        start = dt.date(2024, 1, 1) + dt.timedelta(days=rng.randint(0, 60))
+        for _ in range(rng.randint(0, 8)):
+            end = start + dt.timedelta(days=rng.randint(2, 9)) if rng.random() < 0.7 else None
+            data.add_period(start=start, end=end, notes=None)
+            start += dt.timedelta(days=rng.randint(21, 40))
+
+        win_start = dt.datetime(2024, 1, 1, tzinfo=tz) + dt.timedelta(
+            days=rng.randint(0, 300), hours=rng.randint(0, 23)
+        )
+        win_end = win_start + dt.timedelta(days=rng.randint(0, 120), hours=rng.randint(0, 23))
+
+        events = build_calendar_events(data, win_start, win_end, tz)
+        predicted = [
+            (e.summary, e.start, e.end) for e in events if e.summary != "Period"
+        ]
+        periods = [(e.start, e.end) for e in events if e.summary == "Period"]
+        assert periods == _periods_full_scan(data, win_start, win_end, tz)
+
+        expected = []
+        for ov in _day_scan_ovulations(data, win_start, win_end, tz):
+            for summary, first, last in (
+                ("Fertile Window", ov - dt.timedelta(days=5), ov),
+                ("Implantation Window", ov + dt.timedelta(days=6), ov + dt.timedelta(days=10)),
+            ):
+                s = dt.datetime(first.year, first.month, first.day, tzinfo=tz)
+                e = dt.datetime(last.year, last.month, last.day, tzinfo=tz) + dt.timedelta(days=1)
+                if s < win_end and e > win_start:
+                    expected.append((summary, s, e))
+
+        assert sorted(predicted, key=lambda x: (x[1], x[0])) == sorted(
+            expected, key=lambda x: (x[1], x[0])
+        )
+
+
+async def test_single_wakeup_and_binary_sensors_write_only_on_transitions(
+    hass: HomeAssistant, setup_integration, config_entry
+):
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = runtime.coordinator
+    assert coordinator.next_wakeup is None  # no history: nothing ever changes
+
+    def local(day: str, seconds: int = 0) -> dt.datetime:
+        return dt_util.start_of_local_day(coerce_date(day)) + dt.timedelta(seconds=seconds)
+
+    safe_id = "binary_sensor.wife_tracker_safe_unprotected_sex_today"
+    with freeze_time(local("2025-09-10", 3600)):
+        runtime.data.add_period(start=coerce_date("2025-08-01"), end=None, notes=None)
+        runtime.data.add_period(start=coerce_date("2025-09-02"), end=None, notes=None)
+        await runtime.async_data_changed()
+        await hass.async_block_till_done()
+        assert coordinator.next_wakeup == local("2025-09-11")
+        before = hass.states.get(safe_id)
+        assert before.state == "on"
+
+    # Next midnight: the day count moves, today's risk run does not
+    with freeze_time(local("2025-09-11", 1)):
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+        assert coordinator.wakeups == 1
+        assert coordinator.next_wakeup == local("2025-09-12")
+        assert hass.states.get("sensor.wife_tracker_fertility_risk").attributes["cycle_day"] == 10
+        assert hass.states.get(safe_id).last_updated == before.last_updated
+
+    # Two days on the near-fertile run starts and the binary sensor flips
+    with freeze_time(local("2025-09-13", 1)):
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+        assert hass.states.get(safe_id).state == "off"
+        assert hass.states.get("sensor.wife_tracker_fertility_risk").state == "medium"
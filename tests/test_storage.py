@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.fertility_tracker.helpers import FertilityData, coerce_date
+from custom_components.fertility_tracker.storage import EntryStorage
+
+pytestmark = pytest.mark.asyncio
+
+
+def _blank() -> FertilityData:
+    return FertilityData.from_dict({"name": "Journal"})
+
+
+async def _journaled(hass: HomeAssistant) -> tuple[EntryStorage, FertilityData]:
+    storage = EntryStorage(hass, "journal_entry", journal=True)
+    data = await storage.async_load(_blank())
+    data.add_mutation_listener(storage.record)
+    return storage, data
+
+
+async def test_journal_appends_and_drops_torn_record(hass: HomeAssistant, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    storage, data = await _journaled(hass)
+
+    for day in ("2025-06-01", "2025-07-01", "2025-08-01"):
+        data.add_period(start=coerce_date(day), end=None, notes=None)
+    data.edit_cycle(data.cycles[0].id, start=coerce_date("2025-05-30"), end=None, notes="moved")
+    data.add_sex_event(ts=dt.datetime(2025, 8, 2, 21, 0), protected=False, notes=None)
+    await storage.async_write(data)
+
+    raw = storage.journal_path.read_bytes()
+    lines = raw.splitlines(keepends=True)
+    assert len(lines) == 5
+    assert storage.stats()["records_appended"] == 5
+
+    # Simulate a crash halfway through writing the last record
+    storage.journal_path.write_bytes(raw[: len(raw) - len(lines[-1]) // 2])
+
+    _, reloaded = await _journaled(hass)
+    assert [c.as_dict() for c in reloaded.cycles] == [c.as_dict() for c in data.cycles]
+    assert reloaded.cycles[0].notes == "moved"
+    assert reloaded.sex_events == []
+    assert storage.journal_path.read_bytes() == b"".join(lines[:-1])
+
+
+async def test_compaction_is_idempotent_across_crash(hass: HomeAssistant, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    storage, data = await _journaled(hass)
+    data.add_period(start=coerce_date("2025-06-01"), end=None, notes=None)
+    data.add_period(start=coerce_date("2025-07-01"), end=None, notes=None)
+    await storage.async_write(data)
+    journal = storage.journal_path.read_bytes()
+
+    await storage.async_compact(data)
+    assert not storage.journal_path.exists()
+
+    # Crash after the snapshot was written but before the journal was truncated
+    storage.journal_path.write_bytes(journal)
+    storage2, reloaded = await _journaled(hass)
+    assert len(reloaded.cycles) == 2
+
+    reloaded.delete_cycle(reloaded.cycles[0].id)
+    await storage2.async_write(reloaded)
+    _, again = await _journaled(hass)
+    assert [c.start for c in again.cycles] == [coerce_date("2025-07-01")]
+
+
+async def test_snapshot_mode_folds_leftover_journal(hass: HomeAssistant, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    storage, data = await _journaled(hass)
+    data.add_period(start=coerce_date("2025-06-01"), end=None, notes=None)
+    await storage.async_write(data)
+
+    snapshot_storage = EntryStorage(hass, "journal_entry", journal=False)
+    loaded = await snapshot_storage.async_load(_blank())
+    assert len(loaded.cycles) == 1
+    assert not storage.journal_path.exists()
+
+
+async def test_outbox_rows_replay_from_journal(hass: HomeAssistant, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    storage, data = await _journaled(hass)
+    row = {"key": "risk:2025-09-10", "day": "2025-09-10", "message": "first", "attempts": 0}
+    data.queue_notification(row)
+    data.queue_notification({**row, "message": "second"})
+    data.queue_notification({**row, "key": "period_check:2025-09-10"})
+    data.drop_notifications(["period_check:2025-09-10"])
+    revision = data.revision
+    await storage.async_write(data)
+
+    _, reloaded = await _journaled(hass)
+    assert reloaded.outbox == data.outbox == [{**row, "message": "second"}]
+    # Queued notifications are not history: cached predictions stay valid
+    assert data.revision == revision == 0
+
+
+async def test_option_edits_replay_from_journal(hass: HomeAssistant, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    storage, data = await _journaled(hass)
+    assert data.set_options({"luteal_days": 12, "recent_window": 6}) is True
+    assert data.set_options({"luteal_days": 12}) is False
+    assert data.revision == 1
+    await storage.async_write(data)
+
+    _, reloaded = await _journaled(hass)
+    assert (reloaded.luteal_days, reloaded.recent_window) == (12, 6)
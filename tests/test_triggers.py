@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import datetime as dt
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.fertility_tracker import EntryRuntime
+from custom_components.fertility_tracker.const import (
+    CONF_TRIGGER_COOLDOWN,
+    CONF_TRIGGER_ENTITIES,
+    DATA_TRIGGERS,
+    DOMAIN,
+)
+from custom_components.fertility_tracker.triggers import TriggerDispatcher
+
+pytestmark = pytest.mark.asyncio
+
+DOOR = "binary_sensor.front_door"
+PHONE = "device_tracker.phone"
+
+
+async def test_entries_share_one_listener_per_entity(hass: HomeAssistant):
+    hass.states.async_set(DOOR, "off")
+    hass.states.async_set(PHONE, "not_home")
+    entries = []
+    for name in ("One", "Two"):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={"name": name},
+            options={CONF_TRIGGER_ENTITIES: [DOOR], CONF_TRIGGER_COOLDOWN: 0},
+            title=name,
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        entries.append(entry)
+    await hass.async_block_till_done()
+
+    dispatcher: TriggerDispatcher = hass.data[DATA_TRIGGERS]
+    assert dispatcher.stats()["entities"] == 1
+    assert dispatcher.stats()["entries"] == 2
+
+    with patch.object(EntryRuntime, "_notify_today_risk", new=AsyncMock()) as notify:
+        # Attribute-only update: no transition, nobody is woken
+        hass.states.async_set(DOOR, "off", {"friendly_name": "Door"})
+        await hass.async_block_till_done()
+        assert notify.await_count == 0
+        assert dispatcher.stats()["ignored"] == 1
+
+        hass.states.async_set(DOOR, "on")
+        await hass.async_block_till_done()
+        assert notify.await_count == 2
+        assert notify.await_args.kwargs == {"reason": f"{DOOR} turned on"}
+
+        # Only the second entry moves to the phone; the door stays watched
+        hass.config_entries.async_update_entry(
+            entries[1], options={CONF_TRIGGER_ENTITIES: [PHONE], CONF_TRIGGER_COOLDOWN: 0}
+        )
+        await hass.async_block_till_done()
+        assert dispatcher.stats()["entities"] == 2
+        assert dispatcher.entities_for(entries[1].entry_id) == {PHONE}
+
+        notify.reset_mock()
+        hass.states.async_set(PHONE, "home")
+        await hass.async_block_till_done()
+        assert notify.await_count == 1
+        assert dispatcher.stats()["dispatched"] == 3
+
+    assert await hass.config_entries.async_unload(entries[0].entry_id)
+    assert dispatcher.stats()["entities"] == 1
+    assert await hass.config_entries.async_unload(entries[1].entry_id)
+    assert DATA_TRIGGERS not in hass.data
+
+
+async def test_flapping_trigger_is_debounced_per_entry(
+    hass: HomeAssistant, config_entry, setup_integration
+):
+    hass.states.async_set(DOOR, "off")
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_TRIGGER_ENTITIES: [DOOR]}
+    )
+    await hass.async_block_till_done()
+    runtime: EntryRuntime = hass.data[DOMAIN][config_entry.entry_id]
+
+    with patch.object(EntryRuntime, "_notify_today_risk", new=AsyncMock()) as notify:
+        for _ in range(5):
+            hass.states.async_set(DOOR, "on")
+            hass.states.async_set(DOOR, "off")
+        await hass.async_block_till_done()
+        assert notify.await_count == 1
+        assert runtime.trigger_counts == {
+            "received": 5,
+            "debounced": 4,
+            "already_notified": 0,
+        }
+
+        # Past the cooldown, but today's notification already went out
+        runtime._trigger_quiet_until = 0.0
+        runtime.data.mark_notified(dt_util.now().date().isoformat())
+        hass.states.async_set(DOOR, "on")
+        await hass.async_block_till_done()
+        assert notify.await_count == 1
+        assert runtime.trigger_counts["already_notified"] == 1
+        assert runtime.stats()["triggers"]["entities"] == 1
+
+
+async def test_already_notified_events_do_not_start_a_cooldown(
+    hass: HomeAssistant, config_entry, setup_integration
+):
+    hass.states.async_set(DOOR, "off")
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_TRIGGER_ENTITIES: [DOOR]}
+    )
+    await hass.async_block_till_done()
+    runtime: EntryRuntime = hass.data[DOMAIN][config_entry.entry_id]
+    today = dt_util.now().date()
+
+    with patch.object(EntryRuntime, "_notify_today_risk", new=AsyncMock()) as notify:
+        runtime.data.mark_notified(today.isoformat())
+        for _ in range(3):
+            hass.states.async_set(DOOR, "on")
+            hass.states.async_set(DOOR, "off")
+        await hass.async_block_till_done()
+        assert runtime.trigger_counts == {
+            "received": 3,
+            "debounced": 0,
+            "already_notified": 3,
+        }
+
+        # Nothing was sent, so the first event of a new day goes straight out
+        runtime.data.mark_notified((today - dt.timedelta(days=1)).isoformat())
+        hass.states.async_set(DOOR, "on")
+        hass.states.async_set(DOOR, "off")
+        hass.states.async_set(DOOR, "on")
+        await hass.async_block_till_done()
+        assert notify.await_count == 1
+        assert runtime.trigger_counts == {
+            "received": 5,
+            "debounced": 1,
+            "already_notified": 3,
+        }
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import datetime as dt
 import os
 import pytest
 from freezegun import freeze_time
 from homeassistant.core import HomeAssistant
-from pytest_homeassistant_custom_component.common import async_mock_service
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    async_mock_service,
+)
 
-from custom_components.fertility_tracker.const import DOMAIN
+from custom_components.fertility_tracker.const import CONF_LUTEAL_DAYS, CONF_SAVE_DELAY, DOMAIN
+from custom_components.fertility_tracker.diagnostics import async_get_config_entry_diagnostics
 
 pytestmark = pytest.mark.asyncio
 
@@ -74,16 +82,43 @@ async def test_ws_list_add_edit_delete(hass: HomeAssistant, hass_ws_client, setu
         resp = await client.receive_json()
         assert resp["success"] is True
 
+        # windowed list
+        await client.send_json(
+            {
+                "id": 3,
+                "type": "fertility_tracker/list_cycles",
+                "entry_id": config_entry.entry_id,
+                "start": "2025-09-03",
+                "end": "2025-09-30",
+                "limit": 1,
+            }
+        )
+        resp = await client.receive_json()
+        assert [c["start"] for c in resp["result"]["cycles"]] == ["2025-09-01"]
+        assert resp["result"]["next_cursor"] is None
+
+        await client.send_json(
+            {
+                "id": 4,
+                "type": "fertility_tracker/list_cycles",
+                "entry_id": config_entry.entry_id,
+                "cursor": "%%%",
+            }
+        )
+        resp = await client.receive_json()
+        assert resp["success"] is False
+        assert resp["error"]["code"] == "invalid_format"
+
         # edit
         await client.send_json(
-            {"id": 3, "type": "fertility_tracker/list_cycles", "entry_id": config_entry.entry_id}
+            {"id": 5, "type": "fertility_tracker/list_cycles", "entry_id": config_entry.entry_id}
         )
         resp = await client.receive_json()
         cycle_id = resp["result"]["cycles"][0]["id"]
 
         await client.send_json(
             {
-                "id": 4,
+                "id": 6,
                 "type": "fertility_tracker/edit_cycle",
                 "entry_id": config_entry.entry_id,
                 "cycle_id": cycle_id,
@@ -99,7 +134,7 @@ async def test_ws_list_add_edit_delete(hass: HomeAssistant, hass_ws_client, setu
         # delete
         await client.send_json(
             {
-                "id": 5,
+                "id": 7,
                 "type": "fertility_tracker/delete_cycle",
                 "entry_id": config_entry.entry_id,
                 "cycle_id": cycle_id,
@@ -139,3 +174,371 @@ async def test_domain_services_and_notify(hass: HomeAssistant, setup_integration
 
     await hass.async_block_till_done()
     assert isinstance(calls, list)
+
+
+async def test_saves_are_coalesced_and_flushed(hass: HomeAssistant, setup_integration, config_entry):
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    runtime._save_delay = 5.0  # noqa: SLF001
+    runtime._save_max_delay = 30.0  # noqa: SLF001
+    written = runtime.saves_written
+
+    for day in ("2025-07-01", "2025-08-01", "2025-09-01"):
+        await hass.services.async_call(
+            DOMAIN, "log_period_start", {"entry_id": config_entry.entry_id, "date": day}, blocking=True
+        )
+    assert runtime.saves_written == written
+    assert runtime.save_stats() == {"written": written, "coalesced": 2, "pending": True}
+
+    async_fire_time_changed(hass, dt_util.utcnow() + dt.timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert runtime.saves_written == written + 1
+    assert runtime.save_stats()["pending"] is False
+
+    # A pending write is flushed when the entry unloads
+    await hass.services.async_call(
+        DOMAIN, "log_sex", {"entry_id": config_entry.entry_id, "protected": True}, blocking=True
+    )
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    assert runtime.saves_written == written + 2
+    assert runtime.save_stats()["pending"] is False
+
+
+async def test_import_history_service_returns_counts(hass: HomeAssistant, setup_integration, config_entry):
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    saves = runtime.saves_written
+    response = await hass.services.async_call(
+        DOMAIN,
+        "import_history",
+        {
+            "entry_id": config_entry.entry_id,
+            "format": "json",
+            "data": '{"periods": [{"start": "2025-07-01"}, {"start": "2025-08-01"}, {"start": "2025-08-01"}]}',
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert response["inserted"]["periods"] == 2
+    assert response["skipped"]["periods"] == 1
+    assert len(runtime.data.cycles) == 2
+
+    # entry_id is optional while a single tracker is set up
+    response = await hass.services.async_call(
+        DOMAIN,
+        "import_history",
+        {"format": "csv", "data": "type,start\nperiod,2025-09-01\n"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["inserted"]["periods"] == 1
+    assert len(runtime.data.cycles) == 3
+
+    await runtime.async_save()
+    assert runtime.saves_written == saves + 1
+
+
+@pytest.mark.skipif(SKIP_WS, reason="Skip WS test on CI due to lingering uv shutdown thread in HA 2025")
+async def test_subscribe_streams_snapshot_then_deltas(
+    hass: HomeAssistant, hass_ws_client, setup_integration, config_entry
+):
+    client = await hass_ws_client(hass)
+    try:
+        await client.send_json(
+            {"id": 1, "type": "fertility_tracker/subscribe", "entry_id": config_entry.entry_id}
+        )
+        assert (await client.receive_json())["success"] is True
+        snapshot = (await client.receive_json())["event"]
+        assert snapshot["type"] == "snapshot"
+        assert snapshot["data"]["cycles"] == []
+        revision = snapshot["revision"]
+
+        await hass.services.async_call(
+            DOMAIN,
+            "log_period_start",
+            {"entry_id": config_entry.entry_id, "date": dt_util.now().date().isoformat()},
+            blocking=True,
+        )
+        added = (await client.receive_json())["event"]
+        assert added["type"] == "cycle_added"
+        assert added["revision"] == revision + 1
+        cycle_id = added["data"]["id"]
+
+        metrics = (await client.receive_json())["event"]
+        assert metrics["type"] == "metrics_changed"
+        assert metrics["data"]["cycle_day"] == 1
+
+        await client.send_json(
+            {
+                "id": 2,
+                "type": "fertility_tracker/delete_cycle",
+                "entry_id": config_entry.entry_id,
+                "cycle_id": cycle_id,
+            }
+        )
+        deleted = (await client.receive_json())["event"]
+        assert deleted == {"type": "cycle_deleted", "revision": revision + 2, "data": {"id": cycle_id}}
+
+        # Option edits advance the revision too, so they must arrive as a delta
+        hass.config_entries.async_update_entry(
+            config_entry, options={**config_entry.options, CONF_LUTEAL_DAYS: 12}
+        )
+        await hass.async_block_till_done()
+        while (msg := await client.receive_json()).get("event", {}).get("type") != "options_changed":
+            # Only the delete's result and recomputed metrics may come first
+            assert msg["id"] == 2 or msg["event"]["type"] == "metrics_changed"
+        changed = msg["event"]
+        assert changed == {
+            "type": "options_changed",
+            "revision": revision + 3,
+            "data": {"luteal_days": 12},
+        }
+    finally:
+        await _cleanup_ws_and_http(hass, client)
+
+
+@pytest.mark.skipif(SKIP_WS, reason="Skip WS test on CI due to lingering uv shutdown thread in HA 2025")
+async def test_subscription_survives_entry_reload(
+    hass: HomeAssistant, hass_ws_client, setup_integration, config_entry
+):
+    client = await hass_ws_client(hass)
+    try:
+        await client.send_json(
+            {"id": 1, "type": "fertility_tracker/subscribe", "entry_id": config_entry.entry_id}
+        )
+        assert (await client.receive_json())["success"] is True
+        assert (await client.receive_json())["event"]["type"] == "snapshot"
+        old_runtime = hass.data[DOMAIN][config_entry.entry_id]
+
+        # Save delay is read at build time, so this rebuilds the runtime
+        hass.config_entries.async_update_entry(
+            config_entry, options={**config_entry.options, CONF_SAVE_DELAY: 0}
+        )
+        await hass.async_block_till_done()
+        runtime = hass.data[DOMAIN][config_entry.entry_id]
+        assert runtime is not old_runtime
+        # Without the re-attach the stream would silently go quiet here
+        resync = (await asyncio.wait_for(client.receive_json(), 5))["event"]
+        assert resync["type"] == "snapshot"
+        assert resync["revision"] == runtime.data.revision
+
+        await hass.services.async_call(
+            DOMAIN,
+            "log_period_start",
+            {"entry_id": config_entry.entry_id, "date": dt_util.now().date().isoformat()},
+            blocking=True,
+        )
+        added = (await client.receive_json())["event"]
+        assert added["type"] == "cycle_added"
+        assert added["revision"] == resync["revision"] + 1
+    finally:
+        await _cleanup_ws_and_http(hass, client)
+
+
+@pytest.mark.skipif(SKIP_WS, reason="Skip WS test on CI due to lingering uv shutdown thread in HA 2025")
+async def test_streaming_export_ws_and_http(
+    hass: HomeAssistant, hass_ws_client, hass_client, config_entry
+):
+    # The download view is registered only when http is already loaded
+    assert await async_setup_component(hass, "http", {})
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    for i in range(60):
+        runtime.data.add_period(
+            start=dt.date(2020, 1, 1) + dt.timedelta(days=28 * i), end=None, notes="x" * 40
+        )
+
+    client = await hass_ws_client(hass)
+    try:
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "fertility_tracker/export_stream",
+                "entry_id": config_entry.entry_id,
+                "chunk_bytes": 1024,
+            }
+        )
+        assert (await client.receive_json())["success"] is True
+        assert (await client.receive_json())["event"]["type"] == "start"
+        rows = []
+        while (event := (await client.receive_json())["event"])["type"] == "chunk":
+            rows += event["rows"]
+        assert event == {"type": "end", "rows": 60, "chunks": event["chunks"]}
+        assert event["chunks"] > 1
+        assert [r["id"] for r in rows] == [c.id for c in runtime.data.cycles]
+
+        http = await hass_client()
+        resp = await http.get(f"/api/fertility_tracker/{config_entry.entry_id}/export?format=csv")
+        assert resp.status == 200
+        text = await resp.text()
+        assert text.splitlines()[0] == "type,id,start,end,ts,protected,result,notes"
+        assert len(text.splitlines()) == 61
+
+        resp = await http.get(f"/api/fertility_tracker/{config_entry.entry_id}/export?format=xml")
+        assert resp.status == 400
+    finally:
+        await _cleanup_ws_and_http(hass, client)
+
+
+@pytest.mark.skipif(SKIP_WS, reason="Skip WS test on CI due to lingering uv shutdown thread in HA 2025")
+async def test_stats_and_diagnostics_report_timings(hass: HomeAssistant, hass_ws_client, config_entry):
+    hass.config_entries.async_update_entry(
+        config_entry, options={"instrumentation": True, "save_delay": 0, "notify_services": ["notify.phone"]}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        DOMAIN, "log_period_start", {"entry_id": config_entry.entry_id, "date": "2025-09-01"}, blocking=True
+    )
+    client = await hass_ws_client(hass)
+    try:
+        await client.send_json(
+            {"id": 1, "type": "fertility_tracker/list_cycles", "entry_id": config_entry.entry_id}
+        )
+        await client.receive_json()
+        await client.send_json({"id": 2, "type": "fertility_tracker/stats", "entry_id": config_entry.entry_id})
+        stats = (await client.receive_json())["result"]
+    finally:
+        await _cleanup_ws_and_http(hass, client)
+
+    assert stats["instrumentation"] is True
+    assert stats["cycles"] == 1
+    assert {"metrics", "store_write", "ws:list_cycles"} <= stats["timings"].keys()
+    assert stats["timings"]["store_write"]["count"] == 1
+    assert stats["timings"]["metrics"]["p50_ms"] is not None
+
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    await runtime._send_notifications("t", "m")  # noqa: SLF001
+    diag = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert diag["options"]["notify_services"] == "**REDACTED**"
+    assert diag["stats"]["notify"][0]["service"] == "**REDACTED**"
+    assert diag["stats"]["notify"][0]["last_outcome"] == "failed"
+    assert diag["stats"]["timings"].keys() == stats["timings"].keys() | {"notify_fanout"}
+
+
+async def test_instrumentation_is_off_by_default(hass: HomeAssistant, setup_integration, config_entry):
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    assert runtime.instruments is None
+    assert runtime.stats()["timings"] == {}
+
+
+@pytest.mark.skipif(SKIP_WS, reason="Skip WS test on CI due to lingering uv shutdown thread in HA 2025")
+async def test_ws_forecast_returns_daily_arrays(hass: HomeAssistant, hass_ws_client, setup_integration, config_entry):
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    runtime.data.add_period(start=dt.date(2025, 7, 1), end=None, notes=None)
+    runtime.data.add_period(start=dt.date(2025, 7, 29), end=None, notes=None)
+
+    client = await hass_ws_client(hass)
+    try:
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "fertility_tracker/forecast",
+                "entry_id": config_entry.entry_id,
+                "start": "2025-08-01",
+                "end": "2025-08-31",
+            }
+        )
+        result = (await client.receive_json())["result"]
+        assert len(result["cycle_day"]) == 31
+        assert result["cycle_day"][0] == 4
+        assert result["predicted_ovulation_date"] == "2025-08-12"
+        assert result["risk_level"][11] == "high"
+
+        await client.send_json(
+            {
+                "id": 2,
+                "type": "fertility_tracker/forecast",
+                "entry_id": config_entry.entry_id,
+                "start": "2000-01-01",
+                "end": "2025-01-01",
+            }
+        )
+        assert (await client.receive_json())["error"]["code"] == "invalid_format"
+    finally:
+        await _cleanup_ws_and_http(hass, client)
+
+
+@pytest.mark.skipif(SKIP_WS, reason="Skip WS test on CI due to lingering uv shutdown thread in HA 2025")
+async def test_ws_distribution_and_sensor_interval(hass: HomeAssistant, hass_ws_client, setup_integration, config_entry):
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    for day in (dt.date(2025, 6, 3), dt.date(2025, 7, 1), dt.date(2025, 7, 30)):
+        runtime.data.add_period(start=day, end=None, notes=None)
+    await runtime.async_data_changed()
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    try:
+        await client.send_json(
+            {"id": 1, "type": "fertility_tracker/distribution", "entry_id": config_entry.entry_id}
+        )
+        result = (await client.receive_json())["result"]["distribution"]
+        assert result["coverage"] == 0.8
+        assert result["period"]["most_likely"] == "2025-08-27"
+        assert result["period"]["interval_start"] <= "2025-08-27" <= result["period"]["interval_end"]
+
+        await client.send_json(
+            {
+                "id": 2,
+                "type": "fertility_tracker/distribution",
+                "entry_id": config_entry.entry_id,
+                "date": "2025-08-29",
+                "coverage": 0.5,
+            }
+        )
+        result = (await client.receive_json())["result"]["distribution"]
+        assert result["coverage"] == 0.5
+        assert result["period"]["first"] == "2025-08-29"
+    finally:
+        await _cleanup_ws_and_http(hass, client)
+
+    state = next(
+        s for s in hass.states.async_all("sensor") if s.attributes.get("prediction_confidence")
+    )
+    assert state.attributes["next_period_earliest"] <= "2025-08-27" <= state.attributes["next_period_latest"]
+    assert state.attributes["ovulation_earliest"] <= "2025-08-13" <= state.attributes["ovulation_latest"]
+
+
+@pytest.mark.skipif(SKIP_WS, reason="Skip WS test on CI due to lingering uv shutdown thread in HA 2025")
+async def test_ws_risk_timeline_runs(hass: HomeAssistant, hass_ws_client, setup_integration, config_entry):
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    runtime.data.add_period(start=dt.date(2025, 7, 1), end=None, notes=None)
+    runtime.data.add_period(start=dt.date(2025, 7, 29), end=None, notes=None)
+
+    client = await hass_ws_client(hass)
+    try:
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "fertility_tracker/risk_timeline",
+                "entry_id": config_entry.entry_id,
+                "start": "2025-08-01",
+                "end": "2025-08-31",
+            }
+        )
+        runs = (await client.receive_json())["result"]["runs"]
+        assert runs[0]["start"] == "2025-08-01"
+        assert runs[-1]["end"] == "2025-08-31"
+        # Matches the per-day forecast for the same range
+        days = []
+        for run in runs:
+            n = (dt.date.fromisoformat(run["end"]) - dt.date.fromisoformat(run["start"])).days + 1
+            days += [run["level"]] * n
+        await client.send_json(
+            {
+                "id": 2,
+                "type": "fertility_tracker/forecast",
+                "entry_id": config_entry.entry_id,
+                "start": "2025-08-01",
+                "end": "2025-08-31",
+            }
+        )
+        assert days == (await client.receive_json())["result"]["risk_level"]
+
+        await client.send_json(
+            {"id": 3, "type": "fertility_tracker/risk_timeline", "entry_id": config_entry.entry_id}
+        )
+        runs = (await client.receive_json())["result"]["runs"]
+        assert runs[0]["start"] == "2025-07-01"
+    finally:
+        await _cleanup_ws_and_http(hass, client)